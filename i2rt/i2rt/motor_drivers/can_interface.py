@@ -1,10 +1,61 @@
 import can
+import threading
 import time
-from typing import List, Optional
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
 import logging
 from i2rt.motor_drivers.utils import ReceiveMode
 
 
+class CanReceiver(can.Listener):
+    """Receives the frames of a bus in a background thread (driven by a `can.Notifier`) and sorts them by
+    arbitration ID. Callers block on the reply of a given device instead of polling the bus, and replies from
+    other devices are kept for their own callers instead of being dropped.
+    """
+
+    def __init__(self, max_messages_per_id: int = 16):
+        self.max_messages_per_id = max_messages_per_id
+        self._slots: Dict[int, Deque[can.Message]] = {}
+        self._condition = threading.Condition()
+        self.num_overwritten = 0
+
+    def on_message_received(self, msg: can.Message) -> None:
+        with self._condition:
+            slot = self._slots.get(msg.arbitration_id)
+            if slot is None:
+                slot = deque(maxlen=self.max_messages_per_id)
+                self._slots[msg.arbitration_id] = slot
+            if len(slot) == self.max_messages_per_id:
+                # nobody is waiting for these replies, the oldest one is overwritten
+                self.num_overwritten += 1
+            slot.append(msg)
+            self._condition.notify_all()
+
+    def on_error(self, exc: Exception) -> None:
+        logging.error(f"CanReceiver error: {exc}")
+
+    def clear(self, arbitration_id: int) -> None:
+        """Drop the pending messages of an arbitration ID, e.g. before sending a request whose reply is expected."""
+        with self._condition:
+            self._slots.pop(arbitration_id, None)
+
+    def get(self, arbitration_id: int, timeout: float) -> Optional[can.Message]:
+        """Wait for the oldest pending message of an arbitration ID, or return None after `timeout` seconds."""
+        with self._condition:
+            if self._condition.wait_for(lambda: self._slots.get(arbitration_id), timeout=timeout):
+                return self._slots[arbitration_id].popleft()
+        return None
+
+    def get_any(self, timeout: float) -> Optional[can.Message]:
+        """Wait for a pending message of any arbitration ID, or return None after `timeout` seconds."""
+        with self._condition:
+            if self._condition.wait_for(lambda: any(self._slots.values()), timeout=timeout):
+                for slot in self._slots.values():
+                    if slot:
+                        return slot.popleft()
+        return None
+
+
 class CanInterface:
     def __init__(
         self,
@@ -14,21 +65,30 @@ class CanInterface:
         name: str = "default_can_interface",
         receive_mode: ReceiveMode = ReceiveMode.p16,
         use_buffered_reader: bool = False,
+        use_background_receiver: bool = False,
     ):
+        assert not (use_buffered_reader and use_background_receiver), (
+            "use either the buffered reader or the background receiver"
+        )
         self.bus = can.interface.Bus(bustype=bustype, channel=channel, bitrate=bitrate)
         self.busstate = self.bus.state
         self.name = name
         self.receive_mode = receive_mode
         self.use_buffered_reader = use_buffered_reader
+        self.receiver = None
         logging.info(f"Can interface {self.name} use_buffered_reader: {use_buffered_reader}")
         if use_buffered_reader:
             # Initialize BufferedReader for asynchronous message handling
             self.buffered_reader = can.BufferedReader()
             self.notifier = can.Notifier(self.bus, [self.buffered_reader])
+        elif use_background_receiver:
+            # Replies are sorted by arbitration ID in the background, see CanReceiver
+            self.receiver = CanReceiver()
+            self.notifier = can.Notifier(self.bus, [self.receiver])
 
     def close(self) -> None:
         """Shut down the CAN bus."""
-        if self.use_buffered_reader:
+        if self.use_buffered_reader or self.receiver is not None:
             self.notifier.stop()
         self.bus.shutdown()
 
@@ -45,13 +105,21 @@ class CanInterface:
             can.Message: The message that was sent.
         """
         message = can.Message(arbitration_id=id, data=data, is_extended_id=False)
+        if expected_id is None:
+            expected_id = self.receive_mode.get_receive_id(motor_id)
         for _ in range(max_retry):
             try:
+                if self.receiver is not None:
+                    self.receiver.clear(expected_id)
+                    self.bus.send(message)
+                    response = self.receiver.get(expected_id, timeout=0.2)
+                    if response is not None:
+                        return response
+                    raise AssertionError(f"{self.name} motor id {motor_id} timeout")
+
                 self.bus.send(message)
                 response = self._receive_message(motor_id, timeout=0.2)
 
-                if expected_id is None:
-                    expected_id = self.receive_mode.get_receive_id(motor_id)
                 if response and (expected_id == response.arbitration_id):
                     return response
                 self.try_receive_message(id)
@@ -67,6 +135,77 @@ class CanInterface:
             f"fail to communicate with the motor {id} on {self.name} at can channel {self.bus.channel_info}"
         )
 
+    def _send_messages_get_responses(
+        self,
+        frames: List[Tuple[int, List[int]]],
+        expected_ids: List[int],
+        max_retry: int = 5,
+        timeout: float = 0.01,
+    ) -> Dict[int, can.Message]:
+        """Send several messages back-to-back, then collect their responses by arbitration ID.
+
+        Compared to calling `_send_message_get_response` for each message, the devices process their requests
+        concurrently and the whole batch costs about one bus round-trip. Only the messages whose response is
+        missing are sent again on retry.
+
+        Args:
+            frames (List[Tuple[int, List[int]]]): The (arbitration ID, data payload) of the messages.
+            expected_ids (List[int]): The arbitration ID of the response to each message, must be unique.
+            max_retry (int): The number of attempts for each message.
+            timeout (float): The time to wait for the responses of a batch (in seconds).
+
+        Returns:
+            Dict[int, can.Message]: The responses, by arbitration ID.
+        """
+        assert len(frames) == len(expected_ids)
+        assert len(set(expected_ids)) == len(expected_ids), f"expected ids must be unique, got {expected_ids}"
+        responses = {}
+        pending = list(range(len(frames)))
+        for _ in range(max_retry):
+            try:
+                pending_ids = {expected_ids[idx] for idx in pending}
+                if self.receiver is not None:
+                    for expected_id in pending_ids:
+                        self.receiver.clear(expected_id)
+                for idx in pending:
+                    arbitration_id, data = frames[idx]
+                    self.bus.send(can.Message(arbitration_id=arbitration_id, data=data, is_extended_id=False))
+
+                deadline = time.time() + timeout
+                if self.receiver is not None:
+                    for expected_id in list(pending_ids):
+                        message = self.receiver.get(expected_id, timeout=max(deadline - time.time(), 0.0))
+                        if message is not None:
+                            responses[expected_id] = message
+                            pending_ids.discard(expected_id)
+                while self.receiver is None and pending_ids:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    message = self._recv(timeout=remaining)
+                    if message is not None and message.arbitration_id in pending_ids:
+                        responses[message.arbitration_id] = message
+                        pending_ids.discard(message.arbitration_id)
+            except can.CanError as e:
+                logging.warning(e)
+                logging.warning(
+                    "\033[91m" + f"CAN Error {self.name}: Failed to communicate over can bus. Retrying..." + "\033[0m"
+                )
+            pending = [idx for idx in pending if expected_ids[idx] not in responses]
+            if not pending:
+                return responses
+            time.sleep(0.001)
+        raise AssertionError(
+            f"fail to communicate with the motors {[frames[idx][0] for idx in pending]} on {self.name} at can channel {self.bus.channel_info}"
+        )
+
+    def _recv(self, timeout: float) -> Optional[can.Message]:
+        if self.receiver is not None:
+            return self.receiver.get_any(timeout=timeout)
+        if self.use_buffered_reader:
+            return self.buffered_reader.get_message(timeout=timeout)
+        return self.bus.recv(timeout=timeout)
+
     def try_receive_message(self, motor_id: Optional[int] = None, timeout: float = 0.009) -> Optional[can.Message]:
         """Try to receive a message from the CAN bus.
 
@@ -95,8 +234,15 @@ class CanInterface:
         Raises:
             AssertionError: If no message is received within the timeout.
         """
+        if self.receiver is not None:
+            if motor_id is not None:
+                message = self.receiver.get(self.receive_mode.get_receive_id(motor_id), timeout=timeout)
+            else:
+                message = self.receiver.get_any(timeout=timeout)
+            if message is not None:
+                return message
         start_time = time.time()
-        while (time.time() - start_time) < timeout:
+        while self.receiver is None and (time.time() - start_time) < timeout:
             if self.use_buffered_reader:
                 # Use BufferedReader to get the message
                 message = self.buffered_reader.get_message(timeout=0.002)
@@ -5,12 +5,15 @@ import struct
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Callable, List, Optional, Protocol, Tuple
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
 from i2rt.motor_drivers.utils import MotorInfo, MotorConstants, FeedbackFrameInfo, MotorErrorCode, MotorType, uint_to_float, float_to_uint, MotorInfo, ReceiveMode
 import can
 import numpy as np
 from i2rt.motor_drivers.can_interface import CanInterface
+from i2rt.motor_drivers.mit_codec import MITBatchCodec, feedback_from_infos, feedback_to_infos
 
+from i2rt.utils.scheduler import DeadlineScheduler
+from i2rt.utils.snapshot import ArraySnapshot
 from i2rt.utils.utils import RateRecorder
 
 log_level = os.getenv("LOGLEVEL", "ERROR").upper()
@@ -114,13 +117,21 @@ class DMSingleMotorCanInterface(CanInterface):
         receive_mode: ReceiveMode = ReceiveMode.p16,
         name: str = "default_can_DM_interface",
         use_buffered_reader: bool = False,
+        use_background_receiver: bool = False,
     ):
         super().__init__(
-            channel, bustype, bitrate, receive_mode=receive_mode, name=name, use_buffered_reader=use_buffered_reader
+            channel,
+            bustype,
+            bitrate,
+            receive_mode=receive_mode,
+            name=name,
+            use_buffered_reader=use_buffered_reader,
+            use_background_receiver=use_background_receiver,
         )
         self.control_mode = control_mode
         self.cmd_idoffset = ControlMode.get_id_offset(self.control_mode)
         self.receive_mode = receive_mode
+        self._batch_codecs: Dict[Tuple[Tuple[int, str], ...], MITBatchCodec] = {}
 
     def _get_frame_id(self, motor_id: int) -> int:
         """Calculate the Control Frame ID for a given motor."""
@@ -228,7 +239,96 @@ class DMSingleMotorCanInterface(CanInterface):
             FeedbackFrameInfo: The current state of the motor, including motor id, error code, position, velocity, torque, temperature.
         """
         frame_id = self._get_frame_id(motor_id)
-        # Prepare the CAN message
+        data = self._encode_control_data(motor_type, pos, vel, kp, kd, torque)
+
+        # Send the CAN message
+        message = self._send_message_get_response(frame_id, motor_id, data, max_retry=15)
+
+        # Parse the received message to extract motor information
+        motor_info = self.parse_recv_message(message, motor_type)
+        return motor_info
+
+    def set_controls(
+        self,
+        motor_ids: List[int],
+        motor_types: List[str],
+        pos: np.ndarray,
+        vel: np.ndarray,
+        kp: np.ndarray,
+        kd: np.ndarray,
+        torque: np.ndarray,
+    ) -> List[FeedbackFrameInfo]:
+        """Set the control of several motors on the bus at once and return their status.
+
+        All the control frames are sent back-to-back, then the replies are collected by arbitration ID, instead
+        of waiting for the reply of each motor before commanding the next one (see `set_control`).
+
+        Returns:
+            List[FeedbackFrameInfo]: The current state of the motors, in the order of `motor_ids`.
+        """
+        key = tuple(zip(motor_ids, motor_types, strict=True))
+        if key not in self._batch_codecs:
+            self._batch_codecs[key] = MITBatchCodec(motor_ids, motor_types)
+        feedback = self.set_controls_batch(self._batch_codecs[key], pos, vel, kp, kd, torque)
+        for record in feedback[feedback["error_code"] != MotorErrorCode.normal]:
+            error_message = MotorErrorCode.get_error_message(record["error_code"])
+            logging.error(
+                f"motor id: {record['id']}, error: {error_message} at {self.name} and channel {self.bus.channel_info}"
+            )
+            raise RuntimeError(f"Motor error detected: motor id: {record['id']}, error: {error_message}")
+        return feedback_to_infos(feedback)
+
+    def set_controls_batch(
+        self,
+        codec: MITBatchCodec,
+        pos: np.ndarray,
+        vel: np.ndarray,
+        kp: np.ndarray,
+        kd: np.ndarray,
+        torque: np.ndarray,
+        batched: bool = True,
+    ) -> np.ndarray:
+        """Set the control of the motors of `codec` and return their status as arrays.
+
+        The control frames are packed and the replies parsed for all the motors at once (see `MITBatchCodec`).
+        Motor errors are not raised, they are reported in the integer `error_code` field of the status.
+
+        Args:
+            codec (MITBatchCodec): The codec of the motors to command.
+            batched (bool): If true, send all the control frames back-to-back and then collect the replies,
+                otherwise wait for the reply of each motor before commanding the next one.
+
+        Returns:
+            np.ndarray: The FEEDBACK_DTYPE records of the motors, in the order of `codec.motor_ids`. The array
+                belongs to the codec and is overwritten by its next decode.
+        """
+        if self.control_mode == ControlMode.MIT:
+            codec.encode(pos, vel, kp, kd, torque)
+        else:
+            for idx, motor_type in enumerate(codec.motor_types):
+                data = self._encode_control_data(motor_type, pos[idx], vel[idx], kp[idx], kd[idx], torque[idx])
+                codec.command_bytes[idx] = np.frombuffer(data, dtype=np.uint8)
+        motor_ids = codec.motor_ids.tolist()
+        expected_ids = [self.receive_mode.get_receive_id(motor_id) for motor_id in motor_ids]
+        if batched:
+            frames = [
+                (self._get_frame_id(motor_id), codec.command_payload(idx)) for idx, motor_id in enumerate(motor_ids)
+            ]
+            responses = self._send_messages_get_responses(frames, expected_ids, max_retry=15)
+            for idx, expected_id in enumerate(expected_ids):
+                codec.set_feedback_payload(idx, responses[expected_id].data)
+        else:
+            for idx, motor_id in enumerate(motor_ids):
+                message = self._send_message_get_response(
+                    self._get_frame_id(motor_id), motor_id, codec.command_payload(idx), max_retry=15
+                )
+                codec.set_feedback_payload(idx, message.data)
+        return codec.decode()
+
+    def _encode_control_data(
+        self, motor_type: str, pos: float, vel: float, kp: float, kd: float, torque: float
+    ) -> bytearray:
+        """Prepare the payload of a control frame for the current control mode."""
         data = bytearray(8)
         if self.control_mode == ControlMode.MIT:
             const = MotorType.get_motor_constants(motor_type)
@@ -253,13 +353,7 @@ class DMSingleMotorCanInterface(CanInterface):
             # system will only response to vel command
             can_data = struct.pack("<f", vel)
             data[0:4] = can_data[0:4]
-
-        # Send the CAN message
-        message = self._send_message_get_response(frame_id, motor_id, data, max_retry=15)
-
-        # Parse the received message to extract motor information
-        motor_info = self.parse_recv_message(message, motor_type)
-        return motor_info
+        return data
 
     def parse_recv_message(
         self, message: can.Message, motor_type: str, ignore_error: bool = False
@@ -359,6 +453,10 @@ class DMChainCanInterface(MotorChain):
         control_mode: ControlMode = ControlMode.MIT,
         get_same_bus_device_driver: Optional[Callable] = None,
         use_buffered_reader: bool = False,  # buffered reader is not very stable, the latest encoder fix allows us to use the non-buffered reader
+        batched_io: bool = False,  # If true, send the commands of all motors back-to-back and then collect the replies
+        use_background_receiver: bool = False,  # If true, replies are sorted by arbitration ID in a background thread
+        realtime_priority: Optional[int] = None,  # SCHED_FIFO priority of the control loop thread, needs privileges
+        cpu_affinity: Optional[List[int]] = None,  # CPUs the control loop thread is pinned to
     ):
         assert not use_buffered_reader, (
             "buffered reader is not very stable, the latest encoder fix allows us to use the non-buffered reader"
@@ -368,6 +466,12 @@ class DMChainCanInterface(MotorChain):
             f"len{len(motor_list)}, len{len(motor_offset)}, len{len(motor_direction)}"
         )
         self.motor_list = motor_list
+        self.batched_io = batched_io
+        self.codec = MITBatchCodec(
+            [motor_id for motor_id, _ in motor_list], [motor_type for _, motor_type in motor_list]
+        )
+        consts = [MotorType.get_motor_constants(motor_type) for _, motor_type in motor_list]
+        self.position_range = np.array([const.POSITION_MAX - const.POSITION_MIN for const in consts])
         self.motor_offset = np.array(motor_offset)
         self.motor_direction = np.array(motor_direction)
         self.channel = channel
@@ -380,6 +484,7 @@ class DMChainCanInterface(MotorChain):
                 name=motor_chain_name,
                 control_mode=control_mode,
                 use_buffered_reader=use_buffered_reader,
+                use_background_receiver=use_background_receiver,
             )
         else:
             self.motor_interface = DMSingleMotorCanInterface(
@@ -387,11 +492,33 @@ class DMChainCanInterface(MotorChain):
                 bitrate=bitrate,
                 name=motor_chain_name,
                 use_buffered_reader=use_buffered_reader,
+                use_background_receiver=use_background_receiver,
             )
         self.state = None
         self.state_lock = threading.Lock()
+        num_motors = len(motor_list)
+        # Latest state in the sim frame, published by the control loop and read without blocking it
+        self.state_snapshot = ArraySnapshot(
+            {name: (num_motors,) for name in ["id", "error_code", "pos", "vel", "eff", "temp_mos", "temp_rotor"]}
+        )
+        # Latest commands in the sim frame, read by the control loop at each cycle
+        self.command_snapshot = ArraySnapshot({name: (num_motors,) for name in ["torque", "pos", "vel", "kp", "kd"]})
+
+        self.scheduler = DeadlineScheduler(
+            CONTROL_PERIOD,
+            name=f"DMChainCanInterface(channel={channel})",
+            report_interval=REPORT_INTERVAL,
+            realtime_priority=realtime_priority,
+            cpu_affinity=cpu_affinity,
+        )
+        # Notified at the end of each control cycle, so that the robot update can be phase-locked on the bus I/O
+        self.cycle_condition = threading.Condition()
+        self.cycle_count = 0
 
         self.same_bus_device_states = None
+        self._control_thread: Optional[threading.Thread] = None
+        # Stops the control loop thread only, `running` is shared with the same bus device thread
+        self._stop_control_thread = threading.Event()
 
         self.same_bus_device_lock = threading.Lock()
         if get_same_bus_device_driver is not None:
@@ -401,11 +528,11 @@ class DMChainCanInterface(MotorChain):
 
         self.absolute_positions = None
         self._motor_on()
-        starting_command = []
-        for motor_state in self.state:
-            starting_command.append(MotorCmd(torque=motor_state.torque))
-        logging.info(f"Initializing motorchain with starting command: {starting_command}")
-        self.commands = starting_command
+        starting_torques = self.state["torque"]
+        logging.info(f"Initializing motorchain with starting torques: {starting_torques}")
+        zeros = np.zeros(num_motors)
+        self.command_snapshot.publish(torque=starting_torques, pos=zeros, vel=zeros, kp=zeros, kd=zeros)
+        # only serializes the writers of the commands, the control loop reads them without locking
         self.command_lock = threading.Lock()
 
         self.start_thread_flag = start_thread
@@ -415,36 +542,20 @@ class DMChainCanInterface(MotorChain):
     def __repr__(self) -> str:
         return f"DMChainCanInterface(channel={self.channel})"
 
-    def _update_absolute_positions(self, motor_feedback: List[MotorInfo]) -> None:
-        init_mode = False
+    def _update_absolute_positions(self, motor_feedback: np.ndarray) -> None:
+        # Current position from feedback
+        current_position = motor_feedback["position"]
         if self.absolute_positions is None:
-            self.absolute_positions = np.zeros(len(self.motor_list))
-            init_mode = True
-
-        for idx, motor_info in enumerate(self.motor_list):
-            motor_id, motor_type = motor_info
-            const = MotorType.get_motor_constants(motor_type)
-            position_min = const.POSITION_MIN
-            position_max = const.POSITION_MAX
-            position_range = position_max - position_min
-
-            # Current position from feedback
-            current_position = motor_feedback[idx].position
-
-            # Previous absolute position
-            previous_position = self.absolute_positions[idx]
-
-            # Handle wrap-around
-            delta_position = current_position - (previous_position % position_range)
-            if delta_position > position_range / 2:  # Wrap backward
-                delta_position -= position_range
-            elif delta_position < -position_range / 2:  # Wrap forward
-                delta_position += position_range
+            self.absolute_positions = current_position.astype(np.float64)
+            return
 
-            if init_mode:
-                self.absolute_positions[idx] = current_position
-            else:
-                self.absolute_positions[idx] += delta_position
+        # Handle wrap-around
+        position_range = self.position_range
+        delta_position = current_position - (self.absolute_positions % position_range)
+        half_range = position_range / 2
+        delta_position = np.where(delta_position > half_range, delta_position - position_range, delta_position)
+        delta_position = np.where(delta_position < -half_range, delta_position + position_range, delta_position)
+        self.absolute_positions += delta_position
 
     def __len__(self):
         return len(self.motor_list)
@@ -459,134 +570,178 @@ class DMChainCanInterface(MotorChain):
         return joint_position_sim * self.motor_direction[idx] + self.motor_offset[idx]
 
     def _motor_on(self) -> None:
-        motor_feedback = []
+        motor_infos = []
         for _ in range(7):
             self.motor_interface.try_receive_message(timeout=0.001)
         for motor_id, motor_type in self.motor_list:
             logging.info(f"Turning on motor_id: {motor_id}, motor_type: {motor_type}")
             time.sleep(0.003)
-            motor_feedback.append(self.motor_interface.motor_on(motor_id, motor_type))
+            motor_infos.append(self.motor_interface.motor_on(motor_id, motor_type))
+        motor_feedback = feedback_from_infos(motor_infos)
         self._update_absolute_positions(motor_feedback)
         self.state = motor_feedback
+        self._publish_state(motor_feedback)
         self.running = True
         logging.info("starting separate thread for control loop")
 
     def start_thread(self) -> None:
         # clean error again for motor with timeout enabled
         self._motor_on()
-        thread = threading.Thread(target=self._set_torques_and_update_state)
-        thread.start()
+        self._stop_control_thread.clear()
+        self._control_thread = threading.Thread(target=self._set_torques_and_update_state)
+        self._control_thread.start()
+        if self.same_bus_device_driver is not None and self.motor_interface.receiver is not None:
+            # The replies of the same bus device are demultiplexed from the motor replies, it can be polled
+            # concurrently with the control loop.
+            same_bus_device_thread = threading.Thread(target=self._update_same_bus_device_states, daemon=True)
+            same_bus_device_thread.start()
         time.sleep(0.1)
         while self.state is None:
             time.sleep(0.1)
             logging.info("waiting for the first state")
 
+    def stop_thread(self) -> None:
+        """Stop the control loop thread and keep the motors on, control_step() must then be called by the owner of
+        the chain (see MultiArmBusManager)."""
+        self._stop_control_thread.set()
+        if self._control_thread is not None:
+            self._control_thread.join()
+            self._control_thread = None
+
+    def wait_for_cycle(self, last_cycle: int, timeout: float = 0.1) -> int:
+        """Block until a control cycle more recent than `last_cycle` has completed, and return its count."""
+        with self.cycle_condition:
+            self.cycle_condition.wait_for(lambda: self.cycle_count > last_cycle or not self.running, timeout=timeout)
+            return self.cycle_count
+
     def _set_torques_and_update_state(self) -> None:
         """
         Control loop for updating motor torques and states at a fixed frequency.
-        If step_time > EXPECTED_CONTROL_PERIODs, it will report the number of step_time > EXPECTED_CONTROL_PERIODs and mean step_time every REPORT_INTERVAL seconds.
+        The loop wakes up on absolute deadlines (see DeadlineScheduler), which reports overruns and the wake-up
+        jitter histogram every REPORT_INTERVAL seconds.
         """
-        last_step_time = time.time()
-        step_time_exceed_count = 0
-        step_time_sum = 0.0
-        step_time_count = 0
-        report_start_time = time.time()
+        self.scheduler.start()
         with RateRecorder(name=self) as rate_recorder:
-            while self.running:
+            while self.running and not self._stop_control_thread.is_set():
                 try:
-                    # Maintain control frequency
-                    while time.time() - last_step_time < CONTROL_PERIOD - 0.001:
-                        time.sleep(0.001)
-                    curr_time = time.time()
-                    step_time = curr_time - last_step_time
-                    last_step_time = curr_time
-
-                    # Statistics
-                    step_time_sum += step_time
-                    step_time_count += 1
-                    if step_time > EXPECTED_CONTROL_PERIOD:
-                        step_time_exceed_count += 1
-
-                    # If step_time > EXPECTED_CONTROL_PERIOD, report every REPORT_INTERVAL seconds
-                    if step_time_exceed_count > 0 and curr_time - report_start_time >= REPORT_INTERVAL:
-                        mean_step_time = step_time_sum / step_time_count if step_time_count > 0 else 0.0
-                        logging.info(
-                            f"[{self} {REPORT_INTERVAL}s Report] step_time > {EXPECTED_CONTROL_PERIOD}s: {step_time_exceed_count} times, mean step_time: {mean_step_time:.6f} s"
-                        )
-                        step_time_exceed_count = 0
-                        step_time_sum = 0.0
-                        step_time_count = 0
-                        report_start_time = curr_time
-
-                    # Update state
-                    with self.command_lock:
-                        motor_feedback = self._set_commands(self.commands)
-                        errors = np.array([motor_feedback[i].error_code != "0x1" for i in range(len(motor_feedback))])
-                        if np.any(errors):
-                            self.running = False
-                            logging.error(f"motor errors: {errors}")
-                            raise Exception("motors have errors, stopping control loop")
-
-                    with self.state_lock:
-                        self.state = motor_feedback
-                        self._update_absolute_positions(motor_feedback)
-                    if self.same_bus_device_driver is not None:
-                        time.sleep(0.001)
-                        with self.same_bus_device_lock:
-                            # assume the same bus device is a passive input device (no commands to send) for now.
-                            self.same_bus_device_states = self.same_bus_device_driver.read_states()
-                    time.sleep(0.0005)  # this is necessary, else the locks will not be released
+                    self.scheduler.wait()
+                    self.control_step()
                     rate_recorder.track()
                 except Exception as e:
                     print(f"DM Error in control loop: {e}")
                     self.running = False
+                    with self.cycle_condition:
+                        self.cycle_condition.notify_all()
                     raise e
 
-    def _set_commands(self, commands: List[MotorCmd]) -> List[MotorInfo]:
-        motor_feedback = []
-        for idx, motor_info in enumerate(self.motor_list):
-            motor_id, motor_type = motor_info
-            torque = commands[idx].torque * self.motor_direction[idx]
-            pos = self._joint_position_sim_to_real_idx(commands[idx].pos, idx)
+    def control_step(self) -> None:
+        """Run one control cycle: send the latest commands, then update and publish the state.
+
+        Called by the control loop thread, or by the owner of the chain when the thread is not started
+        (see MultiArmBusManager).
+        """
+        motor_feedback = self._set_commands(self.command_snapshot.read())
+        errors = motor_feedback["error_code"] != MotorErrorCode.normal
+        if np.any(errors):
+            self.running = False
+            error_messages = {
+                int(record["id"]): MotorErrorCode.get_error_message(record["error_code"])
+                for record in motor_feedback[errors]
+            }
+            logging.error(f"motor errors: {error_messages}")
+            raise Exception("motors have errors, stopping control loop")
 
-            vel = commands[idx].vel * self.motor_direction[idx]
-            kp = commands[idx].kp
-            kd = commands[idx].kd
+        self._update_absolute_positions(motor_feedback)
+        self.state = motor_feedback
+        self._publish_state(motor_feedback)
+        if self.same_bus_device_driver is not None and self.motor_interface.receiver is None:
+            time.sleep(0.001)
+            with self.same_bus_device_lock:
+                # assume the same bus device is a passive input device (no commands to send) for now.
+                self.same_bus_device_states = self.same_bus_device_driver.read_states()
+        with self.cycle_condition:
+            self.cycle_count += 1
+            self.cycle_condition.notify_all()
+
+    def _update_same_bus_device_states(self) -> None:
+        num_failures = 0
+        while self.running:
             try:
-                fd_back = self.motor_interface.set_control(
-                    motor_id=motor_id,
-                    motor_type=motor_type,
-                    pos=pos,
-                    vel=vel,
-                    kp=kp,
-                    kd=kd,
-                    torque=torque,
-                )
+                same_bus_device_states = self.same_bus_device_driver.read_states()
+            except AssertionError as e:
+                # e.g. no reply from the device, retried on the next period. Failures are only logged once per
+                # REPORT_INTERVAL while the device stays disconnected.
+                if num_failures % int(REPORT_INTERVAL * CONTROL_FREQ) == 0:
+                    logging.warning(f"{self} failed to read the same bus device ({num_failures + 1} times): {e}")
+                num_failures += 1
+                time.sleep(CONTROL_PERIOD)
+                continue
             except Exception as e:
-                logging.error(f"{idx}th motor at DMChainCanInterface {self} failed with info {motor_info}")
+                print(f"DM Error in same bus device loop: {e}")
+                self.running = False
+                with self.cycle_condition:
+                    self.cycle_condition.notify_all()
                 raise e
+            num_failures = 0
+            with self.same_bus_device_lock:
+                self.same_bus_device_states = same_bus_device_states
+            time.sleep(CONTROL_PERIOD)
+
+    def _publish_state(self, motor_feedback: np.ndarray) -> None:
+        with self.state_snapshot.write() as state:
+            state["id"][:] = motor_feedback["id"]
+            state["error_code"][:] = motor_feedback["error_code"]
+            np.multiply(motor_feedback["velocity"], self.motor_direction, out=state["vel"])
+            np.multiply(motor_feedback["torque"], self.motor_direction, out=state["eff"])
+            state["temp_mos"][:] = motor_feedback["temperature_mos"]
+            state["temp_rotor"][:] = motor_feedback["temperature_rotor"]
+            state["pos"][:] = self._joint_position_real_to_sim(self.absolute_positions)
+
+    def _set_commands(self, commands: Dict[str, np.ndarray]) -> np.ndarray:
+        """Sends one cycle of commands, given as arrays in the sim frame (see `command_snapshot`).
+
+        Returns the FEEDBACK_DTYPE records of the motors, see `DMSingleMotorCanInterface.set_controls_batch`.
+        """
+        torque = commands["torque"] * self.motor_direction
+        pos = commands["pos"] * self.motor_direction + self.motor_offset
+        vel = commands["vel"] * self.motor_direction
+        try:
+            return self.motor_interface.set_controls_batch(
+                self.codec, pos, vel, commands["kp"], commands["kd"], torque, batched=self.batched_io
+            )
+        except Exception as e:
+            logging.error(f"commands at DMChainCanInterface {self} failed with motors {self.motor_list}")
+            raise e
+
+    def set_motor_offsets(self, motor_offset: np.ndarray) -> None:
+        """Change the motor offsets, e.g. to unwrap the initial joint positions before starting the control loop."""
+        assert len(motor_offset) == len(self.motor_list)
+        self.motor_offset = np.array(motor_offset)
+        self._publish_state(self.state)
+
+    def read_state_arrays(self) -> Dict[str, np.ndarray]:
+        """Get a consistent copy of the latest state as arrays in the sim frame, without blocking the control loop.
 
-            motor_feedback.append(fd_back)
-        return motor_feedback
+        Returns:
+            Dict[str, np.ndarray]: id, error_code, pos, vel, eff, temp_mos and temp_rotor of each motor.
+        """
+        return self.state_snapshot.read()
 
     def read_states(self, torques: Optional[np.ndarray] = None) -> List[MotorInfo]:
-        motor_infos = []
-        with self.state_lock:
-            for idx in range(len(self.motor_list)):
-                state = self.state[idx]
-                motor_infos.append(
-                    MotorInfo(
-                        id=state.id,
-                        error_code=state.error_code,
-                        target_torque=torques[idx] if torques is not None else 0.0,
-                        vel=state.velocity * self.motor_direction[idx],
-                        eff=state.torque * self.motor_direction[idx],
-                        pos=self._joint_position_real_to_sim_idx(self.absolute_positions[idx], idx),
-                        temp_rotor=state.temperature_rotor,
-                        temp_mos=state.temperature_mos,
-                    )
-                )
-        return motor_infos
+        state = self.state_snapshot.read()
+        return [
+            MotorInfo(
+                id=int(state["id"][idx]),
+                error_code=hex(int(state["error_code"][idx])),
+                target_torque=torques[idx] if torques is not None else 0.0,
+                vel=state["vel"][idx],
+                eff=state["eff"][idx],
+                pos=state["pos"][idx],
+                temp_rotor=state["temp_rotor"][idx],
+                temp_mos=state["temp_mos"][idx],
+            )
+            for idx in range(len(self.motor_list))
+        ]
 
     def set_commands(
         self,
@@ -597,19 +752,15 @@ class DMChainCanInterface(MotorChain):
         kd: Optional[np.ndarray] = None,
         get_state: bool = True,
     ) -> List[MotorInfo]:
-        command = []
-        for idx in range(len(self.motor_list)):
-            command.append(
-                MotorCmd(
-                    torque=torques[idx],
-                    pos=pos[idx] if pos is not None else 0.0,
-                    vel=vel[idx] if vel is not None else 0.0,
-                    kp=kp[idx] if kp is not None else 0.0,
-                    kd=kd[idx] if kd is not None else 0.0,
-                )
-            )
+        zeros = np.zeros(len(self.motor_list))
         with self.command_lock:
-            self.commands = command
+            self.command_snapshot.publish(
+                torque=torques,
+                pos=pos if pos is not None else zeros,
+                vel=vel if vel is not None else zeros,
+                kp=kp if kp is not None else zeros,
+                kd=kd if kd is not None else zeros,
+            )
         if get_state:
             return self.read_states(torques=torques)
 
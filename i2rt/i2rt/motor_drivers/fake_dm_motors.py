@@ -0,0 +1,62 @@
+import heapq
+import threading
+import time
+from typing import Dict, List, Optional
+
+import can
+
+from i2rt.motor_drivers.utils import MotorErrorCode, MotorType, ReceiveMode, float_to_uint
+
+
+class FakeDMMotors:
+    """Emulates DM motors on a CAN bus, to run the drivers without hardware (benchmarks, tests).
+
+    Every frame sent to one of `motor_ids` (motor on, MIT control) is answered with a p16 feedback frame,
+    `latency` seconds after it was received. Motors process their frames concurrently, like on a real chain. The
+    feedback reports `positions[motor_id]` (0 by default), zero velocity and torque, and `error_code`.
+
+    Usage, on the python-can `virtual` interface:
+        motors = FakeDMMotors("virtual", "test_bus", motor_ids=[1, 2, 3], latency=200e-6)
+        ...
+        motors.close()
+    """
+
+    def __init__(
+        self,
+        bustype: str,
+        channel: str,
+        motor_ids: List[int],
+        latency: float,
+        positions: Optional[Dict[int, float]] = None,
+    ):
+        self.bus = can.interface.Bus(bustype=bustype, channel=channel)
+        self.motor_ids = set(motor_ids)
+        self.latency = latency
+        self.positions = positions if positions is not None else {}
+        self.error_code = MotorErrorCode.normal
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _reply(self, motor_id: int) -> can.Message:
+        const = MotorType.get_motor_constants(MotorType.DM4310)
+        p_int = float_to_uint(self.positions.get(motor_id, 0.0), const.POSITION_MIN, const.POSITION_MAX, 16)
+        # zero velocity and torque (mid range), 30 degrees
+        data = [(self.error_code << 4) | (motor_id & 0xF), p_int >> 8, p_int & 0xFF, 0x80, 0x08, 0x00, 30, 30]
+        return can.Message(arbitration_id=ReceiveMode.p16.get_receive_id(motor_id), data=data, is_extended_id=False)
+
+    def _run(self) -> None:
+        pending = []
+        while self.running:
+            timeout = max(pending[0][0] - time.perf_counter(), 0.0) if pending else 0.01
+            message = self.bus.recv(timeout=timeout)
+            if message is not None and message.arbitration_id in self.motor_ids:
+                heapq.heappush(pending, (time.perf_counter() + self.latency, message.arbitration_id))
+            while pending and pending[0][0] <= time.perf_counter():
+                _, motor_id = heapq.heappop(pending)
+                self.bus.send(self._reply(motor_id))
+
+    def close(self) -> None:
+        self.running = False
+        self.thread.join()
+        self.bus.shutdown()
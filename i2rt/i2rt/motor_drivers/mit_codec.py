@@ -0,0 +1,189 @@
+from typing import List, Optional
+
+import numpy as np
+
+from i2rt.motor_drivers.utils import FeedbackFrameInfo, MotorErrorCode, MotorType
+
+FRAME_SIZE = 8
+
+# Decoded feedback frames, one record per motor. error_code is the integer status of the motor (see MotorErrorCode).
+FEEDBACK_DTYPE = np.dtype(
+    [
+        ("id", np.int32),
+        ("error_code", np.uint8),
+        ("position", np.float64),
+        ("velocity", np.float64),
+        ("torque", np.float64),
+        ("temperature_mos", np.float64),
+        ("temperature_rotor", np.float64),
+    ]
+)
+
+# Bit width of the pos, vel, kp, kd and torque fields of a MIT command frame
+_COMMAND_BITS = np.array([16, 12, 12, 12, 12])
+# Bit width of the position, velocity and torque fields of a feedback frame
+_FEEDBACK_BITS = np.array([16, 12, 12])
+
+
+class MITBatchCodec:
+    """Packs the MIT commands and unpacks the feedback frames of a chain of DM motors, all motors at once.
+
+    The per-motor range constants are looked up once at construction, and the frames are packed into and parsed from
+    preallocated buffers with numpy, instead of going through `float_to_uint`/`uint_to_float` for each field of
+    each motor. The results are bit-identical to `DMSingleMotorCanInterface._encode_control_data` and
+    `DMSingleMotorCanInterface.parse_recv_message`.
+
+    Usage:
+        codec = MITBatchCodec([1, 2], ["DM4340", "DM4310"])
+        codec.encode(pos, vel, kp, kd, torque)
+        bus.send(can.Message(arbitration_id=1, data=codec.command_payload(0), is_extended_id=False))
+        ...
+        codec.set_feedback_payload(0, reply.data)
+        feedback = codec.decode()
+        errors = feedback["error_code"] != MotorErrorCode.normal
+    """
+
+    def __init__(self, motor_ids: List[int], motor_types: List[str]):
+        assert len(motor_ids) == len(motor_types)
+        self.motor_ids = np.array(motor_ids, dtype=np.int32)
+        self.motor_types = list(motor_types)
+        self.num_motors = len(motor_ids)
+        consts = [MotorType.get_motor_constants(motor_type) for motor_type in motor_types]
+
+        # columns: pos, vel, kp, kd, torque
+        self._command_min = np.array(
+            [[c.POSITION_MIN, c.VELOCITY_MIN, c.KP_MIN, c.KD_MIN, c.TORQUE_MIN] for c in consts], dtype=np.float64
+        )
+        self._command_max = np.array(
+            [[c.POSITION_MAX, c.VELOCITY_MAX, c.KP_MAX, c.KD_MAX, c.TORQUE_MAX] for c in consts], dtype=np.float64
+        )
+        self._command_span = self._command_max - self._command_min
+        self._command_full_scale = ((1 << _COMMAND_BITS) - 1).astype(np.float64)
+        self._commands = np.zeros((self.num_motors, 5), dtype=np.float64)
+        self._command_ints = np.zeros((self.num_motors, 5), dtype=np.int64)
+
+        # columns: position, velocity, torque
+        self._feedback_min = np.array(
+            [[c.POSITION_MIN, c.VELOCITY_MIN, c.TORQUE_MIN] for c in consts], dtype=np.float64
+        )
+        feedback_max = np.array([[c.POSITION_MAX, c.VELOCITY_MAX, c.TORQUE_MAX] for c in consts], dtype=np.float64)
+        self._feedback_span = feedback_max - self._feedback_min
+        self._feedback_full_scale = ((1 << _FEEDBACK_BITS) - 1).astype(np.float64)
+        self._feedback_data = np.zeros((self.num_motors, FRAME_SIZE), dtype=np.int64)
+        self._feedback_ints = np.zeros((self.num_motors, 3), dtype=np.int64)
+        self._feedback_floats = np.zeros((self.num_motors, 3), dtype=np.float64)
+
+        # the payloads of all the motors, back-to-back. The numpy views share the memory of the bytearrays.
+        self.command_buffer = bytearray(FRAME_SIZE * self.num_motors)
+        self.command_bytes = np.frombuffer(self.command_buffer, dtype=np.uint8).reshape(self.num_motors, FRAME_SIZE)
+        self.feedback_buffer = bytearray(FRAME_SIZE * self.num_motors)
+        self.feedback_bytes = np.frombuffer(self.feedback_buffer, dtype=np.uint8).reshape(self.num_motors, FRAME_SIZE)
+        self.feedback = np.zeros(self.num_motors, dtype=FEEDBACK_DTYPE)
+        self.feedback["id"] = self.motor_ids
+
+    def encode(
+        self, pos: np.ndarray, vel: np.ndarray, kp: np.ndarray, kd: np.ndarray, torque: np.ndarray
+    ) -> np.ndarray:
+        """Packs the MIT commands of all the motors into `command_buffer`.
+
+        Returns:
+            np.ndarray: The payloads, a (num_motors, 8) uint8 view of `command_buffer`.
+        """
+        commands = self._commands
+        commands[:, 0] = pos
+        commands[:, 1] = vel
+        commands[:, 2] = kp
+        commands[:, 3] = kd
+        commands[:, 4] = torque
+        # same operations as float_to_uint: clip, then int((x - x_min) * ((1 << bits) - 1) / span)
+        np.clip(commands, self._command_min, self._command_max, out=commands)
+        np.subtract(commands, self._command_min, out=commands)
+        np.multiply(commands, self._command_full_scale, out=commands)
+        np.divide(commands, self._command_span, out=commands)
+        ints = self._command_ints
+        ints[:] = commands  # truncation, the values are non-negative
+        pos_int, vel_int, kp_int, kd_int, tor_int = ints.T
+
+        out = self.command_bytes
+        out[:, 0] = pos_int >> 8
+        out[:, 1] = pos_int & 0xFF
+        out[:, 2] = vel_int >> 4
+        out[:, 3] = ((vel_int & 0xF) << 4) | (kp_int >> 8)
+        out[:, 4] = kp_int & 0xFF
+        out[:, 5] = kd_int >> 4
+        out[:, 6] = ((kd_int & 0xF) << 4) | (tor_int >> 8)
+        out[:, 7] = tor_int & 0xFF
+        return out
+
+    def command_payload(self, idx: int) -> memoryview:
+        """The payload of the `idx`th motor in `command_buffer`, valid until the next `encode`."""
+        return memoryview(self.command_buffer)[FRAME_SIZE * idx : FRAME_SIZE * (idx + 1)]
+
+    def set_feedback_payload(self, idx: int, data: bytes) -> None:
+        """Copies the payload of the reply of the `idx`th motor into `feedback_buffer`."""
+        if len(data) != FRAME_SIZE:
+            raise ValueError(f"motor id {self.motor_ids[idx]}: expected a {FRAME_SIZE} bytes reply, got {len(data)}")
+        self.feedback_buffer[FRAME_SIZE * idx : FRAME_SIZE * (idx + 1)] = data
+
+    def decode(self, payloads: Optional[np.ndarray] = None) -> np.ndarray:
+        """Parses the feedback frames of all the motors.
+
+        Args:
+            payloads (Optional[np.ndarray]): (num_motors, 8) uint8 payloads, `feedback_bytes` by default.
+
+        Returns:
+            np.ndarray: The `feedback` array of FEEDBACK_DTYPE records, overwritten by the next `decode`.
+        """
+        data = self._feedback_data
+        np.copyto(data, self.feedback_bytes if payloads is None else payloads)
+        ints = self._feedback_ints
+        ints[:, 0] = (data[:, 1] << 8) | data[:, 2]
+        ints[:, 1] = (data[:, 3] << 4) | (data[:, 4] >> 4)
+        ints[:, 2] = ((data[:, 4] & 0xF) << 8) | data[:, 5]
+        # same operations as uint_to_float: x_int * span / ((1 << bits) - 1) + x_min
+        floats = self._feedback_floats
+        np.multiply(ints, self._feedback_span, out=floats)
+        np.divide(floats, self._feedback_full_scale, out=floats)
+        np.add(floats, self._feedback_min, out=floats)
+
+        feedback = self.feedback
+        feedback["error_code"] = data[:, 0] >> 4
+        feedback["position"] = floats[:, 0]
+        feedback["velocity"] = floats[:, 1]
+        feedback["torque"] = floats[:, 2]
+        feedback["temperature_mos"] = data[:, 6]
+        feedback["temperature_rotor"] = data[:, 7]
+        return feedback
+
+
+def feedback_from_infos(infos: List[FeedbackFrameInfo]) -> np.ndarray:
+    """Converts parsed feedback frames (see `DMSingleMotorCanInterface.parse_recv_message`) to FEEDBACK_DTYPE."""
+    feedback = np.zeros(len(infos), dtype=FEEDBACK_DTYPE)
+    for idx, info in enumerate(infos):
+        feedback[idx] = (
+            info.id,
+            int(info.error_code, 16),
+            info.position,
+            info.velocity,
+            info.torque,
+            info.temperature_mos,
+            info.temperature_rotor,
+        )
+    return feedback
+
+
+def feedback_to_infos(feedback: np.ndarray) -> List[FeedbackFrameInfo]:
+    """Converts FEEDBACK_DTYPE records to FeedbackFrameInfo, with hex string error codes like `parse_recv_message`."""
+    return [
+        FeedbackFrameInfo(
+            id=int(record["id"]),
+            error_code=hex(int(record["error_code"])),
+            error_message=MotorErrorCode.get_error_message(int(record["error_code"])),
+            position=float(record["position"]),
+            velocity=float(record["velocity"]),
+            torque=float(record["torque"]),
+            temperature_mos=float(record["temperature_mos"]),
+            temperature_rotor=float(record["temperature_rotor"]),
+        )
+        for record in feedback
+    ]
@@ -0,0 +1,99 @@
+from typing import Iterator, List
+
+import can
+import numpy as np
+import pytest
+
+from i2rt.motor_drivers.dm_driver import ControlMode, DMSingleMotorCanInterface
+from i2rt.motor_drivers.mit_codec import MITBatchCodec
+from i2rt.motor_drivers.utils import MotorErrorCode, MotorType, ReceiveMode
+
+MOTOR_TYPES = [MotorType.DM4340, MotorType.DM4310, MotorType.DM8009, MotorType.DMH6215, MotorType.DM4310V]
+MOTOR_IDS = list(range(1, len(MOTOR_TYPES) + 1))
+
+
+@pytest.fixture
+def interface() -> Iterator[DMSingleMotorCanInterface]:
+    interface = DMSingleMotorCanInterface(
+        control_mode=ControlMode.MIT, channel="test_mit_codec", bustype="virtual", name="test_mit_codec"
+    )
+    yield interface
+    interface.close()
+
+
+def per_motor_payloads(interface: DMSingleMotorCanInterface, commands: np.ndarray, motor_types: List[str]) -> bytes:
+    return b"".join(
+        interface._encode_control_data(motor_type, *commands[:, idx]) for idx, motor_type in enumerate(motor_types)
+    )
+
+
+@pytest.mark.parametrize("scale", [1.0, 100.0])
+def test_encode_matches_per_motor_codec(interface: DMSingleMotorCanInterface, scale: float) -> None:
+    # with scale=100, most of the values are out of range and clipped
+    rng = np.random.default_rng(0)
+    codec = MITBatchCodec(MOTOR_IDS, MOTOR_TYPES)
+    for _ in range(200):
+        pos, vel, torque = rng.uniform(-10.0, 10.0, size=(3, len(MOTOR_IDS))) * scale
+        kp, kd = rng.uniform(0.0, 500.0, size=len(MOTOR_IDS)) * scale, rng.uniform(0.0, 5.0, size=len(MOTOR_IDS))
+        codec.encode(pos, vel, kp, kd, torque)
+        expected = per_motor_payloads(interface, np.stack([pos, vel, kp, kd, torque]), MOTOR_TYPES)
+        assert bytes(codec.command_buffer) == expected
+
+
+def test_encode_range_limits(interface: DMSingleMotorCanInterface) -> None:
+    codec = MITBatchCodec(MOTOR_IDS, MOTOR_TYPES)
+    consts = [MotorType.get_motor_constants(motor_type) for motor_type in MOTOR_TYPES]
+    for limit in ["MIN", "MAX"]:
+        commands = np.array(
+            [
+                [getattr(c, f"{name}_{limit}") for c in consts]
+                for name in ["POSITION", "VELOCITY", "KP", "KD", "TORQUE"]
+            ]
+        )
+        codec.encode(*commands)
+        assert bytes(codec.command_buffer) == per_motor_payloads(interface, commands, MOTOR_TYPES)
+
+
+def test_decode_matches_per_motor_codec(interface: DMSingleMotorCanInterface) -> None:
+    rng = np.random.default_rng(0)
+    codec = MITBatchCodec(MOTOR_IDS, MOTOR_TYPES)
+    error_codes = [MotorErrorCode.normal, MotorErrorCode.disabled, MotorErrorCode.overload, 0x7]
+    for _ in range(200):
+        replies = []
+        for idx, motor_id in enumerate(MOTOR_IDS):
+            data = rng.integers(0, 256, size=8, dtype=np.uint8)
+            data[0] = (rng.choice(error_codes) << 4) | (motor_id & 0xF)
+            arbitration_id = ReceiveMode.p16.get_receive_id(motor_id)
+            replies.append(can.Message(arbitration_id=arbitration_id, data=data.tobytes(), is_extended_id=False))
+            codec.set_feedback_payload(idx, replies[-1].data)
+        feedback = codec.decode()
+
+        for record, reply, motor_type in zip(feedback, replies, MOTOR_TYPES, strict=True):
+            info = interface.parse_recv_message(reply, motor_type, ignore_error=True)
+            assert record["id"] == info.id
+            assert record["error_code"] == int(info.error_code, 16)
+            for name in ["position", "velocity", "torque", "temperature_mos", "temperature_rotor"]:
+                assert record[name] == getattr(info, name), name
+
+
+def test_decode_reports_motor_errors(interface: DMSingleMotorCanInterface) -> None:
+    codec = MITBatchCodec(MOTOR_IDS, MOTOR_TYPES)
+    for idx, motor_id in enumerate(MOTOR_IDS):
+        error_code = MotorErrorCode.over_current if motor_id == 2 else MotorErrorCode.normal
+        codec.set_feedback_payload(idx, bytes([(error_code << 4) | motor_id, 0x80, 0, 0x80, 0x08, 0, 30, 30]))
+    feedback = codec.decode()
+    errors = feedback["error_code"] != MotorErrorCode.normal
+    assert feedback["id"][errors].tolist() == [2]
+    assert feedback["error_code"][errors].tolist() == [MotorErrorCode.over_current]
+
+    # the per-motor codec raises on the same frame
+    data = bytes(codec.feedback_bytes[1])
+    reply = can.Message(arbitration_id=ReceiveMode.p16.get_receive_id(2), data=data, is_extended_id=False)
+    with pytest.raises(RuntimeError, match="Motor error detected"):
+        interface.parse_recv_message(reply, MOTOR_TYPES[1])
+
+
+def test_feedback_payload_size() -> None:
+    codec = MITBatchCodec(MOTOR_IDS, MOTOR_TYPES)
+    with pytest.raises(ValueError):
+        codec.set_feedback_payload(0, bytes(7))
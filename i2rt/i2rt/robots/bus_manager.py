@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from i2rt.motor_drivers.dm_driver import CONTROL_PERIOD, REPORT_INTERVAL
+from i2rt.robots.motor_chain_robot import MotorChainRobot
+from i2rt.utils.scheduler import DeadlineScheduler
+from i2rt.utils.snapshot import ArraySnapshot
+
+
+class MultiArmBusManager:
+    """Drives several arms, each on its own CAN channel, from a single control loop thread.
+
+    The arms are MotorChainRobot on DMChainCanInterface, created as usual (e.g. by `get_yam_robot`) so that they
+    can calibrate. On `start`, the manager stops their robot server and control loop threads and takes over: at
+    each cycle, it runs the bus I/O of every chain, then the update (gravity compensation, gripper force limit) of
+    every robot, and publishes the joint states of all the arms as one snapshot with a single timestamp. This
+    replaces two busy threads per arm with one thread for all of them.
+
+    Usage:
+        manager = MultiArmBusManager({"left": robot_left, "right": robot_right})
+        manager.start()
+        state = manager.read_state()  # {"timestamp": t, "left": {"pos": ..., ...}, "right": {...}}
+        manager.close()
+    """
+
+    def __init__(
+        self,
+        robots: Dict[str, MotorChainRobot],
+        period: float = CONTROL_PERIOD,
+        realtime_priority: Optional[int] = None,
+        cpu_affinity: Optional[List[int]] = None,
+    ):
+        """
+        :param robots: The arms, by name.
+        :param period: Period of the control loop in seconds.
+        :param realtime_priority: SCHED_FIFO priority of the control loop thread (1-99), if given.
+        :param cpu_affinity: CPUs the control loop thread is pinned to, if given.
+        """
+        self.robots = robots
+
+        # joint states of all the arms back-to-back, self.slices gives the joints of each arm
+        self.slices: Dict[str, slice] = {}
+        start = 0
+        for name, robot in robots.items():
+            self.slices[name] = slice(start, start + robot.num_dofs())
+            start += robot.num_dofs()
+        self.snapshot = ArraySnapshot({"timestamp": (1,), "pos": (start,), "vel": (start,), "eff": (start,)})
+        self._publish_state()
+
+        self.scheduler = DeadlineScheduler(
+            period,
+            name=f"{self}",
+            report_interval=REPORT_INTERVAL,
+            realtime_priority=realtime_priority,
+            cpu_affinity=cpu_affinity,
+        )
+        self.cycle_condition = threading.Condition()
+        self.cycle_count = 0
+        self.running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return f"MultiArmBusManager(arms={list(self.robots)})"
+
+    def start(self) -> None:
+        """Take over the threads of the arms and start the control loop."""
+        for robot in self.robots.values():
+            robot.stop_server()
+            robot.motor_chain.stop_thread()
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name="multi_arm_bus_manager")
+        self._thread.start()
+
+    def _run(self) -> None:
+        self.scheduler.start()
+        while self.running:
+            try:
+                self.scheduler.wait()
+                self.step()
+            except Exception as e:
+                logging.error(f"{self}: error in control loop: {e}")
+                self.running = False
+                for robot in self.robots.values():
+                    robot.motor_chain.running = False
+                with self.cycle_condition:
+                    self.cycle_condition.notify_all()
+                raise e
+
+    def step(self) -> None:
+        """Run one control cycle for all the arms."""
+        for robot in self.robots.values():
+            robot.motor_chain.control_step()
+        # the torques are computed from the state of this cycle and sent on the next one
+        for robot in self.robots.values():
+            robot.update()
+        self._publish_state()
+        with self.cycle_condition:
+            self.cycle_count += 1
+            self.cycle_condition.notify_all()
+
+    def _publish_state(self) -> None:
+        with self.snapshot.write() as state:
+            state["timestamp"][0] = time.time()
+            for name, robot in self.robots.items():
+                # the joint state of a robot is only written by update(), from this thread
+                joint_state = robot.get_joint_state()
+                state["pos"][self.slices[name]] = joint_state.pos
+                state["vel"][self.slices[name]] = joint_state.vel
+                state["eff"][self.slices[name]] = joint_state.eff
+
+    def read_state(self) -> Dict[str, Any]:
+        """Get the joint states of all the arms, from the same control cycle.
+
+        Returns:
+            Dict[str, Any]: "timestamp" (time.time() at the end of the cycle), and the pos, vel and eff arrays of
+                each arm by name, like `MotorChainRobot.get_joint_pos`.
+        """
+        state = self.snapshot.read()
+        result: Dict[str, Any] = {"timestamp": float(state["timestamp"][0])}
+        for name, arm_slice in self.slices.items():
+            result[name] = {field: state[field][arm_slice] for field in ["pos", "vel", "eff"]}
+        return result
+
+    def wait_for_cycle(self, last_cycle: int, timeout: float = 0.1) -> int:
+        """Block until a control cycle more recent than `last_cycle` has completed, and return its count."""
+        with self.cycle_condition:
+            self.cycle_condition.wait_for(lambda: self.cycle_count > last_cycle or not self.running, timeout=timeout)
+            return self.cycle_count
+
+    def close(self) -> None:
+        """Stop the control loop and close all the arms."""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join()
+        for robot in self.robots.values():
+            robot.close()
@@ -1,5 +1,4 @@
 import logging
-import time
 from functools import partial
 
 import numpy as np
@@ -24,6 +23,8 @@ def get_yam_robot(
     channel: str = "can0",
     gripper_type: GripperType = GripperType.CRANK_4310,
     zero_gravity_mode:bool = False,
+    batched_io: bool = False,
+    use_background_receiver: bool = False,
 ) -> MotorChainRobot:
     with_gripper = True
     with_teaching_handle = False
@@ -64,6 +65,7 @@ def get_yam_robot(
         kp = np.concatenate([kp, np.array([gripper_kp])])
         kd = np.concatenate([kd, np.array([gripper_kd])])
 
+    # the control loop is started once the motor offsets are adjusted below
     motor_chain = DMChainCanInterface(
         motor_list,
         motor_offsets,
@@ -72,10 +74,13 @@ def get_yam_robot(
         motor_chain_name="yam_real",
         receive_mode=ReceiveMode.p16,
         start_thread=False,
+        get_same_bus_device_driver=get_encoder_chain if with_teaching_handle else None,
+        use_buffered_reader=False,
+        batched_io=batched_io,
+        use_background_receiver=use_background_receiver,
     )
     motor_states = motor_chain.read_states()
     print(f"motor_states: {motor_states}")
-    motor_chain.close()
 
     current_pos = [m.pos for m in motor_states]
     logging.info(f"current_pos: {current_pos}")
@@ -93,19 +98,10 @@ def get_yam_robot(
             extra_offset = 0.0
         motor_offsets[idx] += extra_offset
 
-    time.sleep(0.5)
     logging.info(f"adjusted motor_offsets: {motor_offsets}")
-
-    motor_chain = DMChainCanInterface(
-        motor_list,
-        motor_offsets,
-        motor_directions,
-        channel,
-        motor_chain_name="yam_real",
-        receive_mode=ReceiveMode.p16,
-        get_same_bus_device_driver=get_encoder_chain if with_teaching_handle else None,
-        use_buffered_reader=False,
-    )
+    motor_chain.set_motor_offsets(motor_offsets)
+    motor_chain.start_thread()
+    motor_chain.start_thread_flag = True
     motor_states = motor_chain.read_states()
     logging.info(f"YAM initial motor_states: {motor_states}")
     get_robot = partial(
@@ -1,11 +1,26 @@
+import multiprocessing
 import time
-from typing import List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
 import mink
 import mujoco
 import numpy as np
 
 
+@dataclass
+class IKResult:
+    """Outcome of one inverse kinematics solve."""
+
+    success: bool
+    q: np.ndarray
+    num_iters: int
+    pos_error: float  # norm of the position error of the site, in m
+    ori_error: float  # norm of the orientation error of the site, in rad
+    solve_time: float  # in s
+
+
 class Kinematics:
     def __init__(self, xml_path: str, site_name: Optional[str]):
         """Initialize the Kinematics object.
@@ -15,8 +30,10 @@ class Kinematics:
             site_name (Optional[str]): Name of the site for which to compute the forward kinematics.
         """
         model = mujoco.MjModel.from_xml_path(xml_path)
+        self._xml_path = xml_path
         self._configuration = mink.Configuration(model)
         self._site_name = site_name
+        self._frame_tasks: Dict[str, mink.FrameTask] = {}
 
     def fk(self, q: np.ndarray, site_name: Optional[str] = None) -> np.ndarray:
         """Compute the forward kinematics for the given joint configuration.
@@ -34,6 +51,68 @@ class Kinematics:
         assert site_name is not None, "site_name must be provided"
         return self._configuration.get_transform_frame_to_world(site_name, "site").as_matrix()
 
+    def _get_frame_task(self, site_name: str) -> mink.FrameTask:
+        """The end effector task of a site, created once and retargeted at each solve."""
+        if site_name not in self._frame_tasks:
+            self._frame_tasks[site_name] = mink.FrameTask(
+                frame_name=site_name,
+                frame_type="site",
+                position_cost=1.0,
+                orientation_cost=1.0,
+                lm_damping=1.0,
+            )
+        return self._frame_tasks[site_name]
+
+    def solve_ik(
+        self,
+        target_pose: np.ndarray,
+        site_name: str,
+        init_q: Optional[np.ndarray] = None,
+        limits: Optional[List[mink.Limit]] = None,
+        dt: float = 0.01,
+        solver: str = "quadprog",
+        pos_threshold: float = 1e-4,
+        ori_threshold: float = 1e-4,
+        damping: float = 1e-4,
+        max_iters: int = 200,
+    ) -> IKResult:
+        """Differential ik solver, leverging mink. Same as `ik`, with the convergence stats of the solve.
+
+        Without `init_q`, the solve starts from the current configuration: the previous solution, or the
+        configuration of the last `fk` call. If it already reaches the target pose, no iteration is run.
+
+        Returns:
+            IKResult: The success flag, the joint configuration (a copy) and the convergence stats.
+        """
+        if init_q is not None:
+            self._configuration.update(init_q)
+
+        end_effector_task = self._get_frame_task(site_name)
+        end_effector_task.set_target(mink.SE3.from_matrix(target_pose))
+        tasks = [end_effector_task]
+
+        start_time = time.time()  # Start timing
+        num_iters = 0
+        while True:
+            err = end_effector_task.compute_error(self._configuration)
+            pos_error = float(np.linalg.norm(err[:3]))
+            ori_error = float(np.linalg.norm(err[3:]))
+            success = pos_error <= pos_threshold and ori_error <= ori_threshold
+            if success or num_iters >= max_iters:
+                break
+            vel = mink.solve_ik(self._configuration, tasks, dt, solver, damping=damping, limits=limits)
+            self._configuration.integrate_inplace(vel, dt)
+            num_iters += 1
+
+        return IKResult(
+            success=success,
+            q=self._configuration.q.copy(),
+            num_iters=num_iters,
+            pos_error=pos_error,
+            ori_error=ori_error,
+            solve_time=time.time() - start_time,
+        )
+
     def ik(
         self,
         target_pose: np.ndarray,
@@ -66,45 +145,111 @@ class Kinematics:
         Returns:
             Tuple[bool, np.ndarray]: Success flag and the converged joint configuration.
         """
-        if init_q is not None:
-            self._configuration.update(init_q)
-
-        end_effector_task = mink.FrameTask(
-            frame_name=site_name,
-            frame_type="site",
-            position_cost=1.0,
-            orientation_cost=1.0,
-            lm_damping=1.0,
+        result = self.solve_ik(
+            target_pose,
+            site_name,
+            init_q=init_q,
+            limits=limits,
+            dt=dt,
+            solver=solver,
+            pos_threshold=pos_threshold,
+            ori_threshold=ori_threshold,
+            damping=damping,
+            max_iters=max_iters,
         )
+        if verbose:
+            if result.success:
+                print(
+                    f"Exiting after {result.num_iters} iterations, configuration: {result.q}, time taken: {result.solve_time:.4f} seconds"
+                )
+            else:
+                print(
+                    f"Failed to converge after {max_iters} iterations, time taken: {result.solve_time:.4f} seconds, pos_err: {result.pos_error}, rot_err: {result.ori_error}"
+                )
+        return result.success, result.q
 
-        end_effector_task.set_target(mink.SE3.from_matrix(target_pose))
-        tasks = [end_effector_task]
+    def ik_trajectory(
+        self,
+        target_poses: np.ndarray,
+        site_name: str,
+        init_q: Optional[np.ndarray] = None,
+        num_workers: int = 0,
+        chunk_size: int = 200,
+        **ik_kwargs: Any,
+    ) -> List[IKResult]:
+        """Solve the inverse kinematics of a sequence of poses, each solve warm-started from the previous solution.
 
-        start_time = time.time()  # Start timing
+        Consecutive poses of a trajectory are close, so the warm-started solves take a few iterations each.
 
-        for j in range(max_iters):
-            vel = mink.solve_ik(self._configuration, tasks, dt, solver, damping=damping, limits=limits)
-            self._configuration.integrate_inplace(vel, dt)
-            err = end_effector_task.compute_error(self._configuration)
+        Args:
+            target_poses (np.ndarray): The target poses to reach. Shape: (N, 4, 4)
+            site_name (str): Name of the desired site.
+            init_q (Optional[np.ndarray]): Initial joint configuration of the first solve, the current
+                configuration by default (see `solve_ik`).
+            num_workers (int): If positive, the trajectory is split in chunks of `chunk_size` poses, solved in
+                parallel by a pool of processes (for offline batches). The first poses of the chunks are solved
+                first, serially, each warm-started from the previous one, and each chunk then starts from the
+                solution of its first pose. The solutions are close to the ones of the serial solve, but not
+                identical, since the first solve of a chunk doesn't start from the last solution of the previous
+                chunk. The limits must be picklable.
+            **ik_kwargs: The other arguments of `solve_ik`.
 
-            pos_achieved = np.linalg.norm(err[:3]) <= pos_threshold
-            ori_achieved = np.linalg.norm(err[3:]) <= ori_threshold
-            if pos_achieved and ori_achieved:
-                end_time = time.time()  # End timing
-                elapsed_time = end_time - start_time
-                if verbose:
-                    print(
-                        f"Exiting after {j} iterations, configuration: {self._configuration.q}, time taken: {elapsed_time:.4f} seconds"
-                    )
-                return True, self._configuration.q
-
-        end_time = time.time()  # End timing
-        elapsed_time = end_time - start_time
-        if verbose:
-            print(
-                f"Failed to converge after {max_iters} iterations, time taken: {elapsed_time:.4f} seconds, pos_err: {err[:3]}, rot_err: {err[3:]}"
-            )
-        return False, self._configuration.q
+        Returns:
+            List[IKResult]: The result of each solve, see `summarize_ik_results`.
+        """
+        if num_workers > 0 and len(target_poses) > chunk_size:
+            starts = range(0, len(target_poses), chunk_size)
+            chunk_init_qs = [
+                self.solve_ik(target_poses[start], site_name, init_q=init_q if idx == 0 else None, **ik_kwargs).q
+                for idx, start in enumerate(starts)
+            ]
+            chunks = [
+                (target_poses[start : start + chunk_size], site_name, chunk_init_q, ik_kwargs)
+                for start, chunk_init_q in zip(starts, chunk_init_qs, strict=True)
+            ]
+            with ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ik_worker,
+                initargs=(self._xml_path, self._site_name),
+            ) as executor:
+                results = [result for chunk in executor.map(_solve_ik_chunk, chunks) for result in chunk]
+            # like the serial solve, the configuration ends at the last solution
+            self._configuration.update(results[-1].q)
+            return results
+
+        results = []
+        for idx, target_pose in enumerate(target_poses):
+            results.append(self.solve_ik(target_pose, site_name, init_q=init_q if idx == 0 else None, **ik_kwargs))
+        return results
+
+
+def summarize_ik_results(results: List[IKResult]) -> Dict[str, float]:
+    """Convergence stats of several solves."""
+    num_iters = np.array([result.num_iters for result in results])
+    return {
+        "num_solves": len(results),
+        "success_rate": float(np.mean([result.success for result in results])),
+        "mean_iters": float(num_iters.mean()),
+        "max_iters": int(num_iters.max()),
+        "mean_solve_time": float(np.mean([result.solve_time for result in results])),
+        "max_pos_error": float(max(result.pos_error for result in results)),
+        "max_ori_error": float(max(result.ori_error for result in results)),
+    }
+
+
+# Kinematics of a worker process of Kinematics.ik_trajectory
+_worker_kinematics: Optional[Kinematics] = None
+
+
+def _init_ik_worker(xml_path: str, site_name: Optional[str]) -> None:
+    global _worker_kinematics
+    _worker_kinematics = Kinematics(xml_path, site_name)
+
+
+def _solve_ik_chunk(args: Tuple[np.ndarray, str, np.ndarray, Dict[str, Any]]) -> List[IKResult]:
+    target_poses, site_name, init_q, ik_kwargs = args
+    return _worker_kinematics.ik_trajectory(target_poses, site_name, init_q=init_q, **ik_kwargs)
 
 
 def main() -> None:
@@ -1,4 +1,3 @@
-import copy
 import logging
 import os
 import threading
@@ -14,7 +13,13 @@ from i2rt.motor_drivers.dm_driver import (
 )
 from i2rt.robots.robot import Robot
 from i2rt.robots.utils import GripperForceLimiter, GripperType, JointMapper
+from i2rt.utils.gravity_cache import TaylorGravityCache
 from i2rt.utils.mujoco_utils import MuJoCoKDL
+from i2rt.utils.scheduler import DeadlineScheduler
+from i2rt.utils.snapshot import ArraySnapshot
+
+# Period of the robot update loop when the motor chain has no control cycle to phase-lock on
+UPDATE_PERIOD = 0.004
 
 
 @dataclass
@@ -78,6 +83,8 @@ class MotorChainRobot(Robot):
         temp_record_flag: bool = False,  # whether record the motor's temperature
         enable_gripper_calibration: bool = False,  # whether to auto-detect gripper limits
         zero_gravity_mode:bool = True,
+        gravity_cache_radius: float = 0.02,  # rad, see TaylorGravityCache. 0 computes the exact torques at each update
+        gravity_cache_tolerance: float = 0.02,  # Nm, max error of the extrapolated gravity torques
         # below are calibration parameters
         test_torque: float = 0.5,  # test torque for gripper detection (Nm)
         test_duration: float = 2.0,  # max test duration for each direction (s)
@@ -168,8 +175,15 @@ class MotorChainRobot(Robot):
         print(f"use_gravity_comp: {use_gravity_comp}", f"xml_path: {xml_path}")
         print(f"joint_limits: {joint_limits}")
         # return
+        self.gravity_model: Optional[TaylorGravityCache] = None
         if xml_path is not None:
-            pass
+            if use_gravity_comp:
+                self.kdl = MuJoCoKDL(os.path.expanduser(xml_path))
+                if gravity is not None:
+                    self.kdl.set_gravity(gravity)
+                self.gravity_model = TaylorGravityCache(
+                    self.kdl, radius=gravity_cache_radius, torque_tolerance=gravity_cache_tolerance
+                )
             # self.xml_path = os.path.expanduser(xml_path)
             # self.kdl = MuJoCoKDL(self.xml_path)
             # if gravity is not None:
@@ -186,14 +200,21 @@ class MotorChainRobot(Robot):
                 "Lower joint limits must be smaller than upper limits"
             )
             self._joint_limits = joint_limits
+        n_joints = len(motor_chain)
+        # The server thread publishes the joint state and reads the commands, the other threads never block it.
+        # _command_lock only serializes the command writers.
         self._command_lock = threading.Lock()
-        self._state_lock = threading.Lock()
+        self._state_snapshot = ArraySnapshot(
+            {name: (n_joints,) for name in ["pos", "vel", "eff", "temp_mos", "temp_rotor"]}
+        )
+        self._command_snapshot = ArraySnapshot({name: (n_joints,) for name in ["torques", "pos", "vel", "kp", "kd"]})
         self._joint_state: Optional[JointStates] = None
         while self._joint_state is None:
             # wait to recive joint data
             time.sleep(0.05)
             self._joint_state = self._motor_state_to_joint_state(self.motor_chain.read_states())
-        self._commands = JointCommands.init_all_zero(len(motor_chain))
+        self._publish_joint_state(self._joint_state)
+        self._publish_commands(JointCommands.init_all_zero(n_joints))
         # For SWE-454, check if the current qpos is in the joint limits
         self._check_current_qpos_in_joint_limits()
 
@@ -263,21 +284,33 @@ class MotorChainRobot(Robot):
         }
 
     def start_server(self) -> None:
-        """Start the server."""
+        """Start the server.
+
+        When the motor chain exposes its control cycles (`wait_for_cycle`), each update runs right after a bus
+        I/O cycle, so that the gravity compensation torques are computed from the latest state and sent on the
+        next cycle. Otherwise, the updates are paced on absolute deadlines.
+        """
         last_time = time.time()
         iteration_count = 0
         self.update()
 
         logging.info("initializing, ....")
 
+        phase_locked = hasattr(self.motor_chain, "wait_for_cycle")
+        cycle = 0
+        scheduler = DeadlineScheduler(UPDATE_PERIOD, name=f"{self} update")
+        scheduler.start()
         while not self._stop_event.is_set():  # Check the stop event
+            if phase_locked:
+                cycle = self.motor_chain.wait_for_cycle(cycle)
+            else:
+                scheduler.wait()
             current_time = time.time()
             elapsed_time = current_time - last_time
 
             self.update()
             if not self.motor_chain.running:
                 raise RuntimeError(f"{self}: motor_chain_robot's motor chain is not running, exiting the robot server")
-            time.sleep(0.004)
 
             iteration_count += 1
             if elapsed_time >= 10.0:
@@ -297,61 +330,74 @@ class MotorChainRobot(Robot):
 
         Send Torques and update the joint state.
         """
-        with self._command_lock:
-            joint_commands = copy.deepcopy(self._commands)
-        with self._state_lock:
-            g = self._compute_gravity_compensation(self._joint_state)
-            motor_torques = joint_commands.torques + g * self.gravity_comp_factor
-            motor_torques = np.clip(motor_torques, -self._clip_motor_torque, self._clip_motor_torque)
+        joint_commands = JointCommands(**self._command_snapshot.read())
+        g = self._compute_gravity_compensation(self._joint_state)
+        motor_torques = joint_commands.torques + g * self.gravity_comp_factor
+        motor_torques = np.clip(motor_torques, -self._clip_motor_torque, self._clip_motor_torque)
 
-            if self._gripper_index is not None:
-                if self._limit_gripper_force > 0 and self._joint_state is not None:
-                    # Get current gripper state in raw robot joint pos space
-                    gripper_state = {
-                        "target_qpos": joint_commands.pos[self._gripper_index],
-                        "current_qpos": self.remapper.to_robot_joint_pos_space(self._joint_state.pos)[
-                            self._gripper_index
-                        ],
-                        "current_qvel": self._joint_state.vel[self._gripper_index],
-                        "current_eff": self._joint_state.eff[self._gripper_index],
-                        "current_normalized_qpos": self._joint_state.pos[self._gripper_index],
-                        "target_normalized_qpos": self.remapper.to_command_joint_pos_space(joint_commands.pos)[
-                            self._gripper_index
-                        ],
-                        "last_command_qpos": self._last_gripper_command_qpos,
-                    }
-
-                    joint_commands.pos[self._gripper_index] = self._gripper_force_limiter.update(gripper_state)
-
-                # add final clip so the gripper won't be over-adjusted
-                joint_commands.pos[self._gripper_index] = np.clip(
-                    joint_commands.pos[self._gripper_index],
-                    min(self._gripper_limits),
-                    max(self._gripper_limits),
-                )
-                self._last_gripper_command_qpos = joint_commands.pos[self._gripper_index]
-            if not self.motor_chain.start_thread_flag:
-                self.motor_chain.set_commands(
-                    motor_torques,
-                    pos=joint_commands.pos,
-                    vel=joint_commands.vel,
-                    kp=joint_commands.kp,
-                    kd=joint_commands.kd,
-                )
-                self.motor_chain.start_thread()
-                self.motor_chain.start_thread_flag = True
-            # Send commands to motor chain and update joint state
-            motor_state = self.motor_chain.set_commands(
+        if self._gripper_index is not None:
+            if self._limit_gripper_force > 0 and self._joint_state is not None:
+                # Get current gripper state in raw robot joint pos space
+                gripper_state = {
+                    "target_qpos": joint_commands.pos[self._gripper_index],
+                    "current_qpos": self.remapper.to_robot_joint_pos_space(self._joint_state.pos)[
+                        self._gripper_index
+                    ],
+                    "current_qvel": self._joint_state.vel[self._gripper_index],
+                    "current_eff": self._joint_state.eff[self._gripper_index],
+                    "current_normalized_qpos": self._joint_state.pos[self._gripper_index],
+                    "target_normalized_qpos": self.remapper.to_command_joint_pos_space(joint_commands.pos)[
+                        self._gripper_index
+                    ],
+                    "last_command_qpos": self._last_gripper_command_qpos,
+                }
+
+                joint_commands.pos[self._gripper_index] = self._gripper_force_limiter.update(gripper_state)
+
+            # add final clip so the gripper won't be over-adjusted
+            joint_commands.pos[self._gripper_index] = np.clip(
+                joint_commands.pos[self._gripper_index],
+                min(self._gripper_limits),
+                max(self._gripper_limits),
+            )
+            self._last_gripper_command_qpos = joint_commands.pos[self._gripper_index]
+        if not self.motor_chain.start_thread_flag:
+            self.motor_chain.set_commands(
                 motor_torques,
                 pos=joint_commands.pos,
                 vel=joint_commands.vel,
                 kp=joint_commands.kp,
                 kd=joint_commands.kd,
             )
-            self._joint_state = self._motor_state_to_joint_state(motor_state)
-            # For SWE-454, check if the current qpos is in the joint limits
-            # When the arm is fully extened and got a power cycle, the initial qpos might still with the range, then we need to keep monitoring the qpos during the robot running.
-            self._check_current_qpos_in_joint_limits()
+            self.motor_chain.start_thread()
+            self.motor_chain.start_thread_flag = True
+        # Send commands to motor chain and update joint state
+        motor_state = self.motor_chain.set_commands(
+            motor_torques,
+            pos=joint_commands.pos,
+            vel=joint_commands.vel,
+            kp=joint_commands.kp,
+            kd=joint_commands.kd,
+        )
+        self._joint_state = self._motor_state_to_joint_state(motor_state)
+        self._publish_joint_state(self._joint_state)
+        # For SWE-454, check if the current qpos is in the joint limits
+        # When the arm is fully extened and got a power cycle, the initial qpos might still with the range, then we need to keep monitoring the qpos during the robot running.
+        self._check_current_qpos_in_joint_limits()
+
+    def _publish_joint_state(self, joint_state: JointStates) -> None:
+        self._state_snapshot.publish(
+            pos=joint_state.pos,
+            vel=joint_state.vel,
+            eff=joint_state.eff,
+            temp_mos=joint_state.temp_mos,
+            temp_rotor=joint_state.temp_rotor,
+        )
+
+    def _publish_commands(self, commands: JointCommands) -> None:
+        self._command_snapshot.publish(
+            torques=commands.torques, pos=commands.pos, vel=commands.vel, kp=commands.kp, kd=commands.kd
+        )
 
     def _motor_state_to_joint_state(self, motor_state: List[MotorInfo]) -> JointStates:
         """Convert motor state to joint state.
@@ -384,15 +430,14 @@ class MotorChainRobot(Robot):
             return np.zeros(len(self.motor_chain))
         elif self.use_gravity_comp:
             q = joint_state.pos[: self._gripper_index] if self._gripper_index is not None else joint_state.pos
-            t = self.kdl.compute_inverse_dynamics(q, np.zeros(q.shape), np.zeros(q.shape))
+            t = self.gravity_model(q)
             # print gravity torque to 2f
             if np.max(np.abs(t)) > 20.0:
                 print([f"{s:.2f}" for s in t])
                 raise RuntimeError(f"{self}: too large torques")
             if self._gripper_index is None:
-                return self.kdl.compute_inverse_dynamics(q, np.zeros(q.shape), np.zeros(q.shape))
+                return t
             else:
-                t = self.kdl.compute_inverse_dynamics(q, np.zeros(q.shape), np.zeros(q.shape))
                 return np.append(t, 0.0)
 
     # ----------------- Server Functions ----------------- #
@@ -411,8 +456,18 @@ class MotorChainRobot(Robot):
         Returns:
             T: The current state of the leader robot.
         """
-        with self._state_lock:
-            return self._joint_state.pos
+        return self._state_snapshot.read()["pos"]
+
+    def get_joint_state(self) -> JointStates:
+        """Get the joint state computed by the last update(), without copying it.
+
+        Only consistent when called from the thread running update() (see MultiArmBusManager), other threads
+        should use get_observations().
+
+        Returns:
+            JointStates: The joint state of the robot.
+        """
+        return self._joint_state
 
     def _clip_robot_joint_pos_command(self, pos: np.ndarray) -> np.ndarray:
         """Clip the robot joint pos command to the joint limits. Do not clip the gripper pos.
@@ -441,11 +496,12 @@ class MotorChainRobot(Robot):
         """
         print(joint_pos)
         pos = self._clip_robot_joint_pos_command(joint_pos)
+        commands = JointCommands.init_all_zero(len(self.motor_chain))
+        commands.pos = self.remapper.to_robot_joint_pos_space(pos)
+        commands.kp = self._kp
+        commands.kd = self._kd
         with self._command_lock:
-            self._commands = JointCommands.init_all_zero(len(self.motor_chain))
-            self._commands.pos = self.remapper.to_robot_joint_pos_space(pos)
-            self._commands.kp = self._kp
-            self._commands.kd = self._kd
+            self._publish_commands(commands)
 
     def command_joint_state(self, joint_state: Dict[str, np.ndarray]) -> None:
         """Command the leader robot to a given state.
@@ -455,19 +511,18 @@ class MotorChainRobot(Robot):
         """
         pos = self._clip_robot_joint_pos_command(joint_state["pos"])
         vel = joint_state["vel"]
-        self._commands = JointCommands.init_all_zero(len(self.motor_chain))
-        kp = joint_state.get("kp", self._kp)
-        kd = joint_state.get("kd", self._kd)
+        commands = JointCommands.init_all_zero(len(self.motor_chain))
+        commands.pos = self.remapper.to_robot_joint_pos_space(pos)
+        commands.vel = self.remapper.to_robot_joint_vel_space(vel)
+        commands.kp = joint_state.get("kp", self._kp)
+        commands.kd = joint_state.get("kd", self._kd)
         with self._command_lock:
-            self._commands.pos = self.remapper.to_robot_joint_pos_space(pos)
-            self._commands.vel = self.remapper.to_robot_joint_vel_space(vel)
-            self._commands.kp = kp
-            self._commands.kd = kd
+            self._publish_commands(commands)
 
     def zero_torque_mode(self) -> None:
         logging.info(f"Entering zero_torque_mode for {self}")
         with self._command_lock:
-            self._commands = JointCommands.init_all_zero(len(self.motor_chain))
+            self._publish_commands(JointCommands.init_all_zero(len(self.motor_chain)))
             self._kp = np.zeros(len(self.motor_chain))
             self._kd = np.zeros(len(self.motor_chain))
 
@@ -481,24 +536,24 @@ class MotorChainRobot(Robot):
         Returns:
             Dict[str, np.ndarray]: A dictionary of observations.
         """
-        with self._state_lock:
-            if self._gripper_index is None:
-                result = {
-                    "joint_pos": self._joint_state.pos,
-                    "joint_vel": self._joint_state.vel,
-                    "joint_eff": self._joint_state.eff,
-                }
-            else:
-                result = {
-                    "joint_pos": self._joint_state.pos[: self._gripper_index],
-                    "gripper_pos": np.array([self._joint_state.pos[self._gripper_index]]),
-                    "joint_vel": self._joint_state.vel,
-                    "joint_eff": self._joint_state.eff,
-                }
-            if self.temp_record_flag:
-                result["temp_mos"] = self._joint_state.temp_mos
-                result["temp_rotor"] = self._joint_state.temp_rotor
-            return result
+        joint_state = self._state_snapshot.read()
+        if self._gripper_index is None:
+            result = {
+                "joint_pos": joint_state["pos"],
+                "joint_vel": joint_state["vel"],
+                "joint_eff": joint_state["eff"],
+            }
+        else:
+            result = {
+                "joint_pos": joint_state["pos"][: self._gripper_index],
+                "gripper_pos": joint_state["pos"][self._gripper_index : self._gripper_index + 1],
+                "joint_vel": joint_state["vel"],
+                "joint_eff": joint_state["eff"],
+            }
+        if self.temp_record_flag:
+            result["temp_mos"] = joint_state["temp_mos"]
+            result["temp_rotor"] = joint_state["temp_rotor"]
+        return result
 
     def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
         """Exit the runtime context related to this object."""
@@ -506,8 +561,7 @@ class MotorChainRobot(Robot):
 
     def move_joints(self, target_joint_positions: np.ndarray, time_interval_s: float = 2.0) -> None:
         """Move the robot to a given joint positions."""
-        with self._state_lock:
-            current_pos = self._joint_state.pos
+        current_pos = self._state_snapshot.read()["pos"]
         assert len(current_pos) == len(target_joint_positions)
         steps = 50  # 50 steps over time_interval_s
         for i in range(steps + 1):
@@ -516,11 +570,19 @@ class MotorChainRobot(Robot):
             self.command_joint_pos(target_pos)
             time.sleep(time_interval_s / steps)
 
+    def stop_server(self) -> None:
+        """Stop the server thread, update() must then be called by the owner of the robot (see MultiArmBusManager)."""
+        self._stop_event.set()
+        if self._server_thread is not None:
+            self._server_thread.join()
+            self._server_thread = None
+
     def close(self) -> None:
         """Safely close the robot by setting all torques to zero."""
         # self.move_to_zero()
         self._stop_event.set()  # Signal the thread to stop
-        self._server_thread.join()  # Wait for the thread to finish
+        if self._server_thread is not None:
+            self._server_thread.join()  # Wait for the thread to finish
         self.motor_chain.close()
         print("Robot closed with all torques set to zero.")
 
@@ -0,0 +1,135 @@
+import time
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import can
+import numpy as np
+import pytest
+
+from i2rt.motor_drivers.dm_driver import DMChainCanInterface
+from i2rt.motor_drivers.fake_dm_motors import FakeDMMotors
+from i2rt.motor_drivers.utils import MotorErrorCode
+from i2rt.robots.bus_manager import MultiArmBusManager
+from i2rt.robots.motor_chain_robot import MotorChainRobot
+
+MOTOR_IDS = [1, 2, 3]
+
+MakeArm = Callable[..., Tuple[MotorChainRobot, FakeDMMotors]]
+
+
+class FakeSameBusDevice:
+    """Passive same bus device (like the teaching handle encoder) counting how many times it is read."""
+
+    def __init__(self) -> None:
+        self.num_reads = 0
+
+    def read_states(self) -> int:
+        self.num_reads += 1
+        return self.num_reads
+
+
+@pytest.fixture(autouse=True)
+def virtual_can(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Open all the CAN buses on the python-can virtual interface, whatever their bustype."""
+    bus = can.interface.Bus
+    monkeypatch.setattr(
+        can.interface, "Bus", lambda channel, bustype=None, bitrate=None: bus(bustype="virtual", channel=channel)
+    )
+
+
+@pytest.fixture
+def make_arm() -> Iterator[MakeArm]:
+    robots: List[MotorChainRobot] = []
+    motors: List[FakeDMMotors] = []
+
+    def make(channel: str, positions: Dict[int, float], **chain_kwargs: Any) -> Tuple[MotorChainRobot, FakeDMMotors]:
+        motors.append(FakeDMMotors("virtual", channel, MOTOR_IDS, latency=100e-6, positions=positions))
+        chain = DMChainCanInterface(
+            [(motor_id, "DM4310") for motor_id in MOTOR_IDS],
+            motor_offset=np.zeros(len(MOTOR_IDS)),
+            motor_direction=np.ones(len(MOTOR_IDS)),
+            channel=channel,
+            use_background_receiver=True,
+            **chain_kwargs,
+        )
+        robots.append(MotorChainRobot(chain, joint_limits=np.array([[-1.0, 1.0]] * len(MOTOR_IDS))))
+        return robots[-1], motors[-1]
+
+    yield make
+    for robot in robots:
+        robot.close()
+        robot.motor_chain.motor_interface.close()
+    for motor in motors:
+        motor.close()
+
+
+def wait_for_cycles(manager: MultiArmBusManager, num_cycles: int) -> None:
+    cycle = manager.wait_for_cycle(0)
+    target = cycle + num_cycles
+    while cycle < target:
+        cycle = manager.wait_for_cycle(cycle, timeout=1.0)
+
+
+def test_manager_takes_over_the_arms(make_arm: MakeArm) -> None:
+    left, left_motors = make_arm("test_left", {1: 0.1, 2: 0.2, 3: 0.3})
+    right, _ = make_arm("test_right", {1: -0.1, 2: -0.2, 3: -0.3})
+    manager = MultiArmBusManager({"left": left, "right": right})
+    manager.start()
+    try:
+        for robot in [left, right]:
+            assert robot._server_thread is None
+            assert robot.motor_chain._control_thread is None
+            assert robot.motor_chain.running
+
+        wait_for_cycles(manager, 3)
+        state = manager.read_state()
+        np.testing.assert_allclose(state["left"]["pos"], [0.1, 0.2, 0.3], atol=1e-3)
+        np.testing.assert_allclose(state["right"]["pos"], [-0.1, -0.2, -0.3], atol=1e-3)
+
+        # the snapshot follows the motors, with one timestamp for all the arms
+        left_motors.positions = {1: 0.4, 2: 0.5, 3: 0.6}
+        wait_for_cycles(manager, 3)
+        new_state = manager.read_state()
+        assert new_state["timestamp"] > state["timestamp"]
+        np.testing.assert_allclose(new_state["left"]["pos"], [0.4, 0.5, 0.6], atol=1e-3)
+        np.testing.assert_allclose(new_state["right"]["pos"], [-0.1, -0.2, -0.3], atol=1e-3)
+        np.testing.assert_array_equal(new_state["left"]["pos"], left.get_joint_state().pos)
+    finally:
+        manager.close()
+
+
+def test_same_bus_device_is_polled_after_hand_over(make_arm: MakeArm) -> None:
+    device = FakeSameBusDevice()
+    robot, _ = make_arm("test_handle", {}, get_same_bus_device_driver=lambda interface: device)
+    manager = MultiArmBusManager({"arm": robot})
+    manager.start()
+    try:
+        wait_for_cycles(manager, 3)
+        num_reads = device.num_reads
+        time.sleep(0.1)
+        assert device.num_reads > num_reads
+        assert robot.motor_chain.get_same_bus_device_states() >= num_reads
+    finally:
+        manager.close()
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_motor_error_stops_all_the_arms(make_arm: MakeArm) -> None:
+    left, left_motors = make_arm("test_left", {})
+    right, _ = make_arm("test_right", {})
+    manager = MultiArmBusManager({"left": left, "right": right})
+    manager.start()
+    try:
+        wait_for_cycles(manager, 3)
+        left_motors.error_code = MotorErrorCode.overload
+        deadline = time.perf_counter() + 2.0
+        while manager.running and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        assert not manager.running
+        assert not left.motor_chain.running
+        assert not right.motor_chain.running
+        # waiters are released instead of waiting for their timeout
+        start = time.perf_counter()
+        manager.wait_for_cycle(manager.cycle_count, timeout=1.0)
+        assert time.perf_counter() - start < 0.5
+    finally:
+        manager.close()
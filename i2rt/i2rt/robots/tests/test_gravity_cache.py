@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from i2rt.robots.utils import YAM_XML_PATH
+from i2rt.utils.gravity_cache import TaylorGravityCache
+from i2rt.utils.mujoco_utils import MuJoCoKDL
+
+Q0 = np.array([0.3, 1.2, 1.0, 0.2, -0.3, 0.5])
+
+
+@pytest.fixture(scope="module")
+def kdl_yam() -> MuJoCoKDL:
+    return MuJoCoKDL(YAM_XML_PATH)
+
+
+def anchor_with_jacobian(cache: TaylorGravityCache, q: np.ndarray) -> None:
+    # a miss anchors the expansion at q, the next hit computes the Jacobian there
+    cache(q)
+    cache(q)
+    assert cache._jacobian is not None
+
+
+def test_zero_radius_is_exact(kdl_yam: MuJoCoKDL) -> None:
+    cache = TaylorGravityCache(kdl_yam, radius=0.0)
+    for q in [Q0, Q0 + 0.001, Q0]:
+        np.testing.assert_array_equal(cache(q), cache.exact(q))
+    assert cache.stats()["num_calls"] == 0
+    assert cache.num_jacobian_updates == 0
+
+
+def test_hits_within_the_trust_region(kdl_yam: MuJoCoKDL) -> None:
+    cache = TaylorGravityCache(kdl_yam, radius=0.02, torque_tolerance=0.02)
+    np.testing.assert_array_equal(cache(Q0), cache.exact(Q0))
+    assert (cache.num_hits, cache.num_misses, cache.num_jacobian_updates) == (0, 1, 0)
+
+    # back near the anchor: the Jacobian is computed once, then reused
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        q = Q0 + rng.uniform(-0.005, 0.005, size=len(Q0))
+        np.testing.assert_allclose(cache(q), cache.exact(q), atol=0.02)
+    assert (cache.num_hits, cache.num_misses, cache.num_jacobian_updates) == (20, 1, 1)
+
+
+def test_fast_moves_are_exact_and_skip_the_jacobian(kdl_yam: MuJoCoKDL) -> None:
+    cache = TaylorGravityCache(kdl_yam, radius=0.02)
+    anchor_with_jacobian(cache, Q0)
+    # each call is further than twice the radius from the previous anchor
+    for step in range(1, 6):
+        q = Q0 + 0.1 * step
+        np.testing.assert_array_equal(cache(q), cache.exact(q))
+        assert cache._jacobian is None
+        np.testing.assert_array_equal(cache._anchor_q, q)
+    assert cache.num_misses == 6
+    assert cache.num_jacobian_updates == 1
+
+
+def test_radius_shrinks_when_the_error_exceeds_the_tolerance(kdl_yam: MuJoCoKDL) -> None:
+    cache = TaylorGravityCache(kdl_yam, radius=0.1, torque_tolerance=1e-9, min_radius=0.02)
+    expected_radius = 0.1
+    q = Q0.copy()
+    for _ in range(4):
+        anchor_with_jacobian(cache, q)
+        # just outside of the trust region, where the error of the approximation is measured
+        q = q + 1.5 * cache.radius
+        np.testing.assert_array_equal(cache(q), cache.exact(q))
+        expected_radius = max(expected_radius / 2, 0.02)
+        assert cache.radius == pytest.approx(expected_radius)
+        assert cache._jacobian is None
+    assert cache.radius == pytest.approx(0.02)
+    assert cache.max_measured_error > 1e-9
+
+
+def test_radius_grows_back_when_the_error_is_small(kdl_yam: MuJoCoKDL) -> None:
+    cache = TaylorGravityCache(kdl_yam, radius=0.04, torque_tolerance=100.0)
+    cache.radius = 0.01
+    anchor_with_jacobian(cache, Q0)
+    cache(Q0 + 0.015)
+    assert cache.radius == pytest.approx(0.0125)
+    # the Jacobian is kept for the next anchor
+    assert cache._jacobian is not None
+    for _ in range(10):
+        cache(cache._anchor_q + 1.5 * cache.radius)
+    assert cache.radius == pytest.approx(0.04)
+    assert cache.num_jacobian_updates == 1
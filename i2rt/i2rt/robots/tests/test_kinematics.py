@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from i2rt.robots.kinematics import Kinematics
+from i2rt.robots.kinematics import Kinematics, summarize_ik_results
 from i2rt.robots.utils import YAM_XML_PATH
 
 
@@ -42,3 +42,26 @@ def test_cycle(kinematics_yam: Kinematics) -> None:
         assert success, f"IK failed for target pose {pose}, init_q: {q_init_for_ik}"
         pose_reconstructed = kinematics_yam.fk(q_ik)
         np.testing.assert_allclose(pose, pose_reconstructed, atol=1e-4)
+
+
+def test_ik_trajectory(kinematics_yam: Kinematics) -> None:
+    t = np.linspace(0, 1, 50)[:, None]
+    qs = 0.5 + 0.3 * np.sin(2 * np.pi * t + np.arange(6))
+    poses = np.stack([kinematics_yam.fk(q) for q in qs])
+    results = kinematics_yam.ik_trajectory(poses, "grasp_site", init_q=qs[0])
+    stats = summarize_ik_results(results)
+    assert stats["success_rate"] == 1.0, f"IK should track the trajectory, stats: {stats}"
+    for pose, result in zip(poses, results, strict=True):
+        np.testing.assert_allclose(pose, kinematics_yam.fk(result.q), atol=1e-4)
+    # the solve of a pose already reached takes no iteration
+    assert kinematics_yam.solve_ik(poses[-1], "grasp_site").num_iters == 0
+
+
+def test_ik_starts_from_fk(kinematics_yam: Kinematics) -> None:
+    q = np.full(6, 0.5)
+    pose = kinematics_yam.fk(q)
+    kinematics_yam.ik(kinematics_yam.fk(np.zeros(6)), "grasp_site", init_q=np.zeros(6))
+    # without init_q, the solve starts from the configuration set by fk
+    kinematics_yam.fk(q)
+    result = kinematics_yam.solve_ik(pose, "grasp_site")
+    assert result.success and result.num_iters == 0
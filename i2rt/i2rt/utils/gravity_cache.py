@@ -0,0 +1,116 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from i2rt.utils.mujoco_utils import MuJoCoKDL
+
+
+class TaylorGravityCache:
+    """Gravity compensation torques of a MuJoCoKDL model, served from a first-order Taylor expansion.
+
+    The exact torques g(q0) and their joint-space Jacobian dg/dq(q0) are computed at an anchor configuration q0,
+    and g(q) is approximated by g(q0) + dg/dq(q0) (q - q0) while q stays within `radius` (rad, per joint) of q0.
+    Outside of it, the exact torques are computed and q becomes the new anchor. Gravity torques are smooth in q, so
+    the error of the approximation grows with the square of the distance to the anchor.
+
+    The Jacobian is computed by finite differences (one inverse dynamics per joint), only when q is back within the
+    trust region of an anchor: while the joints move fast, each call costs a single exact inverse dynamics, as
+    without cache. The error is measured when q leaves the trust region by less than its radius, as the difference
+    between the approximation and the exact torques. When it exceeds `torque_tolerance` (Nm), the radius is halved,
+    down to `min_radius`, and the Jacobian is recomputed at the next anchor. Otherwise the Jacobian is kept, and the
+    radius grows back towards its initial value when the error is well below the tolerance.
+
+    Usage:
+        gravity = TaylorGravityCache(MuJoCoKDL(xml_path), radius=0.02)
+        torques = gravity(q)
+    """
+
+    def __init__(
+        self,
+        kdl: MuJoCoKDL,
+        radius: float = 0.02,
+        torque_tolerance: float = 0.02,
+        min_radius: float = 0.002,
+        fd_eps: float = 1e-4,
+    ):
+        """
+        :param kdl: The model to compute the exact torques with.
+        :param radius: Max distance (rad, per joint) to the anchor for which the approximation is used. With 0, the
+            torques are always computed exactly.
+        :param torque_tolerance: Max error (Nm, per joint) allowed at the edge of the trust region.
+        :param min_radius: The radius is never shrunk below this value.
+        :param fd_eps: Step (rad) of the finite differences of the Jacobian.
+        """
+        self.kdl = kdl
+        self.radius = radius
+        self.max_radius = radius
+        self.torque_tolerance = torque_tolerance
+        self.min_radius = min_radius
+        self.fd_eps = fd_eps
+        self._anchor_q: Optional[np.ndarray] = None
+        self._anchor_torques: Optional[np.ndarray] = None
+        self._jacobian: Optional[np.ndarray] = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.num_hits = 0
+        self.num_misses = 0
+        self.num_jacobian_updates = 0
+        self.max_measured_error = 0.0
+
+    def exact(self, q: np.ndarray) -> np.ndarray:
+        """Exact gravity compensation torques at q."""
+        zeros = np.zeros(q.shape)
+        return self.kdl.compute_inverse_dynamics(q, zeros, zeros).copy()
+
+    def _update_jacobian(self, q: np.ndarray, torques: np.ndarray) -> None:
+        jacobian = np.zeros((len(torques), len(q)))
+        for idx in range(len(q)):
+            q_step = q.copy()
+            q_step[idx] += self.fd_eps
+            jacobian[:, idx] = (self.exact(q_step) - torques) / self.fd_eps
+        self._jacobian = jacobian
+        self.num_jacobian_updates += 1
+
+    def __call__(self, q: np.ndarray) -> np.ndarray:
+        """Gravity compensation torques at q, within `torque_tolerance` of the exact ones."""
+        q = np.asarray(q, dtype=np.float64)
+        if self.max_radius <= 0:
+            return self.exact(q)
+        if self._anchor_q is not None:
+            delta = q - self._anchor_q
+            distance = np.max(np.abs(delta))
+            if distance <= self.radius:
+                self.num_hits += 1
+                if self._jacobian is None:
+                    # the joints slowed down near an anchor: expand around it from now on
+                    self._update_jacobian(self._anchor_q, self._anchor_torques)
+                return self._anchor_torques + self._jacobian @ delta
+
+        self.num_misses += 1
+        torques = self.exact(q)
+        if self._anchor_q is not None and self._jacobian is not None and distance <= 2 * self.radius:
+            # q just left the trust region, check the approximation there
+            error = float(np.max(np.abs(self._anchor_torques + self._jacobian @ delta - torques)))
+            self.max_measured_error = max(self.max_measured_error, error)
+            if error > self.torque_tolerance:
+                self.radius = max(self.radius / 2, self.min_radius)
+                self._jacobian = None
+            elif error < self.torque_tolerance / 4:
+                self.radius = min(self.radius * 1.25, self.max_radius)
+        else:
+            # the joints are moving fast, the Jacobian is only computed once they slow down
+            self._jacobian = None
+        self._anchor_q = q.copy()
+        self._anchor_torques = torques
+        return torques.copy()
+
+    def stats(self) -> Dict[str, Any]:
+        num_calls = self.num_hits + self.num_misses
+        return {
+            "num_calls": num_calls,
+            "hit_rate": self.num_hits / max(num_calls, 1),
+            "num_jacobian_updates": self.num_jacobian_updates,
+            "max_measured_error": self.max_measured_error,
+            "radius": self.radius,
+        }
@@ -0,0 +1,138 @@
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Upper edges of the wake-up lateness histogram, in microseconds
+JITTER_BINS_US = np.array([50, 100, 250, 500, 1000, 2000, 4000, np.inf])
+
+
+def configure_current_thread(realtime_priority: Optional[int] = None, cpu_affinity: Optional[List[int]] = None) -> None:
+    """Optionally run the calling thread with the SCHED_FIFO policy and/or pin it to some CPUs (Linux only).
+
+    Both need privileges (e.g. CAP_SYS_NICE or an rtprio limit for SCHED_FIFO): failures are logged and ignored.
+    """
+    if cpu_affinity is not None:
+        try:
+            os.sched_setaffinity(0, cpu_affinity)
+        except (AttributeError, OSError) as e:
+            logging.warning(f"Failed to pin thread to CPUs {cpu_affinity}: {e}")
+    if realtime_priority is not None:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(realtime_priority))
+        except (AttributeError, OSError) as e:
+            logging.warning(f"Failed to set SCHED_FIFO priority {realtime_priority}: {e}")
+
+
+class DeadlineScheduler:
+    """Paces a loop on absolute deadlines of the monotonic clock: t0 + k * period.
+
+    Unlike sleeping for a fixed duration after each step, the wake-up times do not drift with the duration of the
+    steps. When a step overruns its period, the missed deadlines are skipped and counted, and the loop stays
+    phase-locked on the original grid. The lateness of each wake-up is accumulated in a histogram, reported every
+    `report_interval` seconds.
+
+    Usage:
+        scheduler = DeadlineScheduler(period=0.004, name="control")
+        scheduler.start()
+        while running:
+            scheduler.wait()
+            step()
+    """
+
+    def __init__(
+        self,
+        period: float,
+        name: Optional[str] = None,
+        spin_s: float = 0.0,
+        report_interval: float = 30.0,
+        realtime_priority: Optional[int] = None,
+        cpu_affinity: Optional[List[int]] = None,
+    ):
+        """
+        :param period: Period of the loop in seconds.
+        :param spin_s: The last `spin_s` seconds before a deadline are busy-waited, to absorb the sleep latency.
+            The spin yields the GIL at each check, but still burns a core: only use it for a loop pinned to its own
+            CPU (see `cpu_affinity`). Disabled by default.
+        :param report_interval: Interval in seconds at which the stats are logged, if there were overruns.
+        :param realtime_priority: SCHED_FIFO priority of the loop thread (1-99), if given.
+        :param cpu_affinity: CPUs the loop thread is pinned to, if given.
+        """
+        self.period = period
+        self.name = name
+        self.spin_s = spin_s
+        self.report_interval = report_interval
+        self.realtime_priority = realtime_priority
+        self.cpu_affinity = cpu_affinity
+        self.start_time = None
+        self.cycle = 0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.num_cycles = 0
+        self.num_overruns = 0
+        self.num_skipped_cycles = 0
+        self.max_lateness = 0.0
+        self.lateness_sum = 0.0
+        self.jitter_histogram = np.zeros(len(JITTER_BINS_US), dtype=np.int64)
+        self._last_report_time = time.monotonic()
+
+    def start(self, start_time: Optional[float] = None) -> None:
+        """Configures the calling thread and sets the time of the first deadline (now by default)."""
+        configure_current_thread(self.realtime_priority, self.cpu_affinity)
+        self.start_time = time.monotonic() if start_time is None else start_time
+        self.cycle = 0
+        self.reset_stats()
+
+    @property
+    def next_deadline(self) -> float:
+        return self.start_time + self.cycle * self.period
+
+    def wait(self) -> float:
+        """Blocks until the next deadline and returns the lateness of the wake-up in seconds."""
+        if self.start_time is None:
+            self.start()
+        deadline = self.next_deadline
+        now = time.monotonic()
+        if now > deadline + self.period:
+            # The previous step overran: skip the missed deadlines and wait for the next one on the grid
+            missed = int((now - deadline) // self.period)
+            self.num_overruns += 1
+            self.num_skipped_cycles += missed
+            self.cycle += missed
+            deadline = self.next_deadline
+        if deadline - now > self.spin_s:
+            time.sleep(deadline - now - self.spin_s)
+        while time.monotonic() < deadline:
+            time.sleep(0)  # let the other threads of the process run
+        lateness = time.monotonic() - deadline
+        self.cycle += 1
+        self._record(lateness)
+        return lateness
+
+    def _record(self, lateness: float) -> None:
+        self.num_cycles += 1
+        self.lateness_sum += lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+        self.jitter_histogram[np.searchsorted(JITTER_BINS_US, lateness * 1e6)] += 1
+        now = time.monotonic()
+        if now - self._last_report_time >= self.report_interval:
+            if self.num_overruns > 0:
+                logging.info(f"[{self.name} {self.report_interval}s Report] {self.stats()}")
+            self.reset_stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Overrun counts and wake-up lateness histogram since the last report."""
+        return {
+            "period_s": self.period,
+            "num_cycles": self.num_cycles,
+            "num_overruns": self.num_overruns,
+            "num_skipped_cycles": self.num_skipped_cycles,
+            "mean_lateness_us": self.lateness_sum / max(self.num_cycles, 1) * 1e6,
+            "max_lateness_us": self.max_lateness * 1e6,
+            "lateness_histogram_us": {
+                f"<{edge:g}": int(count) for edge, count in zip(JITTER_BINS_US, self.jitter_histogram, strict=True)
+            },
+        }
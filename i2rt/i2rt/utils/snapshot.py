@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+
+class ArraySnapshot:
+    """Publishes a set of fixed-shape numpy arrays from one writer thread to any number of readers, without locks.
+
+    The arrays are double-buffered: the writer fills the back buffer while readers copy the front one, then
+    publishes it by bumping a sequence counter. A reader retries its copy if a new snapshot was published in the
+    meantime (seqlock), so it always gets a consistent set of arrays and never blocks the writer. Concurrent
+    writers must be serialized by the caller.
+
+    Usage:
+        snapshot = ArraySnapshot({"pos": (7,), "vel": (7,)})
+        with snapshot.write() as state:  # writer
+            state["pos"][:] = pos
+            state["vel"][:] = vel
+        state = snapshot.read()  # reader, a copy
+    """
+
+    def __init__(self, fields: Dict[str, Tuple[int, ...]], dtype: np.dtype = np.float64):
+        self._buffers = [{name: np.zeros(shape, dtype=dtype) for name, shape in fields.items()} for _ in range(2)]
+        self._sequence = 0
+
+    @property
+    def sequence(self) -> int:
+        """Number of snapshots published so far."""
+        return self._sequence
+
+    @contextmanager
+    def write(self) -> Iterator[Dict[str, np.ndarray]]:
+        """Yields the back buffer, which is published when the context exits without error. The back buffer holds
+        the snapshot before last, fields which are not updated must be written anyway."""
+        yield self._buffers[(self._sequence + 1) % 2]
+        self._sequence += 1
+
+    def publish(self, **arrays: np.ndarray) -> None:
+        """Copies all the fields into the back buffer and publishes it."""
+        with self.write() as buffer:
+            for name, target in buffer.items():
+                np.copyto(target, arrays[name])
+
+    def read(self) -> Dict[str, np.ndarray]:
+        """Returns a consistent copy of the latest snapshot."""
+        while True:
+            sequence = self._sequence
+            front = self._buffers[sequence % 2]
+            snapshot = {name: array.copy() for name, array in front.items()}
+            if self._sequence == sequence:
+                return snapshot
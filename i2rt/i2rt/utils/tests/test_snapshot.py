@@ -0,0 +1,73 @@
+import sys
+import threading
+from typing import Iterator
+
+import numpy as np
+import pytest
+
+from i2rt.utils.snapshot import ArraySnapshot
+
+FIELDS = {"pos": (50_000,), "vel": (50_000,), "eff": (7, 1000)}
+
+
+@pytest.fixture
+def fast_thread_switches() -> Iterator[None]:
+    # switch threads as often as possible, so that the reads overlap the writes
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(switch_interval)
+
+
+def test_publish_and_read() -> None:
+    snapshot = ArraySnapshot({"pos": (3,), "vel": (3,)})
+    assert snapshot.sequence == 0
+    snapshot.publish(pos=np.array([1.0, 2.0, 3.0]), vel=np.zeros(3))
+    state = snapshot.read()
+    assert snapshot.sequence == 1
+    np.testing.assert_array_equal(state["pos"], [1.0, 2.0, 3.0])
+
+    # the reader gets a copy
+    state["pos"][:] = 0.0
+    np.testing.assert_array_equal(snapshot.read()["pos"], [1.0, 2.0, 3.0])
+
+
+def test_failed_write_is_not_published() -> None:
+    snapshot = ArraySnapshot({"pos": (3,)})
+    snapshot.publish(pos=np.ones(3))
+    with pytest.raises(ValueError), snapshot.write() as state:
+        state["pos"][:] = 2.0
+        raise ValueError
+    assert snapshot.sequence == 1
+    np.testing.assert_array_equal(snapshot.read()["pos"], np.ones(3))
+
+
+def test_concurrent_reads_are_never_torn(fast_thread_switches: None) -> None:
+    # every field of the snapshot published by the i-th write is filled with i, a torn read mixes values
+    snapshot = ArraySnapshot(FIELDS)
+    done = threading.Event()
+    num_writes = 2000
+
+    def writer() -> None:
+        for i in range(1, num_writes + 1):
+            with snapshot.write() as state:
+                for array in state.values():
+                    array.fill(i)
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    seen = []
+    try:
+        while not done.is_set():
+            state = snapshot.read()
+            value = state["pos"][0]
+            for name, array in state.items():
+                assert np.all(array == value), f"torn read of {name} after value {value}"
+            seen.append(value)
+    finally:
+        thread.join()
+
+    assert seen == sorted(seen), "snapshots must be read in publication order"
+    assert len(set(seen)) > 1, "the reads did not overlap the writes"
+    assert np.all(snapshot.read()["eff"] == num_writes)
@@ -0,0 +1,74 @@
+"""Benchmark one control tick of a DM motor chain, with per-motor request/response vs batched I/O.
+
+The motors are emulated by a responder thread on a second handle of the same bus, which answers every MIT frame
+with a feedback frame after a fixed processing latency. Motors process their frames concurrently, like on a
+real chain. Runs on the python-can `virtual` interface by default, or on a SocketCAN `vcan` interface:
+
+    sudo ip link add dev vcan0 type vcan && sudo ip link set up vcan0
+    python scripts/benchmark_can_chain.py --bustype socketcan --channel vcan0
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from i2rt.motor_drivers.dm_driver import ControlMode, DMSingleMotorCanInterface, ReceiveMode
+from i2rt.motor_drivers.fake_dm_motors import FakeDMMotors
+
+
+def benchmark(
+    interface: DMSingleMotorCanInterface, motor_list: List[List], batched: bool, num_ticks: int
+) -> np.ndarray:
+    motor_ids = [motor_id for motor_id, _ in motor_list]
+    motor_types = [motor_type for _, motor_type in motor_list]
+    zeros = np.zeros(len(motor_list))
+    tick_times = []
+    for _ in range(num_ticks):
+        start = time.perf_counter()
+        if batched:
+            interface.set_controls(motor_ids, motor_types, zeros, zeros, zeros, zeros, zeros)
+        else:
+            for motor_id, motor_type in motor_list:
+                interface.set_control(motor_id, motor_type, 0.0, 0.0, 0.0, 0.0, 0.0)
+        tick_times.append(time.perf_counter() - start)
+    return np.array(tick_times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bustype", type=str, default="virtual")
+    parser.add_argument("--channel", type=str, default="benchmark_can_chain")
+    parser.add_argument("--num_motors", type=int, default=7)
+    parser.add_argument("--num_ticks", type=int, default=500)
+    parser.add_argument("--latency_us", type=float, default=200.0, help="Processing latency of each fake motor.")
+    parser.add_argument("--background_receiver", action="store_true", help="Demultiplex replies in the background.")
+    args = parser.parse_args()
+
+    motor_list = [[motor_id, "DM4310"] for motor_id in range(1, args.num_motors + 1)]
+    motors = FakeDMMotors(args.bustype, args.channel, [m[0] for m in motor_list], args.latency_us * 1e-6)
+    interface = DMSingleMotorCanInterface(
+        control_mode=ControlMode.MIT,
+        channel=args.channel,
+        bustype=args.bustype,
+        receive_mode=ReceiveMode.p16,
+        name="benchmark",
+        use_background_receiver=args.background_receiver,
+    )
+    try:
+        for batched in [False, True]:
+            benchmark(interface, motor_list, batched, num_ticks=10)  # warmup
+            tick_times = benchmark(interface, motor_list, batched, args.num_ticks) * 1e3
+            mode = "batched" if batched else "per-motor"
+            print(
+                f"{mode:>10}: {args.num_motors} motors, tick mean {tick_times.mean():.3f} ms, "
+                f"p50 {np.percentile(tick_times, 50):.3f} ms, p99 {np.percentile(tick_times, 99):.3f} ms"
+            )
+    finally:
+        interface.close()
+        motors.close()
+
+
+if __name__ == "__main__":
+    main()
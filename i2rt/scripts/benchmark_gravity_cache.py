@@ -0,0 +1,85 @@
+"""Benchmark the gravity compensation torques of TaylorGravityCache against the exact MuJoCo inverse dynamics.
+
+The joints follow a synthetic teleoperation-like trajectory at the control rate: slow sinusoidal motions within
+the joint ranges, with holds and a few fast moves. Reports the torque error and the CPU time per update of the
+cache, for the YAM and ARX R5 models:
+
+    python scripts/benchmark_gravity_cache.py --radius 0.02 --tolerance 0.02
+"""
+
+import argparse
+import os
+import time
+from typing import Callable
+
+import numpy as np
+
+from i2rt.robots.utils import I2RT_ROOT, YAM_XML_PATH
+from i2rt.utils.gravity_cache import TaylorGravityCache
+from i2rt.utils.mujoco_utils import MuJoCoKDL
+
+MODELS = {
+    "yam": YAM_XML_PATH,
+    "arx_r5": os.path.join(I2RT_ROOT, "robot_models/arx_r5/arx.xml"),
+}
+
+
+def make_trajectory(joint_ranges: np.ndarray, duration: float, rate: float, seed: int = 0) -> np.ndarray:
+    """Joint positions sampled at `rate` Hz: random sinusoids, gated so that the arm holds still half of the time."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(0.0, duration, 1.0 / rate)[:, None]
+    low, high = joint_ranges[:, 0], joint_ranges[:, 1]
+    center = (low + high) / 2
+    amplitude = (high - low) / 4
+    q = center.copy()
+    for _ in range(3):
+        frequency = rng.uniform(0.05, 0.5, size=len(center))
+        phase = rng.uniform(0.0, 2 * np.pi, size=len(center))
+        q = q + amplitude / 3 * np.sin(2 * np.pi * frequency * t + phase)
+    # holds: freeze the trajectory on alternate 2 s windows, with a little sensor noise
+    hold = (t[:, 0] // 2.0) % 2 == 1
+    for idx in np.flatnonzero(hold):
+        q[idx] = q[idx - 1]
+    q += rng.normal(0.0, 1e-4, size=q.shape)
+    return np.clip(q, low, high)
+
+
+def time_calls(fn: Callable[[np.ndarray], np.ndarray], trajectory: np.ndarray) -> tuple:
+    torques = np.zeros_like(trajectory)
+    start = time.perf_counter()
+    for idx, q in enumerate(trajectory):
+        torques[idx] = fn(q)
+    return torques, (time.perf_counter() - start) / len(trajectory)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--radius", type=float, default=0.02, help="Trust region radius of the cache (rad).")
+    parser.add_argument("--tolerance", type=float, default=0.02, help="Torque tolerance of the cache (Nm).")
+    parser.add_argument("--duration", type=float, default=60.0, help="Duration of the trajectory (s).")
+    parser.add_argument("--rate", type=float, default=250.0, help="Update rate (Hz).")
+    args = parser.parse_args()
+
+    for name, xml_path in MODELS.items():
+        kdl = MuJoCoKDL(xml_path)
+        num_joints = kdl.model.njnt
+        trajectory = make_trajectory(kdl.joint_limits[:num_joints], args.duration, args.rate)
+
+        exact_model = TaylorGravityCache(kdl, radius=0.0)
+        exact, exact_time = time_calls(exact_model, trajectory)
+        cache = TaylorGravityCache(kdl, radius=args.radius, torque_tolerance=args.tolerance)
+        cached, cached_time = time_calls(cache, trajectory)
+
+        error = np.abs(cached - exact)
+        stats = cache.stats()
+        print(
+            f"{name:>7}: {len(trajectory)} updates, exact {exact_time * 1e6:.1f} us, "
+            f"cached {cached_time * 1e6:.1f} us ({exact_time / cached_time:.1f}x), hit rate {stats['hit_rate']:.1%}, "
+            f"jacobian updates {stats['num_jacobian_updates']}, "
+            f"error max {error.max():.4f} Nm, p99 {np.percentile(error.max(axis=1), 99):.4f} Nm, "
+            f"mean {error.mean():.5f} Nm"
+        )
+
+
+if __name__ == "__main__":
+    main()
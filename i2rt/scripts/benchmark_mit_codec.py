@@ -0,0 +1,103 @@
+"""Benchmark the CPU cost of packing the MIT commands and parsing the feedback of one control tick.
+
+Compares the per-motor codec of DMSingleMotorCanInterface (`_encode_control_data` and `parse_recv_message`) with
+the batch codec (MITBatchCodec), for the 14 motors of a bimanual YAM setup by default. No CAN traffic is involved,
+the feedback frames are synthetic:
+
+    python scripts/benchmark_mit_codec.py --num_arms 2
+"""
+
+import argparse
+import time
+from typing import Any, Callable, List
+
+import can
+import numpy as np
+
+from i2rt.motor_drivers.dm_driver import ControlMode, DMSingleMotorCanInterface, ReceiveMode
+from i2rt.motor_drivers.mit_codec import MITBatchCodec
+from i2rt.motor_drivers.utils import MotorErrorCode
+
+YAM_MOTOR_TYPES = ["DM4340", "DM4340", "DM4340", "DM4310", "DM4310", "DM4310", "DM4310"]
+
+
+def time_ticks(tick: Callable[[], Any], num_ticks: int) -> np.ndarray:
+    tick_times = []
+    for _ in range(num_ticks):
+        start = time.perf_counter()
+        tick()
+        tick_times.append(time.perf_counter() - start)
+    return np.array(tick_times)
+
+
+def random_replies(motor_ids: List[int], rng: np.random.Generator) -> List[can.Message]:
+    replies = []
+    for motor_id in motor_ids:
+        data = rng.integers(0, 256, size=8, dtype=np.uint8)
+        data[0] = (MotorErrorCode.normal << 4) | (motor_id & 0xF)
+        arbitration_id = ReceiveMode.p16.get_receive_id(motor_id)
+        replies.append(can.Message(arbitration_id=arbitration_id, data=data.tobytes(), is_extended_id=False))
+    return replies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_arms", type=int, default=2)
+    parser.add_argument("--num_ticks", type=int, default=5000)
+    args = parser.parse_args()
+
+    motor_types = YAM_MOTOR_TYPES * args.num_arms
+    # the arms are on separate buses, the codec does not care about duplicated ids
+    motor_ids = [idx % len(YAM_MOTOR_TYPES) + 1 for idx in range(len(motor_types))]
+    num_motors = len(motor_types)
+    rng = np.random.default_rng(0)
+    pos, vel, torque = rng.uniform(-3.0, 3.0, size=(3, num_motors))
+    kp, kd = rng.uniform(0.0, 80.0, size=num_motors), rng.uniform(0.0, 5.0, size=num_motors)
+    replies = random_replies(motor_ids, rng)
+
+    interface = DMSingleMotorCanInterface(
+        control_mode=ControlMode.MIT, channel="benchmark_mit_codec", bustype="virtual", name="benchmark"
+    )
+    codec = MITBatchCodec(motor_ids, motor_types)
+
+    def per_motor_tick() -> tuple:
+        payloads = [
+            interface._encode_control_data(motor_types[idx], pos[idx], vel[idx], kp[idx], kd[idx], torque[idx])
+            for idx in range(num_motors)
+        ]
+        feedback = [
+            interface.parse_recv_message(reply, motor_type)
+            for reply, motor_type in zip(replies, motor_types, strict=True)
+        ]
+        errors = np.array([info.error_code != "0x1" for info in feedback])
+        return payloads, feedback, errors
+
+    def batch_tick() -> tuple:
+        codec.encode(pos, vel, kp, kd, torque)
+        for idx, reply in enumerate(replies):
+            codec.set_feedback_payload(idx, reply.data)
+        feedback = codec.decode()
+        errors = feedback["error_code"] != MotorErrorCode.normal
+        return feedback, errors
+
+    try:
+        # both codecs must produce the same frames and states
+        payloads, infos, _ = per_motor_tick()
+        feedback, _ = batch_tick()
+        assert codec.command_buffer == b"".join(payloads), "command frames differ"
+        for name in ["position", "velocity", "torque"]:
+            assert np.array_equal(feedback[name], [getattr(info, name) for info in infos]), f"{name} differs"
+
+        for name, tick in [("per-motor", per_motor_tick), ("batch", batch_tick)]:
+            time_ticks(tick, num_ticks=100)  # warmup
+            tick_times = time_ticks(tick, args.num_ticks) * 1e6
+            print(
+                f"{name:>10}: {num_motors} motors, tick mean {tick_times.mean():.1f} us, "
+                f"p50 {np.percentile(tick_times, 50):.1f} us, p99 {np.percentile(tick_times, 99):.1f} us"
+            )
+    finally:
+        interface.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import io
 import logging
+import queue
 import threading
 import time
 import os
@@ -15,6 +16,7 @@ from openpi_client import websocket_client_policy
 from lerobot.cameras.utils import make_cameras_from_configs
 from lerobot.robots.utils import make_robot_from_config
 from lerobot.robots.yam_bimanual.config_yam_bimanual import YamBimanualConfig
+from lerobot.scripts.server.helpers import LatencyEstimator
 
 # Configure logging to show timestamps
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,7 +28,10 @@ os.makedirs(output_dir, exist_ok=True)
 # Initialize cameras
 # camera_1, camera_4 = initialize_cameras()
 print("Cameras initialized")
-num_steps = 5000
+num_steps = 5000  # number of action chunks requested
+CONTROL_DT = 0.04  # period of the control loop commanding the robot, s
+ACTION_DT = 0.04  # time between two actions of a chunk, s
+ACTIONS_PER_CHUNK = 30  # actions of a chunk executed, at most
 # Outside of episode loop, initialize the policy client.
 # Point to the host and port of the policy server (localhost and 8000 are the defaults).
 # 38.80.152.248:30982
@@ -77,80 +82,131 @@ item_for_next_two_chunks = None
 skip = 0
 last_json = None
 
+def capture_observation(step):
+    """Camera frames and joint positions of the robot, formatted for the policy server"""
+    # Fetch current frames from cameras
+    top_cam = cameras["top"].async_read()
+    left_cam = cameras["left"].async_read()
+    right_cam = cameras["right"].async_read()
+
+    # Save images every 10 steps
+    if step % 10 == 0:
+        # Save original images
+        cv2.imwrite(f"{output_dir}/opencv__dev_video{step}_top.png", top_cam)
+        cv2.imwrite(f"{output_dir}/opencv__dev_video{step}_left.png", left_cam)
+        cv2.imwrite(f"{output_dir}/opencv__dev_video{step}_right.png", right_cam)
+
+        logging.info(f"Saved images for step {step}")
+
+    # Resize images on the client side to minimize bandwidth / latency. Always return images in uint8 format.
+    # We provide utilities for resizing images + uint8 conversion so you match the training routines.
+    # The typical resize_size for pre-trained pi0 models is 224.
+    # Note that the proprioceptive `state` can be passed unnormalized, normalization will be handled on the server side.
+    current_state = robot.get_joint_positions()
+    current_state = np.array(current_state)
+
+    print(current_state, "curr state")
+
+    return {
+        "observation.images.top": image_tools.convert_to_uint8(
+            image_tools.resize_with_pad(top_cam, 224, 224)
+        ),
+        "observation.images.left": image_tools.convert_to_uint8(
+            image_tools.resize_with_pad(left_cam, 224, 224)
+        ),
+        "observation.images.right": image_tools.convert_to_uint8(
+            image_tools.resize_with_pad(right_cam, 224, 224)
+        ),
+        "observation.state": current_state,
+        "prompt": task_instruction,
+    }
+
+
+def interpolate_action(chunk_times, action_chunk, t):
+    """Action at time t, linearly interpolated between the timestamped actions of the chunk"""
+    upper = int(np.clip(np.searchsorted(chunk_times, t), 1, len(chunk_times) - 1))
+    t_lower, t_upper = chunk_times[upper - 1], chunk_times[upper]
+    weight = np.clip((t - t_lower) / (t_upper - t_lower), 0.0, 1.0)
+    return action_chunk[upper - 1] + weight * (action_chunk[upper] - action_chunk[upper - 1])
+
+
 def main():
-    global skip, last_json, current_level
-    for step in range(num_steps):
-        step_start_time = datetime.now()
-        logging.info(f"Step {step} started at: {step_start_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
-        
-        # Fetch current frames from cameras
-        top_cam = cameras["top"].async_read()
-        left_cam = cameras["left"].async_read()
-        right_cam = cameras["right"].async_read()
-        
-        # Save images every 10 steps
-        if step % 10 == 0:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-            
-            # Save original images
-            cv2.imwrite(f"{output_dir}/opencv__dev_video{step}_top.png", top_cam)
-            cv2.imwrite(f"{output_dir}/opencv__dev_video{step}_left.png", left_cam)
-            cv2.imwrite(f"{output_dir}/opencv__dev_video{step}_right.png", right_cam)
-            
-            logging.info(f"Saved images for step {step}")
-                        
-        # Resize images on the client side to minimize bandwidth / latency. Always return images in uint8 format.
-        # We provide utilities for resizing images + uint8 conversion so you match the training routines.
-        # The typical resize_size for pre-trained pi0 models is 224.
-        # Note that the proprioceptive `state` can be passed unnormalized, normalization will be handled on the server side.
-        current_state = robot.get_joint_positions()
-        current_state = np.array(current_state)
-
-        # Log observation construction time
-        observation_time = datetime.now()
-        logging.info(f"Observation constructed at: {observation_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
-
-        observation = {
-            "observation.images.top": image_tools.convert_to_uint8(
-                image_tools.resize_with_pad(top_cam, 224, 224)
-            ),
-            "observation.images.left": image_tools.convert_to_uint8(
-                image_tools.resize_with_pad(left_cam, 224, 224)
-            ),
-            "observation.images.right": image_tools.convert_to_uint8(
-                image_tools.resize_with_pad(right_cam, 224, 224)
-            ),
-            "observation.state": current_state,
-            "prompt": task_instruction,
-        }
-
-        print(current_state, "curr state")
-
-        # Call the policy server with the current observation.
-        # This returns an action chunk of shape (action_horizon, action_dim).
-        # Note that you typically only need to call the policy every N steps and execute steps
-        # from the predicted action chunk open-loop in the remaining steps.
-        policy_start_time = datetime.now()
-        logging.info(f"Policy inference started at: {policy_start_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
-        
-        action_chunk = client.infer(observation)["actions"]
-        
-        policy_end_time = datetime.now()
-        logging.info(f"Policy inference completed at: {policy_end_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
-        
-        action_chunk = action_chunk[:30]
-        for action in action_chunk:
-            # if action[1] < 0.03:
-            #     continue
-            robot.command_joint_pos(np.array(action[:14]))
-            time.sleep(0.04)
-
-        # Execute the actions in the environment.
-        # Add your action execution logic here
-        step_end_time = datetime.now()
-        step_duration = (step_end_time - step_start_time).total_seconds()
-        logging.info(f"Step {step} completed at: {step_end_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]} (Duration: {step_duration:.3f}s)")
-        print(f"Step {step}: Got action chunk with shape {action_chunk.shape}")
+    # Inference runs in the background: the control loop keeps commanding the robot at CONTROL_DT while the next
+    # chunk is predicted. The actions of a chunk are timestamped from the capture of their observation, and
+    # interpolated on the control clock, skipping the ones that went past during inference.
+    latency = LatencyEstimator()
+    observations = queue.Queue(maxsize=1)
+    action_chunks = queue.Queue()
+
+    def inference_worker():
+        while True:
+            step, observation_time, observation = observations.get()
+
+            # Call the policy server with the current observation.
+            # This returns an action chunk of shape (action_horizon, action_dim).
+            policy_start_time = datetime.now()
+            logging.info(f"Policy inference started at: {policy_start_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
+
+            try:
+                action_chunk = client.infer(observation)["actions"]
+            except Exception as e:
+                # e.g. network error or server restart: the control loop requests a new chunk after a second
+                logging.exception(f"Step {step}: Policy inference failed: {e}")
+                time.sleep(1.0)
+                action_chunks.put((step, observation_time, None))
+                continue
+
+            policy_end_time = datetime.now()
+            logging.info(f"Policy inference completed at: {policy_end_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
+
+            action_chunks.put((step, observation_time, np.asarray(action_chunk)[:ACTIONS_PER_CHUNK, :14]))
+
+    threading.Thread(target=inference_worker, daemon=True).start()
+
+    chunk_times = None
+    action_chunk = None
+    step = 0
+    num_chunks = 0
+    inference_pending = False
+    while num_chunks < num_steps:
+        tick_start = time.perf_counter()
+        now = time.time()
+
+        # Switch to the latest action chunk. If the inference failed (no chunk), the current chunk keeps being
+        # executed and a new one is requested.
+        try:
+            chunk_step, observation_time, new_chunk = action_chunks.get_nowait()
+            inference_pending = False
+        except queue.Empty:
+            new_chunk = None
+        if new_chunk is not None:
+            num_chunks += 1
+            latency.update(now - observation_time)
+            chunk_times = observation_time + ACTION_DT * np.arange(len(new_chunk))
+            action_chunk = new_chunk
+            logging.info(
+                f"Step {chunk_step}: Got action chunk with shape {action_chunk.shape} | "
+                f"Round-trip latency: {(now - observation_time) * 1000:.1f}ms "
+                f"(estimate {latency.estimate() * 1000:.1f}ms)"
+            )
+
+        # Request the next chunk early enough for it to arrive before the current one runs out
+        remaining_time = chunk_times[-1] - now if chunk_times is not None else 0.0
+        latency_estimate = latency.estimate()
+        chunk_running_out = latency_estimate is None or remaining_time <= latency_estimate + CONTROL_DT
+        if not inference_pending and chunk_running_out:
+            observation_time = time.time()
+            logging.info(f"Step {step}: observation constructed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
+            observations.put((step, observation_time, capture_observation(step)))
+            inference_pending = True
+            step += 1
+
+        # Execute the action of the current time, holding the last one if the chunk ran out
+        if chunk_times is not None:
+            robot.command_joint_pos(interpolate_action(chunk_times, action_chunk, now))
+
+        time.sleep(max(0.0, CONTROL_DT - (time.perf_counter() - tick_start)))
+
 
 if __name__ == "__main__":
     try:
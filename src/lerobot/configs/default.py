@@ -37,6 +37,16 @@ class DatasetConfig:
     revision: str | None = None
     use_imagenet_stats: bool = True
     video_backend: str = field(default_factory=get_safe_default_codec)
+    # Compile the numeric features into memory-mapped numpy arrays to speed up frame and delta window queries.
+    use_frame_store: bool = False
+    # Number of video decoders kept open per DataLoader worker (0 to disable).
+    video_decoder_cache_size: int = 0
+    # Cache decoded video frames on disk as uint8, optionally downscaled to (height, width), to skip decoding
+    # after the first epoch.
+    use_video_frame_cache: bool = False
+    video_frame_cache_resolution: tuple[int, int] | None = None
+    # Max size of the video frame cache on disk, in bytes (None to only check the available disk space).
+    video_frame_cache_max_size_bytes: int | None = None
 
 
 @dataclass
@@ -82,13 +82,134 @@ def get_feature_stats(array: np.ndarray, axis: tuple, keepdims: bool) -> dict[st
     }
 
 
+class RunningStats:
+    """Min, max, mean and variance of a stream of batches, merged with the parallel variance algorithm
+    (Chan et al.), which reduces to Welford's algorithm for batches of one sample.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self.m2 = None
+        self.min = None
+        self.max = None
+
+    def update_batch(
+        self, count: int, mean: np.ndarray, var: np.ndarray, min: np.ndarray, max: np.ndarray
+    ) -> None:
+        """Merges the stats of a batch of `count` samples."""
+        if self.count == 0:
+            self.count = count
+            self.mean = mean.astype(np.float64)
+            self.m2 = var * count
+            self.min = min
+            self.max = max
+            return
+
+        total_count = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total_count)
+        self.m2 = self.m2 + var * count + delta**2 * (self.count * count / total_count)
+        self.count = total_count
+        self.min = np.minimum(self.min, min)
+        self.max = np.maximum(self.max, max)
+
+    def update(self, value: np.ndarray) -> None:
+        """Adds a single sample."""
+        self.update_batch(1, value, np.zeros_like(value, dtype=np.float64), value, value)
+
+    @property
+    def var(self) -> np.ndarray:
+        return self.m2 / self.count
+
+
+class EpisodeStatsAccumulator:
+    """Computes the stats of an episode incrementally, as its frames are added with `update`.
+
+    Numeric features are accumulated with Welford's algorithm. Images are subsampled like `sample_images` does
+    (see `is_image_sampled`), so that the record loop only pays for the stats of a fraction of the frames, and
+    the per-channel pixel stats of each sampled (downsampled) frame are merged in, without reading the frames
+    back from disk.
+    """
+
+    def __init__(self, features: dict):
+        self.features = features
+        self.num_frames = 0
+        self._stats: dict[str, RunningStats] = {}
+        self._frame_counts: dict[str, int] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._stats
+
+    @staticmethod
+    def is_image_sampled(frame_index: int) -> bool:
+        """Whether the images of a frame are used in the stats. Like `sample_indices`, the first 100 frames are
+        all sampled, then the sampling stride grows with the number of frames, as n / estimate_num_samples(n).
+        """
+        num_frames = frame_index + 1
+        stride = max(1, num_frames // estimate_num_samples(num_frames))
+        return frame_index % stride == 0
+
+    def update(self, frame: dict) -> None:
+        images_sampled = self.is_image_sampled(self.num_frames)
+        for key, value in frame.items():
+            if key not in self.features or self.features[key]["dtype"] == "string":
+                continue
+            is_image = self.features[key]["dtype"] in ["image", "video"]
+            if is_image and not images_sampled:
+                continue
+            running = self._stats.setdefault(key, RunningStats())
+            if is_image:
+                self._update_image(running, value)
+            else:
+                running.update(np.atleast_1d(np.asarray(value)))
+            # for images, the number of sampled frames, like the count of `compute_episode_stats`
+            self._frame_counts[key] = self._frame_counts.get(key, 0) + 1
+        self.num_frames += 1
+
+    @staticmethod
+    def _update_image(running: RunningStats, image: np.ndarray) -> None:
+        image = np.asarray(image)
+        if image.shape[0] != 3:
+            image = image.transpose(2, 0, 1)  # (H, W, C) -> (C, H, W)
+        image = auto_downsample_height_width(image)
+        pixels = image.reshape(image.shape[0], -1)
+        if image.dtype == np.uint8:
+            pixels = pixels.astype(np.float32) / 255.0
+        running.update_batch(
+            pixels.shape[1],
+            pixels.mean(axis=1, dtype=np.float64),
+            pixels.var(axis=1, dtype=np.float64),
+            pixels.min(axis=1),
+            pixels.max(axis=1),
+        )
+
+    def get_episode_stats(self) -> dict[str, dict[str, np.ndarray]]:
+        """Returns the stats of the frames added so far, in the format of `compute_episode_stats`."""
+        ep_stats = {}
+        for key, running in self._stats.items():
+            ft_stats = {
+                "min": running.min,
+                "max": running.max,
+                "mean": running.mean,
+                "std": np.sqrt(running.var),
+            }
+            if self.features[key]["dtype"] in ["image", "video"]:
+                # (C,) -> (C, 1, 1)
+                ft_stats = {k: v.astype(np.float64).reshape(-1, 1, 1) for k, v in ft_stats.items()}
+            ft_stats["count"] = np.array([self._frame_counts[key]])
+            ep_stats[key] = ft_stats
+        return ep_stats
+
+
 def compute_episode_stats(episode_data: dict[str, list[str] | np.ndarray], features: dict) -> dict:
     ep_stats = {}
     for key, data in episode_data.items():
         if features[key]["dtype"] == "string":
             continue  # HACK: we should receive np.arrays of strings
         elif features[key]["dtype"] in ["image", "video"]:
-            ep_ft_array = sample_images(data)  # data is a list of image paths
+            # data is a list of image paths, or uint8 (C, H, W) images already sampled from the episode
+            ep_ft_array = data if isinstance(data, np.ndarray) else sample_images(data)
             axes_to_reduce = (0, 2, 3)  # keep channel dim
             keepdims = True
         else:
@@ -123,11 +244,17 @@ def _assert_type_and_shape(stats_list: list[dict[str, dict]]):
                     raise ValueError(f"Shape of '{k}' must be (3,1,1), but is {v.shape} instead.")
 
 
-def aggregate_feature_stats(stats_ft_list: list[dict[str, dict]]) -> dict[str, dict[str, np.ndarray]]:
-    """Aggregates stats for a single feature."""
-    means = np.stack([s["mean"] for s in stats_ft_list])
-    variances = np.stack([s["std"] ** 2 for s in stats_ft_list])
-    counts = np.stack([s["count"] for s in stats_ft_list])
+def stack_feature_stats(stats_ft_list: list[dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+    """Stacks the stats of a feature over many episodes into one array per stat, with the episodes first."""
+    return {k: np.stack([s[k] for s in stats_ft_list]) for k in ["min", "max", "mean", "std", "count"]}
+
+
+def merge_stacked_feature_stats(stacked: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Merges stats stacked with `stack_feature_stats` in a few vectorized operations, whatever the number of
+    episodes."""
+    means = stacked["mean"]
+    variances = stacked["std"] ** 2
+    counts = stacked["count"]
     total_count = counts.sum(axis=0)
 
     # Prepare weighted mean by matching number of dimensions
@@ -144,14 +271,19 @@ def aggregate_feature_stats(stats_ft_list: list[dict[str, dict]]) -> dict[str, d
     total_variance = weighted_variances.sum(axis=0) / total_count
 
     return {
-        "min": np.min(np.stack([s["min"] for s in stats_ft_list]), axis=0),
-        "max": np.max(np.stack([s["max"] for s in stats_ft_list]), axis=0),
+        "min": np.min(stacked["min"], axis=0),
+        "max": np.max(stacked["max"], axis=0),
         "mean": total_mean,
         "std": np.sqrt(total_variance),
         "count": total_count,
     }
 
 
+def aggregate_feature_stats(stats_ft_list: list[dict[str, dict]]) -> dict[str, dict[str, np.ndarray]]:
+    """Aggregates stats for a single feature."""
+    return merge_stacked_feature_stats(stack_feature_stats(stats_ft_list))
+
+
 def aggregate_stats(stats_list: list[dict[str, dict]]) -> dict[str, dict[str, np.ndarray]]:
     """Aggregate stats from multiple compute_stats outputs into a single set of stats.
 
@@ -166,11 +298,10 @@ def aggregate_stats(stats_list: list[dict[str, dict]]) -> dict[str, dict[str, np
 
     _assert_type_and_shape(stats_list)
 
-    data_keys = {key for stats in stats_list for key in stats}
-    aggregated_stats = {key: {} for key in data_keys}
-
-    for key in data_keys:
-        stats_with_key = [stats[key] for stats in stats_list if key in stats]
-        aggregated_stats[key] = aggregate_feature_stats(stats_with_key)
+    # Group the stats by key in a single pass, so that each feature is merged at once over all the episodes
+    stats_by_key = {}
+    for stats in stats_list:
+        for key, ft_stats in stats.items():
+            stats_by_key.setdefault(key, []).append(ft_stats)
 
-    return aggregated_stats
+    return {key: aggregate_feature_stats(stats_ft_list) for key, stats_ft_list in stats_by_key.items()}
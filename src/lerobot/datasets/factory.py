@@ -95,6 +95,11 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
             image_transforms=image_transforms,
             revision=cfg.dataset.revision,
             video_backend=cfg.dataset.video_backend,
+            use_frame_store=cfg.dataset.use_frame_store,
+            video_decoder_cache_size=cfg.dataset.video_decoder_cache_size,
+            use_video_frame_cache=cfg.dataset.use_video_frame_cache,
+            video_frame_cache_resolution=cfg.dataset.video_frame_cache_resolution,
+            video_frame_cache_max_size_bytes=cfg.dataset.video_frame_cache_max_size_bytes,
         )
     else:
         raise NotImplementedError("The MultiLeRobotDataset isn't supported for now.")
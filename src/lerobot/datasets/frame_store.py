@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A columnar, memory-mapped copy of the non-visual features of a LeRobotDataset.
+
+Reading a window of frames through `hf_dataset.select(...)` goes through Arrow and python lists for every key of
+every sample. The frame store compiles each numeric feature once into a contiguous numpy memmap file (one file per
+data key, like `OnlineBuffer`), so that delta-window queries become plain numpy gathers. The files are opened in
+read-only mode lazily in each process: they are shared across DataLoader workers through the OS page cache and
+are never copied when the dataset is pickled.
+
+Each episode subset gets its own store directory (see `get_frame_store_dir`), which is rebuilt when the
+fingerprint of the dataset (its revision, and the paths, sizes and modification times of its parquet files)
+changes.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import datasets
+import numpy as np
+
+from lerobot.datasets.utils import load_json, write_json
+
+FRAME_STORE_DIR = "cache/frame_store"
+FRAME_STORE_SPEC = "spec.json"
+# Number of rows read at once from the parquet files when compiling the store
+BUILD_CHUNK_SIZE = 10_000
+
+
+def get_frame_store_dir(root: str | Path, episodes: list[int] | None) -> Path:
+    """Directory of the store of an episode subset, so that switching between subsets doesn't rebuild it."""
+    if episodes is None:
+        return Path(root) / FRAME_STORE_DIR / "all"
+    episodes_hash = hashlib.sha256(json.dumps(list(episodes)).encode()).hexdigest()[:16]
+    return Path(root) / FRAME_STORE_DIR / f"episodes_{episodes_hash}"
+
+
+def get_frame_store_keys(features: dict[str, dict]) -> list[str]:
+    """Keys of the features that can be stored as fixed-shape numeric arrays."""
+    return [key for key, ft in features.items() if ft["dtype"] not in ["image", "video", "string"]]
+
+
+class FrameStore:
+    """Read-only, memory-mapped numpy arrays holding the numeric features of a dataset.
+
+    For each key, the array has shape (num_frames, *shape), or (num_frames,) for features of shape (1,) in order
+    to match the scalars returned by `hf_dataset`.
+    """
+
+    def __init__(self, store_dir: str | Path):
+        self.store_dir = Path(store_dir)
+        self.spec = load_json(self.store_dir / FRAME_STORE_SPEC)
+        self._arrays = {}
+
+    @property
+    def keys(self) -> list[str]:
+        return list(self.spec["features"])
+
+    @property
+    def num_frames(self) -> int:
+        return self.spec["num_frames"]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.spec["features"]
+
+    def __getitem__(self, key: str) -> np.memmap:
+        if key not in self._arrays:
+            ft = self.spec["features"][key]
+            self._arrays[key] = np.memmap(
+                self.store_dir / key,
+                dtype=np.dtype(ft["dtype"]),
+                mode="r",
+                shape=(self.num_frames, *ft["shape"]),
+            )
+        return self._arrays[key]
+
+    def __getstate__(self) -> dict:
+        # Memmaps are reopened in each process instead of being pickled (which would copy their content).
+        state = self.__dict__.copy()
+        state["_arrays"] = {}
+        return state
+
+    @staticmethod
+    def is_valid(
+        store_dir: str | Path,
+        num_frames: int,
+        episodes: list[int] | None,
+        keys: list[str],
+        fingerprint: str | None = None,
+    ) -> bool:
+        spec_path = Path(store_dir) / FRAME_STORE_SPEC
+        if not spec_path.is_file():
+            return False
+        spec = load_json(spec_path)
+        return (
+            spec.get("fingerprint") == fingerprint
+            and spec["num_frames"] == num_frames
+            and spec["episodes"] == episodes
+            and set(spec["features"]) == set(keys)
+        )
+
+    @classmethod
+    def build(
+        cls,
+        store_dir: str | Path,
+        hf_dataset: datasets.Dataset,
+        features: dict[str, dict],
+        episodes: list[int] | None = None,
+        fingerprint: str | None = None,
+    ) -> "FrameStore":
+        """Compiles the numeric columns of `hf_dataset` into one memmap file per key.
+
+        The spec file is written last, so that an interrupted build is never considered as valid. `fingerprint`
+        identifies the content of the dataset the store is built from, it must match for the store to be reused.
+        """
+        store_dir = Path(store_dir)
+        store_dir.mkdir(parents=True, exist_ok=True)
+        (store_dir / FRAME_STORE_SPEC).unlink(missing_ok=True)
+
+        keys = get_frame_store_keys({k: ft for k, ft in features.items() if k in hf_dataset.features})
+        num_frames = len(hf_dataset)
+        spec = {"fingerprint": fingerprint, "num_frames": num_frames, "episodes": episodes, "features": {}}
+        arrays = {}
+        for key in keys:
+            shape = [] if tuple(features[key]["shape"]) == (1,) else list(features[key]["shape"])
+            spec["features"][key] = {"dtype": features[key]["dtype"], "shape": shape}
+            arrays[key] = np.memmap(
+                store_dir / key,
+                dtype=np.dtype(features[key]["dtype"]),
+                mode="w+",
+                shape=(num_frames, *shape),
+            )
+
+        logging.info(f"Building frame store for {keys} ({num_frames} frames) in {store_dir}")
+        table = hf_dataset.with_format("numpy", columns=keys)
+        for start in range(0, num_frames, BUILD_CHUNK_SIZE):
+            end = min(start + BUILD_CHUNK_SIZE, num_frames)
+            batch = table[start:end]
+            for key in keys:
+                arrays[key][start:end] = np.asarray(batch[key]).reshape(arrays[key][start:end].shape)
+
+        for array in arrays.values():
+            array.flush()
+        del arrays
+
+        write_json(spec, store_dir / FRAME_STORE_SPEC)
+        return cls(store_dir)
+
+    @classmethod
+    def load_or_build(
+        cls,
+        store_dir: str | Path,
+        hf_dataset: datasets.Dataset,
+        features: dict[str, dict],
+        episodes: list[int] | None = None,
+        fingerprint: str | None = None,
+    ) -> "FrameStore":
+        keys = get_frame_store_keys({k: ft for k, ft in features.items() if k in hf_dataset.features})
+        if cls.is_valid(store_dir, len(hf_dataset), episodes, keys, fingerprint):
+            return cls(store_dir)
+        return cls.build(store_dir, hf_dataset, features, episodes, fingerprint)
@@ -13,9 +13,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import logging
 import multiprocessing
 import queue
+import sys
 import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import shared_memory
 from pathlib import Path
 
 import numpy as np
@@ -76,31 +82,138 @@ def write_image(image: np.ndarray | PIL.Image.Image, fpath: Path):
             img = image
         else:
             raise TypeError(f"Unsupported image type: {type(image)}")
-        img.save(fpath)
+        # Written under a temporary name and then renamed, so that a reader never sees a partial image at `fpath`
+        fpath = Path(fpath)
+        tmp_fpath = fpath.with_name(f"{fpath.stem}.tmp{fpath.suffix}")
+        img.save(tmp_fpath)
+        tmp_fpath.replace(fpath)
     except Exception as e:
         print(f"Error writing image {fpath}: {e}")
 
 
-def worker_thread_loop(queue: queue.Queue):
+@dataclass(frozen=True)
+class SharedFrame:
+    """Reference to a frame written in a slot of a `SharedFrameRing`, sent to the worker processes instead of
+    the frame itself."""
+
+    shm_name: str
+    slot: int
+    shape: tuple[int, ...]
+    dtype: str
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize
+
+
+class SharedFrameRing:
+    """A pool of `num_slots` frame buffers of the same shape and dtype in one shared memory block.
+
+    The slots are handed out by the main process, and given back by the workers once the frame is written on
+    disk, through `AsyncImageWriter.released_slots`.
+    """
+
+    def __init__(self, shape: tuple[int, ...], dtype: np.dtype, num_slots: int):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.num_slots = num_slots
+        nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes * num_slots)
+        self.frames = np.ndarray((num_slots, *self.shape), dtype=self.dtype, buffer=self.shm.buf)
+        self.free_slots = deque(range(num_slots))
+
+        self.num_frames = 0
+        self.max_occupied_slots = 0
+        self.blocked_frames = 0
+        self.blocked_time_s = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def occupied_slots(self) -> int:
+        return self.num_slots - len(self.free_slots)
+
+    def matches(self, image: np.ndarray) -> bool:
+        return image.shape == self.shape and image.dtype == self.dtype
+
+    def write(self, image: np.ndarray) -> SharedFrame:
+        """Copies the image in a free slot. The caller must ensure that a slot is free."""
+        slot = self.free_slots.popleft()
+        self.frames[slot] = image
+        self.num_frames += 1
+        self.max_occupied_slots = max(self.max_occupied_slots, self.occupied_slots)
+        return SharedFrame(self.name, slot, self.shape, self.dtype.str)
+
+    def metrics(self) -> dict:
+        return {
+            "num_slots": self.num_slots,
+            "occupied_slots": self.occupied_slots,
+            "max_occupied_slots": self.max_occupied_slots,
+            "num_frames": self.num_frames,
+            "blocked_frames": self.blocked_frames,
+            "blocked_time_s": self.blocked_time_s,
+        }
+
+    def close(self) -> None:
+        del self.frames
+        self.shm.close()
+        self.shm.unlink()
+
+
+# Shared memory blocks attached by the threads of a worker process, by name
+_attached_shms: dict[str, shared_memory.SharedMemory] = {}
+_attached_shms_lock = threading.Lock()
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    with _attached_shms_lock:
+        if name not in _attached_shms:
+            if sys.version_info >= (3, 13):
+                shm = shared_memory.SharedMemory(name=name, track=False)
+            else:
+                # The workers share the resource tracker of the main process, which owns the block: registering
+                # it again is a no-op, and it must not be unregistered here, or the tracker would neither
+                # expect the unlink of the main process nor clean the block up if the main process dies.
+                shm = shared_memory.SharedMemory(name=name)
+            _attached_shms[name] = shm
+        return _attached_shms[name]
+
+
+def write_shared_image(frame: SharedFrame, fpath: Path, released_slots: multiprocessing.Queue):
+    shm = _attach_shared_memory(frame.shm_name)
+    image_array = np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf, offset=frame.slot * frame.nbytes)
+    write_image(image_array, fpath)
+    del image_array
+    released_slots.put((frame.shm_name, frame.slot))
+
+
+def worker_thread_loop(queue: queue.Queue, released_slots: multiprocessing.Queue | None = None):
     while True:
         item = queue.get()
         if item is None:
             queue.task_done()
             break
         image_array, fpath = item
-        write_image(image_array, fpath)
+        if isinstance(image_array, SharedFrame):
+            write_shared_image(image_array, fpath, released_slots)
+        else:
+            write_image(image_array, fpath)
         queue.task_done()
 
 
-def worker_process(queue: queue.Queue, num_threads: int):
+def worker_process(queue: queue.Queue, num_threads: int, released_slots: multiprocessing.Queue | None = None):
     threads = []
     for _ in range(num_threads):
-        t = threading.Thread(target=worker_thread_loop, args=(queue,))
+        t = threading.Thread(target=worker_thread_loop, args=(queue, released_slots))
         t.daemon = True
         t.start()
         threads.append(t)
     for t in threads:
         t.join()
+    for shm in _attached_shms.values():
+        shm.close()
 
 
 class AsyncImageWriter:
@@ -116,12 +229,29 @@ class AsyncImageWriter:
     The optimal number of processes and threads depends on your computer capabilities.
     We advise to use 4 threads per camera with 0 processes. If the fps is not stable, try to increase or lower
     the number of threads. If it is still not stable, try to use 1 subprocess, or more.
+
+    With subprocesses, numpy frames are not pickled through the queue: each camera gets a ring of
+    `num_shared_slots` frame buffers in shared memory, where the frame is copied once, and only the slot
+    index is sent to the workers. When all the slots of a camera are waiting to be written, `save_image`
+    blocks until one is released. `get_metrics` reports the slot occupancy and the time spent blocked, to
+    tune the number of processes and slots. If no slot is released within `slot_timeout_s`, or a worker
+    process died, `save_image` raises instead of blocking forever.
     """
 
-    def __init__(self, num_processes: int = 0, num_threads: int = 1):
+    def __init__(
+        self,
+        num_processes: int = 0,
+        num_threads: int = 1,
+        num_shared_slots: int = 30,
+        slot_timeout_s: float = 30.0,
+    ):
         self.num_processes = num_processes
         self.num_threads = num_threads
+        self.num_shared_slots = num_shared_slots
+        self.slot_timeout_s = slot_timeout_s
         self.queue = None
+        self.released_slots = None
+        self.rings: dict[str, SharedFrameRing] = {}
         self.threads = []
         self.processes = []
         self._stopped = False
@@ -140,18 +270,83 @@ class AsyncImageWriter:
         else:
             # Use multiprocessing
             self.queue = multiprocessing.JoinableQueue()
+            self.released_slots = multiprocessing.Queue()
             for _ in range(self.num_processes):
-                p = multiprocessing.Process(target=worker_process, args=(self.queue, self.num_threads))
+                p = multiprocessing.Process(
+                    target=worker_process, args=(self.queue, self.num_threads, self.released_slots)
+                )
                 p.daemon = True
                 p.start()
                 self.processes.append(p)
 
-    def save_image(self, image: torch.Tensor | np.ndarray | PIL.Image.Image, fpath: Path):
+    def save_image(
+        self, image: torch.Tensor | np.ndarray | PIL.Image.Image, fpath: Path, key: str | None = None
+    ):
+        """Queues an image to be written in `fpath`. `key` identifies the camera, so that each camera gets its
+        own ring of shared memory slots. Defaults to the shape and dtype of the image.
+        """
         if isinstance(image, torch.Tensor):
             # Convert tensor to numpy array to minimize main process time
             image = image.cpu().numpy()
+        if self.num_processes > 0 and self.num_shared_slots > 0 and isinstance(image, np.ndarray):
+            image = self._write_shared_frame(image, key)
         self.queue.put((image, fpath))
 
+    def _write_shared_frame(self, image: np.ndarray, key: str | None) -> SharedFrame | np.ndarray:
+        if key is None:
+            key = f"{image.shape}_{image.dtype}"
+        ring = self.rings.get(key)
+        if ring is None:
+            ring = SharedFrameRing(image.shape, image.dtype, self.num_shared_slots)
+            self.rings[key] = ring
+        elif not ring.matches(image):
+            logging.warning(
+                f"Image of shape {image.shape} and dtype {image.dtype} doesn't match the shared memory slots "
+                f"of '{key}' {ring.shape} {ring.dtype}. Sending it through the queue instead."
+            )
+            return image
+
+        self._release_slots(block=False)
+        if len(ring.free_slots) == 0:
+            start = time.perf_counter()
+            while len(ring.free_slots) == 0:
+                self._release_slots(block=True, timeout=1.0)
+                if len(ring.free_slots) > 0:
+                    break
+                self._check_workers_alive()
+                if time.perf_counter() - start > self.slot_timeout_s:
+                    raise TimeoutError(
+                        f"No shared memory slot of '{key}' was released by the image writer processes in "
+                        f"{self.slot_timeout_s}s."
+                    )
+            ring.blocked_frames += 1
+            ring.blocked_time_s += time.perf_counter() - start
+        return ring.write(image)
+
+    def _release_slots(self, block: bool, timeout: float | None = None) -> None:
+        rings_by_name = {ring.name: ring for ring in self.rings.values()}
+        try:
+            while True:
+                shm_name, slot = self.released_slots.get(block=block, timeout=timeout)
+                rings_by_name[shm_name].free_slots.append(slot)
+                block = False
+        except queue.Empty:
+            pass
+
+    def _check_workers_alive(self) -> None:
+        dead = [p for p in self.processes if not p.is_alive()]
+        if dead:
+            raise RuntimeError(
+                "Image writer processes died, with exit codes "
+                f"{[p.exitcode for p in dead]}. The frames they were writing are lost."
+            )
+
+    def get_metrics(self) -> dict[str, dict]:
+        """Occupancy of the shared memory slots of each camera, and frames which blocked `save_image`."""
+        if self.released_slots is not None and not self._stopped:
+            self._release_slots(block=False)
+        return {key: ring.metrics() for key, ring in self.rings.items()}
+
     def wait_until_done(self):
         self.queue.join()
 
@@ -174,5 +369,8 @@ class AsyncImageWriter:
                     p.terminate()
             self.queue.close()
             self.queue.join_thread()
+            self.released_slots.close()
+            for ring in self.rings.values():
+                ring.close()
 
         self._stopped = True
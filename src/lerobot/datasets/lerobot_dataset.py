@@ -25,13 +25,18 @@ import packaging.version
 import PIL.Image
 import torch
 import torch.utils
-from datasets import concatenate_datasets, load_dataset
+from datasets import load_dataset
 from huggingface_hub import HfApi, snapshot_download
 from huggingface_hub.constants import REPOCARD_NAME
 from huggingface_hub.errors import RevisionNotFoundError
 
 from lerobot.constants import HF_LEROBOT_HOME
-from lerobot.datasets.compute_stats import aggregate_stats, compute_episode_stats
+from lerobot.datasets.compute_stats import (
+    EpisodeStatsAccumulator,
+    aggregate_stats,
+    compute_episode_stats,
+)
+from lerobot.datasets.frame_store import FrameStore, get_frame_store_dir
 from lerobot.datasets.image_writer import AsyncImageWriter, write_image
 from lerobot.datasets.utils import (
     DEFAULT_FEATURES,
@@ -49,6 +54,7 @@ from lerobot.datasets.utils import (
     embed_images,
     get_delta_indices,
     get_episode_data_index,
+    get_files_fingerprint,
     get_hf_features_from_features,
     get_safe_version,
     hf_transform_to_torch,
@@ -65,9 +71,14 @@ from lerobot.datasets.utils import (
     write_info,
     write_json,
 )
+from lerobot.datasets.video_frame_cache import VideoFrameCache
 from lerobot.datasets.video_utils import (
+    StreamingVideoEncoder,
+    VideoDecoderCache,
+    VideoEncodingPool,
     VideoFrame,
     decode_video_frames,
+    decode_video_frames_batch,
     encode_video_frames,
     get_safe_default_codec,
     get_video_info,
@@ -349,6 +360,12 @@ class LeRobotDataset(torch.utils.data.Dataset):
         download_videos: bool = True,
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
+        use_frame_store: bool = False,
+        video_decoder_cache_size: int = 0,
+        use_video_frame_cache: bool = False,
+        video_frame_cache_resolution: tuple[int, int] | None = None,
+        video_frame_cache_max_size_bytes: int | None = None,
+        streaming_encoding: bool = False,
     ):
         """
         2 modes are available for instantiating this class, depending on 2 different use cases:
@@ -452,6 +469,29 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 You can also use the 'pyav' decoder used by Torchvision, which used to be the default option, or 'video_reader' which is another decoder of Torchvision.
             batch_encoding_size (int, optional): Number of episodes to accumulate before batch encoding videos.
                 Set to 1 for immediate encoding (default), or higher for batched encoding. Defaults to 1.
+            use_frame_store (bool, optional): Flag to compile the numeric features (states, actions, timestamps,
+                indices...) into memory-mapped numpy arrays stored in 'root/cache/frame_store', one store per
+                subset of episodes. They are built once from the parquet files (and rebuilt when the revision or
+                the content of the dataset changes) and then used to query frames and delta windows without going
+                through the hf_dataset. The memmaps are shared across DataLoader workers without copies. Defaults
+                to False.
+            video_decoder_cache_size (int, optional): Maximum number of video decoders kept open by each process
+                (i.e. each DataLoader worker) in an LRU pool, instead of reopening the video files on each
+                sample. Its hits and misses can be read with `dataset.video_decoder_cache.stats()`. Set to 0 to
+                disable. Defaults to 0.
+            use_video_frame_cache (bool, optional): Flag to store decoded video frames as uint8 in memory-mapped
+                files in 'root/cache/video_frames', so that they are only decoded once across epochs. The cache is
+                filled on first access, or ahead of training with `lerobot.scripts.build_video_frame_cache`.
+                Defaults to False.
+            video_frame_cache_resolution (tuple[int, int] | None, optional): (height, width) to which the frames
+                are downscaled before being cached (e.g. the input resolution of the policy). Defaults to None,
+                which keeps the resolution of the videos.
+            video_frame_cache_max_size_bytes (int | None, optional): Raises an error if the video frame cache
+                would take more space on disk. Defaults to None (only the available disk space is checked).
+            streaming_encoding (bool, optional): When recording new episodes, pipe the frames of the video keys
+                to one encoder per camera while the episode is recorded, instead of writing them as PNG and
+                encoding them in `save_episode`. Frames are only written as PNG when an encoder falls behind.
+                Defaults to False.
         """
         super().__init__()
         self.repo_id = repo_id
@@ -462,13 +502,27 @@ class LeRobotDataset(torch.utils.data.Dataset):
         self.tolerance_s = tolerance_s
         self.revision = revision if revision else CODEBASE_VERSION
         self.video_backend = video_backend if video_backend else get_safe_default_codec()
+        self.video_decoder_cache = (
+            VideoDecoderCache(video_decoder_cache_size) if video_decoder_cache_size > 0 else None
+        )
         self.delta_indices = None
         self.batch_encoding_size = batch_encoding_size
         self.episodes_since_last_encoding = 0
+        self.streaming_encoding = streaming_encoding
+        self.video_encoders = {}
+        self.video_encoding_pool = None
+        # saved episodes waiting for their videos to be encoded to be added to the metadata
+        self.pending_episodes = {}
+        self.encoded_episodes = set()
+        # episodes whose video encoding failed, they and the following episodes can't be added to the metadata
+        self.failed_episodes = {}
+        self.episode_stats_accumulator = None
 
         # Unused attributes
         self.image_writer = None
         self.episode_buffer = None
+        self.frame_store = None
+        self.video_frame_cache = None
 
         self.root.mkdir(exist_ok=True, parents=True)
 
@@ -505,6 +559,33 @@ class LeRobotDataset(torch.utils.data.Dataset):
             check_delta_timestamps(self.delta_timestamps, self.fps, self.tolerance_s)
             self.delta_indices = get_delta_indices(self.delta_timestamps, self.fps)
 
+        if use_frame_store:
+            episodes = self.episodes if self.episodes is not None else range(self.meta.total_episodes)
+            data_files = [self.meta.get_data_file_path(ep_idx) for ep_idx in episodes]
+            self.frame_store = FrameStore.load_or_build(
+                get_frame_store_dir(self.root, self.episodes),
+                self.hf_dataset,
+                self.features,
+                self.episodes,
+                fingerprint=f"{self.revision}/{get_files_fingerprint(self.root, data_files)}",
+            )
+
+        if use_video_frame_cache and len(self.meta.video_keys) > 0:
+            episode_lengths = {ep_idx: ep["length"] for ep_idx, ep in self.meta.episodes.items()}
+            video_files = [
+                self.meta.get_video_file_path(ep_idx, key)
+                for key in self.meta.video_keys
+                for ep_idx in episode_lengths
+            ]
+            self.video_frame_cache = VideoFrameCache(
+                self.root,
+                self.meta.info,
+                episode_lengths,
+                resolution=video_frame_cache_resolution,
+                max_size_bytes=video_frame_cache_max_size_bytes,
+                fingerprint=f"{self.revision}/{get_files_fingerprint(self.root, video_files)}",
+            )
+
     def push_to_hub(
         self,
         branch: str | None = None,
@@ -517,7 +598,8 @@ class LeRobotDataset(torch.utils.data.Dataset):
         upload_large_folder: bool = False,
         **card_kwargs,
     ) -> None:
-        ignore_patterns = ["images/"]
+        self.wait_for_encoding()
+        ignore_patterns = ["images/", "cache/"]
         if not push_videos:
             ignore_patterns.append("videos/")
 
@@ -625,6 +707,23 @@ class LeRobotDataset(torch.utils.data.Dataset):
         hf_dataset.set_transform(hf_transform_to_torch)
         return hf_dataset
 
+    @property
+    def hf_dataset(self) -> datasets.Dataset:
+        """The table is loaded lazily from the episode parquet files. When recording, `save_episode` only
+        writes the new episode's parquet file and invalidates the table, so that previously saved episodes are
+        never read back (or concatenated) until the table is actually accessed.
+        """
+        if self._hf_dataset is None:
+            if self.meta.total_episodes > 0:
+                self._hf_dataset = self.load_hf_dataset()
+            else:
+                self._hf_dataset = self.create_hf_dataset()
+        return self._hf_dataset
+
+    @hf_dataset.setter
+    def hf_dataset(self, value: datasets.Dataset | None) -> None:
+        self._hf_dataset = value
+
     @property
     def fps(self) -> int:
         """Frames per second used during data collection."""
@@ -633,7 +732,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
     @property
     def num_frames(self) -> int:
         """Number of frames in selected episodes."""
-        return len(self.hf_dataset) if self.hf_dataset is not None else self.meta.total_frames
+        return len(self._hf_dataset) if self._hf_dataset is not None else self.meta.total_frames
 
     @property
     def num_episodes(self) -> int:
@@ -647,24 +746,48 @@ class LeRobotDataset(torch.utils.data.Dataset):
     @property
     def hf_features(self) -> datasets.Features:
         """Features of the hf_dataset."""
-        if self.hf_dataset is not None:
-            return self.hf_dataset.features
+        if self._hf_dataset is not None:
+            return self._hf_dataset.features
         else:
             return get_hf_features_from_features(self.features)
 
     def _get_query_indices(self, idx: int, ep_idx: int) -> tuple[dict[str, list[int | bool]]]:
-        ep_start = self.episode_data_index["from"][ep_idx]
-        ep_end = self.episode_data_index["to"][ep_idx]
-        query_indices = {
-            key: [max(ep_start.item(), min(ep_end.item() - 1, idx + delta)) for delta in delta_idx]
-            for key, delta_idx in self.delta_indices.items()
-        }
-        padding = {  # Pad values outside of current episode range
-            f"{key}_is_pad": torch.BoolTensor(
-                [(idx + delta < ep_start.item()) | (idx + delta >= ep_end.item()) for delta in delta_idx]
-            )
-            for key, delta_idx in self.delta_indices.items()
-        }
+        ep_start = self.episode_data_index["from"][ep_idx].item()
+        ep_end = self.episode_data_index["to"][ep_idx].item()
+        query_indices = {}
+        padding = {}
+        for key, delta_idx in self.delta_indices.items():
+            q_idx = idx + np.asarray(delta_idx)
+            query_indices[key] = np.clip(q_idx, ep_start, ep_end - 1).tolist()
+            # Pad values outside of current episode range
+            padding[f"{key}_is_pad"] = torch.from_numpy((q_idx < ep_start) | (q_idx >= ep_end))
+        return query_indices, padding
+
+    def get_query_indices_batch(self, idxs: list[int] | np.ndarray) -> tuple[dict[str, np.ndarray]]:
+        """Computes the delta windows of a batch of frames at once.
+
+        The episode of each frame is found from `episode_data_index`, so that no frame needs to be read.
+
+        Args:
+            idxs (list[int] | np.ndarray): Indices of the frames in the dataset.
+
+        Returns:
+            tuple[dict[str, np.ndarray]]: The query indices, clamped to the episode boundaries, and the padding
+                masks (with a '_is_pad' suffix in their keys). Each array is of shape (len(idxs), num_deltas).
+        """
+        idxs = np.asarray(idxs, dtype=np.int64)
+        ep_from = self.episode_data_index["from"].numpy()
+        ep_to = self.episode_data_index["to"].numpy()
+        ep_positions = np.searchsorted(ep_to, idxs, side="right")
+        ep_start = ep_from[ep_positions][:, None]
+        ep_end = ep_to[ep_positions][:, None]
+
+        query_indices = {}
+        padding = {}
+        for key, delta_idx in self.delta_indices.items():
+            q_idx = idxs[:, None] + np.asarray(delta_idx)[None, :]
+            query_indices[key] = np.clip(q_idx, ep_start, ep_end - 1)
+            padding[f"{key}_is_pad"] = (q_idx < ep_start) | (q_idx >= ep_end)
         return query_indices, padding
 
     def _get_query_timestamps(
@@ -675,19 +798,59 @@ class LeRobotDataset(torch.utils.data.Dataset):
         query_timestamps = {}
         for key in self.meta.video_keys:
             if query_indices is not None and key in query_indices:
-                timestamps = self.hf_dataset.select(query_indices[key])["timestamp"]
-                query_timestamps[key] = torch.stack(timestamps).tolist()
+                if self.frame_store is not None and "timestamp" in self.frame_store:
+                    query_timestamps[key] = self.frame_store["timestamp"][query_indices[key]].tolist()
+                else:
+                    timestamps = self.hf_dataset.select(query_indices[key])["timestamp"]
+                    query_timestamps[key] = torch.stack(timestamps).tolist()
             else:
                 query_timestamps[key] = [current_ts]
 
         return query_timestamps
 
     def _query_hf_dataset(self, query_indices: dict[str, list[int]]) -> dict:
-        return {
-            key: torch.stack(self.hf_dataset.select(q_idx)[key])
-            for key, q_idx in query_indices.items()
-            if key not in self.meta.video_keys
-        }
+        result = {}
+        for key, q_idx in query_indices.items():
+            if key in self.meta.video_keys:
+                continue
+            if self.frame_store is not None and key in self.frame_store:
+                result[key] = torch.from_numpy(np.asarray(self.frame_store[key][q_idx]))
+            else:
+                result[key] = torch.stack(self.hf_dataset.select(q_idx)[key])
+        return result
+
+    def _query_hf_dataset_batch(self, query_indices: dict[str, np.ndarray]) -> dict[str, torch.Tensor]:
+        """Same as `_query_hf_dataset` for (batch_size, num_deltas) query indices: a single read per key."""
+        result = {}
+        for key, q_idx in query_indices.items():
+            if key in self.meta.video_keys:
+                continue
+            if self.frame_store is not None and key in self.frame_store:
+                result[key] = torch.from_numpy(np.asarray(self.frame_store[key][q_idx]))
+            else:
+                values = torch.stack(self.hf_dataset.select(q_idx.ravel().tolist())[key])
+                result[key] = values.reshape(*q_idx.shape, *values.shape[1:])
+        return result
+
+    def _get_query_timestamps_batch(self, query_indices: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Timestamps of the (batch_size, num_deltas) query indices of the video keys."""
+        query_timestamps = {}
+        for key in self.meta.video_keys:
+            if key not in query_indices:
+                continue
+            q_idx = query_indices[key]
+            if self.frame_store is not None and "timestamp" in self.frame_store:
+                query_timestamps[key] = np.asarray(self.frame_store["timestamp"][q_idx])
+            else:
+                timestamps = torch.stack(self.hf_dataset.select(q_idx.ravel().tolist())["timestamp"])
+                query_timestamps[key] = timestamps.numpy().reshape(q_idx.shape)
+        return query_timestamps
+
+    def _query_frame(self, idx: int) -> dict:
+        """Reads a single frame, from the frame store when it holds every column of the hf_dataset."""
+        if self.frame_store is None or not all(key in self.frame_store for key in self.hf_features):
+            return self.hf_dataset[idx]
+        return {key: torch.from_numpy(np.array(self.frame_store[key][idx])) for key in self.frame_store.keys}
 
     def _query_videos(self, query_timestamps: dict[str, list[float]], ep_idx: int) -> dict[str, torch.Tensor]:
         """Note: When using data workers (e.g. DataLoader with num_workers>0), do not call this function
@@ -697,22 +860,60 @@ class LeRobotDataset(torch.utils.data.Dataset):
         """
         item = {}
         for vid_key, query_ts in query_timestamps.items():
+            if self.video_frame_cache is not None:
+                frames = self.video_frame_cache.get(vid_key, ep_idx, query_ts)
+                if frames is not None:
+                    item[vid_key] = frames.squeeze(0)
+                    continue
+
             video_path = self.root / self.meta.get_video_file_path(ep_idx, vid_key)
-            frames = decode_video_frames(video_path, query_ts, self.tolerance_s, self.video_backend)
+            frames = decode_video_frames(
+                video_path, query_ts, self.tolerance_s, self.video_backend, self.video_decoder_cache
+            )
+            if self.video_frame_cache is not None:
+                frames = self.video_frame_cache.put(vid_key, ep_idx, query_ts, frames)
             item[vid_key] = frames.squeeze(0)
 
         return item
 
-    def _add_padding_keys(self, item: dict, padding: dict[str, list[bool]]) -> dict:
-        for key, val in padding.items():
-            item[key] = torch.BoolTensor(val)
-        return item
+    def _query_videos_batch(
+        self, query_timestamps: list[dict[str, list[float]]], ep_idxs: list[int]
+    ) -> list[dict[str, torch.Tensor]]:
+        """Same as `_query_videos` for the samples of a batch: the timestamps of all samples are decoded
+        together, once per (episode, camera) video file.
+        """
+        items = [{} for _ in ep_idxs]
+        queries = []
+        query_keys = []
+        for i, (item_timestamps, ep_idx) in enumerate(zip(query_timestamps, ep_idxs, strict=True)):
+            for vid_key, query_ts in item_timestamps.items():
+                if self.video_frame_cache is not None:
+                    frames = self.video_frame_cache.get(vid_key, ep_idx, query_ts)
+                    if frames is not None:
+                        items[i][vid_key] = frames.squeeze(0)
+                        continue
+                video_path = self.root / self.meta.get_video_file_path(ep_idx, vid_key)
+                queries.append((video_path, query_ts))
+                query_keys.append((i, vid_key))
+
+        if len(queries) == 0:
+            return items
+
+        frames = decode_video_frames_batch(
+            queries, self.tolerance_s, self.video_backend, self.video_decoder_cache
+        )
+        for (i, vid_key), (_, query_ts), query_frames in zip(query_keys, queries, frames, strict=True):
+            if self.video_frame_cache is not None:
+                query_frames = self.video_frame_cache.put(vid_key, ep_idxs[i], query_ts, query_frames)
+            items[i][vid_key] = query_frames.squeeze(0)
+
+        return items
 
     def __len__(self):
         return self.num_frames
 
     def __getitem__(self, idx) -> dict:
-        item = self.hf_dataset[idx]
+        item = self._query_frame(idx)
         ep_idx = item["episode_index"].item()
 
         query_indices = None
@@ -729,6 +930,46 @@ class LeRobotDataset(torch.utils.data.Dataset):
             video_frames = self._query_videos(query_timestamps, ep_idx)
             item = {**video_frames, **item}
 
+        return self._finalize_item(item)
+
+    def __getitems__(self, idxs: list[int]) -> list[dict]:
+        """Batched version of `__getitem__`, called by the DataLoader fetcher (in each worker) with all the
+        indices of a batch when automatic batching is used. The delta windows of the whole batch are computed and
+        read at once instead of once per frame, and video frames are decoded once per (episode, camera).
+        """
+        query_timestamps = {}
+        if self.delta_indices is not None:
+            query_indices, padding = self.get_query_indices_batch(idxs)
+            query_result = self._query_hf_dataset_batch(query_indices)
+            query_timestamps = self._get_query_timestamps_batch(query_indices)
+
+        items = []
+        for i, idx in enumerate(idxs):
+            item = self._query_frame(idx)
+            if self.delta_indices is not None:
+                for key, val in padding.items():
+                    item[key] = torch.from_numpy(val[i])
+                for key, val in query_result.items():
+                    item[key] = val[i]
+            items.append(item)
+
+        if len(self.meta.video_keys) > 0:
+            items_timestamps = []
+            for i, item in enumerate(items):
+                current_ts = item["timestamp"].item()
+                items_timestamps.append(
+                    {
+                        key: query_timestamps[key][i].tolist() if key in query_timestamps else [current_ts]
+                        for key in self.meta.video_keys
+                    }
+                )
+            ep_idxs = [item["episode_index"].item() for item in items]
+            video_frames = self._query_videos_batch(items_timestamps, ep_idxs)
+            items = [{**frames, **item} for frames, item in zip(video_frames, items, strict=True)]
+
+        return [self._finalize_item(item) for item in items]
+
+    def _finalize_item(self, item: dict) -> dict:
         if self.image_transforms is not None:
             image_keys = self.meta.camera_keys
             for cam in image_keys:
@@ -751,8 +992,16 @@ class LeRobotDataset(torch.utils.data.Dataset):
             "})',\n"
         )
 
+    @property
+    def _next_episode_index(self) -> int:
+        return self.meta.total_episodes + len(self.pending_episodes)
+
+    @property
+    def _next_frame_index(self) -> int:
+        return self.meta.total_frames + sum(length for length, _, _ in self.pending_episodes.values())
+
     def create_episode_buffer(self, episode_index: int | None = None) -> dict:
-        current_ep_idx = self.meta.total_episodes if episode_index is None else episode_index
+        current_ep_idx = self._next_episode_index if episode_index is None else episode_index
         ep_buffer = {}
         # size and task are special cases that are not in self.features
         ep_buffer["size"] = 0
@@ -767,13 +1016,15 @@ class LeRobotDataset(torch.utils.data.Dataset):
         )
         return self.root / fpath
 
-    def _save_image(self, image: torch.Tensor | np.ndarray | PIL.Image.Image, fpath: Path) -> None:
+    def _save_image(
+        self, image: torch.Tensor | np.ndarray | PIL.Image.Image, fpath: Path, key: str | None = None
+    ) -> None:
         if self.image_writer is None:
             if isinstance(image, torch.Tensor):
                 image = image.cpu().numpy()
             write_image(image, fpath)
         else:
-            self.image_writer.save_image(image=image, fpath=fpath)
+            self.image_writer.save_image(image=image, fpath=fpath, key=key)
 
     def add_frame(self, frame: dict, task: str, timestamp: float | None = None) -> None:
         """
@@ -790,6 +1041,8 @@ class LeRobotDataset(torch.utils.data.Dataset):
 
         if self.episode_buffer is None:
             self.episode_buffer = self.create_episode_buffer()
+        if self.episode_stats_accumulator is None:
+            self.episode_stats_accumulator = EpisodeStatsAccumulator(self.features)
 
         # Automatically add frame_index and timestamp to episode buffer
         frame_index = self.episode_buffer["size"]
@@ -810,15 +1063,55 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 img_path = self._get_image_file_path(
                     episode_index=self.episode_buffer["episode_index"], image_key=key, frame_index=frame_index
                 )
-                if frame_index == 0:
-                    img_path.parent.mkdir(parents=True, exist_ok=True)
-                self._save_image(frame[key], img_path)
+                if self.streaming_encoding and self.features[key]["dtype"] == "video":
+                    self._stream_video_frame(key, frame[key], img_path)
+                else:
+                    if frame_index == 0:
+                        img_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._save_image(frame[key], img_path, key)
                 self.episode_buffer[key].append(str(img_path))
             else:
                 self.episode_buffer[key].append(frame[key])
 
+        # Stats are updated as frames arrive, so that `save_episode` only needs to finalize them
+        self.episode_stats_accumulator.update({**frame, "frame_index": frame_index, "timestamp": timestamp})
+
         self.episode_buffer["size"] += 1
 
+    def _stream_video_frame(
+        self, video_key: str, image: np.ndarray | PIL.Image.Image, img_path: Path
+    ) -> None:
+        encoder = self.video_encoders.get(video_key)
+        if encoder is None:
+            episode_index = self.episode_buffer["episode_index"]
+            video_path = self.root / self.meta.get_video_file_path(episode_index, video_key)
+            encoder = StreamingVideoEncoder(video_path, self.fps)
+            self.video_encoders[video_key] = encoder
+
+        if encoder.is_behind:
+            # Fall back to PNG to avoid piling up raw frames in memory
+            img_path.parent.mkdir(parents=True, exist_ok=True)
+            self._save_image(image, img_path, video_key)
+            encoder.add_spilled_frame(img_path)
+        else:
+            encoder.add_frame(image)
+
+    def _finish_video_encoders(self, episode_buffer: dict) -> None:
+        """Finalizes the streamed videos of the episode and removes the frames spilled as PNG."""
+        for key, encoder in self.video_encoders.items():
+            encoder.finish()
+            img_dir = self._get_image_file_path(
+                episode_index=episode_buffer["episode_index"], image_key=key, frame_index=0
+            ).parent
+            if img_dir.is_dir():
+                shutil.rmtree(img_dir)
+        self.video_encoders = {}
+
+    def _abort_video_encoders(self) -> None:
+        for encoder in self.video_encoders.values():
+            encoder.abort()
+        self.video_encoders = {}
+
     def save_episode(self, episode_data: dict | None = None) -> None:
         """
         This will save to disk the current episode in self.episode_buffer.
@@ -837,8 +1130,11 @@ class LeRobotDataset(torch.utils.data.Dataset):
         else:
             episode_buffer = episode_data
 
+        # Don't save episodes which can't be added to the metadata
+        self._check_failed_encodings()
+
         print("validating episode buffer")
-        validate_episode_buffer(episode_buffer, self.meta.total_episodes, self.features)
+        validate_episode_buffer(episode_buffer, self._next_episode_index, self.features)
 
         # size and task are special cases that won't be added to hf_dataset
         episode_length = episode_buffer.pop("size")
@@ -846,7 +1142,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         episode_tasks = list(set(tasks))
         episode_index = episode_buffer["episode_index"]
 
-        episode_buffer["index"] = np.arange(self.meta.total_frames, self.meta.total_frames + episode_length)
+        episode_buffer["index"] = np.arange(self._next_frame_index, self._next_frame_index + episode_length)
         episode_buffer["episode_index"] = np.full((episode_length,), episode_index)
 
         # Add new tasks to the tasks dictionary
@@ -868,21 +1164,31 @@ class LeRobotDataset(torch.utils.data.Dataset):
         print("waiting image writer")
         self._wait_image_writer()
         print("waited image writer")
+        if self.video_encoders:
+            self._finish_video_encoders(episode_buffer)
         print("saving episode table")
         self._save_episode_table(episode_buffer, episode_index)
         print("computing episode stats")
-        ep_stats = compute_episode_stats(episode_buffer, self.features)
+        if not episode_data and self.episode_stats_accumulator is not None:
+            ep_stats = self.episode_stats_accumulator.get_episode_stats()
+        else:
+            ep_stats = {}
+        # index, episode_index and task_index are only known once the episode is saved
+        remaining_data = {key: data for key, data in episode_buffer.items() if key not in ep_stats}
+        ep_stats.update(compute_episode_stats(remaining_data, self.features))
         print("computed episode stats")
 
         has_video_keys = len(self.meta.video_keys) > 0
         use_batched_encoding = self.batch_encoding_size > 1
 
+        print("saving episode")
         if has_video_keys and not use_batched_encoding:
+            # `meta.save_episode` should be executed after encoding the videos: the episode is registered by
+            # `_on_episode_videos_encoded`, later on if the videos are encoded by the video encoding pool
+            self.pending_episodes[episode_index] = (episode_length, episode_tasks, ep_stats)
             self.encode_episode_videos(episode_index)
-
-        print("saving episode")
-        # `meta.save_episode` should be executed after encoding the videos
-        self.meta.save_episode(episode_index, episode_length, episode_tasks, ep_stats)
+        else:
+            self._register_episode(episode_index, episode_length, episode_tasks, ep_stats)
 
         print("saved episode")
         # Check if we should trigger batch encoding
@@ -898,8 +1204,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 self.episodes_since_last_encoding = 0
 
         # Episode data index and timestamp checking
-        ep_data_index = get_episode_data_index(self.meta.episodes, [episode_index])
-        ep_data_index_np = {k: t.numpy() for k, t in ep_data_index.items()}
+        ep_data_index_np = {"from": np.array([0]), "to": np.array([episode_length])}
         check_timestamps_sync(
             episode_buffer["timestamp"],
             episode_buffer["episode_index"],
@@ -908,29 +1213,51 @@ class LeRobotDataset(torch.utils.data.Dataset):
             self.tolerance_s,
         )
 
-        # Verify that we have one parquet file per episode and the number of video files matches the number of encoded episodes
-        parquet_files = list(self.root.rglob("*.parquet"))
-        assert len(parquet_files) == self.num_episodes
-        video_files = list(self.root.rglob("*.mp4"))
-        assert len(video_files) == (self.num_episodes - self.episodes_since_last_encoding) * len(
-            self.meta.video_keys
-        )
+        # Verify that the files of this episode have been written. Only the current episode is checked so that
+        # saving an episode costs O(episode) and not O(dataset).
+        assert (self.root / self.meta.get_data_file_path(episode_index)).is_file()
+        if has_video_keys and self.episodes_since_last_encoding == 0 and self.video_encoding_pool is None:
+            assert all(
+                (self.root / self.meta.get_video_file_path(episode_index, key)).is_file()
+                for key in self.meta.video_keys
+            )
 
         if not episode_data:  # Reset the buffer
             self.episode_buffer = self.create_episode_buffer()
+            self.episode_stats_accumulator = None
+
+        self._check_failed_encodings()
+
+    def _register_episode(
+        self, episode_index: int, episode_length: int, episode_tasks: list[str], ep_stats: dict
+    ) -> None:
+        self.meta.save_episode(episode_index, episode_length, episode_tasks, ep_stats)
+        self._append_episode_data_index(episode_length)
 
     def _save_episode_table(self, episode_buffer: dict, episode_index: int) -> None:
-        episode_dict = {key: episode_buffer[key] for key in self.hf_features}
-        ep_dataset = datasets.Dataset.from_dict(episode_dict, features=self.hf_features, split="train")
+        hf_features = self.hf_features
+        episode_dict = {key: episode_buffer[key] for key in hf_features}
+        ep_dataset = datasets.Dataset.from_dict(episode_dict, features=hf_features, split="train")
         ep_dataset = embed_images(ep_dataset)
-        self.hf_dataset = concatenate_datasets([self.hf_dataset, ep_dataset])
-        self.hf_dataset.set_transform(hf_transform_to_torch)
         ep_data_path = self.root / self.meta.get_data_file_path(ep_index=episode_index)
         ep_data_path.parent.mkdir(parents=True, exist_ok=True)
         ep_dataset.to_parquet(ep_data_path)
+        # The episode is appended on disk only, the table will be reloaded from the parquet files on next access.
+        self.hf_dataset = None
+
+    def _append_episode_data_index(self, episode_length: int) -> None:
+        """Extends `episode_data_index` with a newly saved episode, without recomputing it from the metadata."""
+        if self.episode_data_index is None or self.episodes is not None:
+            return
+        ep_start = self.episode_data_index["to"][-1:]
+        self.episode_data_index = {
+            "from": torch.cat([self.episode_data_index["from"], ep_start]),
+            "to": torch.cat([self.episode_data_index["to"], ep_start + episode_length]),
+        }
 
     def clear_episode_buffer(self) -> None:
         episode_index = self.episode_buffer["episode_index"]
+        self._abort_video_encoders()
 
         # Clean up image files for the current episode buffer
         if self.image_writer is not None:
@@ -943,8 +1270,11 @@ class LeRobotDataset(torch.utils.data.Dataset):
 
         # Reset the buffer
         self.episode_buffer = self.create_episode_buffer()
+        self.episode_stats_accumulator = None
 
-    def start_image_writer(self, num_processes: int = 0, num_threads: int = 4) -> None:
+    def start_image_writer(
+        self, num_processes: int = 0, num_threads: int = 4, num_shared_slots: int = 30
+    ) -> None:
         if isinstance(self.image_writer, AsyncImageWriter):
             logging.warning(
                 "You are starting a new AsyncImageWriter that is replacing an already existing one in the dataset."
@@ -953,6 +1283,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         self.image_writer = AsyncImageWriter(
             num_processes=num_processes,
             num_threads=num_threads,
+            num_shared_slots=num_shared_slots,
         )
 
     def stop_image_writer(self) -> None:
@@ -969,11 +1300,79 @@ class LeRobotDataset(torch.utils.data.Dataset):
         if self.image_writer is not None:
             self.image_writer.wait_until_done()
 
+    def start_video_encoding_pool(self, num_workers: int = 2) -> None:
+        """Encodes the videos of the saved episodes in background processes instead of in `save_episode`.
+        Call `wait_for_encoding` to block until all the videos are written.
+        """
+        if self.video_encoding_pool is not None:
+            logging.warning("You are starting a new VideoEncodingPool while one is already running.")
+            self.stop_video_encoding_pool()
+        self.video_encoding_pool = VideoEncodingPool(self.fps, num_workers=num_workers)
+
+    def stop_video_encoding_pool(self) -> None:
+        """
+        Waits for the pending videos and stops the encoding processes. Like `stop_image_writer`, this needs to
+        be called before wrapping the dataset in a parallelized DataLoader.
+        """
+        if self.video_encoding_pool is not None:
+            try:
+                self.wait_for_encoding()
+            finally:
+                self.video_encoding_pool.shutdown()
+                self.video_encoding_pool = None
+
+    def wait_for_encoding(self) -> None:
+        """Blocks until the videos submitted to the encoding pool are written, and updates the metadata."""
+        if self.video_encoding_pool is not None:
+            self._on_encoding_jobs_done(*self.video_encoding_pool.wait())
+        self._check_failed_encodings()
+
+    def retry_failed_encodings(self) -> None:
+        """Encodes again the videos of the episodes whose encoding failed (their frames are kept on disk), e.g.
+        after freeing disk space. Blocks until the videos are written, and adds these episodes and the following
+        ones to the metadata.
+        """
+        failed_episodes = sorted(self.failed_episodes)
+        self.failed_episodes = {}
+        for ep_idx in failed_episodes:
+            logging.info(f"Encoding the videos of episode {ep_idx} again")
+            self.encode_episode_videos(ep_idx)
+        self.wait_for_encoding()
+
+    def _on_encoding_jobs_done(self, encoded: list[int], failed: dict[int, BaseException]) -> None:
+        for ep_idx in encoded:
+            self._on_episode_videos_encoded(ep_idx)
+        self.failed_episodes.update(failed)
+
+    def _check_failed_encodings(self) -> None:
+        """Raises as long as the video encoding of an episode has failed, see `retry_failed_encodings`."""
+        if self.failed_episodes:
+            first_failed = min(self.failed_episodes)
+            raise RuntimeError(
+                f"Failed to encode the videos of episodes {sorted(self.failed_episodes)}. The episodes from "
+                f"episode {first_failed} on are not added to the dataset metadata until their videos are "
+                "encoded with `retry_failed_encodings`."
+            ) from self.failed_episodes[first_failed]
+
+    def _on_episode_videos_encoded(self, episode_index: int) -> None:
+        if episode_index in self.pending_episodes:
+            self.encoded_episodes.add(episode_index)
+            # Episodes are registered in order, so that the metadata only lists episodes with all their videos
+            while self.meta.total_episodes in self.encoded_episodes:
+                ep_idx = self.meta.total_episodes
+                self.encoded_episodes.remove(ep_idx)
+                self._register_episode(ep_idx, *self.pending_episodes.pop(ep_idx))
+
+        # Update video info (only needed when first episode is encoded since it reads from episode 0)
+        if len(self.meta.video_keys) > 0 and episode_index == 0:
+            self.meta.update_video_info()
+            write_info(self.meta.info, self.meta.root)  # ensure video info always written properly
+
     def encode_episode_videos(self, episode_index: int) -> None:
         """
         Use ffmpeg to convert frames stored as png into mp4 videos.
-        Note: `encode_video_frames` is a blocking call. Making it asynchronous shouldn't speedup encoding,
-        since video encoding with ffmpeg is already using multithreading.
+        Note: `encode_video_frames` is a blocking call, unless a video encoding pool has been started with
+        `start_video_encoding_pool`, in which case the cameras are encoded in parallel in background processes.
 
         This method handles video encoding steps:
         - Video encoding via ffmpeg
@@ -983,6 +1382,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         Args:
             episode_index (int): Index of the episode to encode.
         """
+        jobs = []
         for key in self.meta.video_keys:
             video_path = self.root / self.meta.get_video_file_path(episode_index, key)
             if video_path.is_file():
@@ -991,13 +1391,17 @@ class LeRobotDataset(torch.utils.data.Dataset):
             img_dir = self._get_image_file_path(
                 episode_index=episode_index, image_key=key, frame_index=0
             ).parent
+            jobs.append((img_dir, video_path))
+
+        if self.video_encoding_pool is not None and len(jobs) > 0:
+            self.video_encoding_pool.submit(episode_index, jobs)
+            self._on_encoding_jobs_done(*self.video_encoding_pool.pop_finished())
+            return
+
+        for img_dir, video_path in jobs:
             encode_video_frames(img_dir, video_path, self.fps, overwrite=True)
             shutil.rmtree(img_dir)
-
-        # Update video info (only needed when first episode is encoded since it reads from episode 0)
-        if len(self.meta.video_keys) > 0 and episode_index == 0:
-            self.meta.update_video_info()
-            write_info(self.meta.info, self.meta.root)  # ensure video info always written properly
+        self._on_episode_videos_encoded(episode_index)
 
     def batch_encode_videos(self, start_episode: int = 0, end_episode: int | None = None) -> None:
         """
@@ -1031,8 +1435,11 @@ class LeRobotDataset(torch.utils.data.Dataset):
         tolerance_s: float = 1e-4,
         image_writer_processes: int = 0,
         image_writer_threads: int = 0,
+        image_writer_shared_slots: int = 30,
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
+        streaming_encoding: bool = False,
+        video_encoding_workers: int = 0,
     ) -> "LeRobotDataset":
         """Create a LeRobot Dataset from scratch in order to record data."""
         obj = cls.__new__(cls)
@@ -1051,20 +1458,33 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj.image_writer = None
         obj.batch_encoding_size = batch_encoding_size
         obj.episodes_since_last_encoding = 0
+        obj.streaming_encoding = streaming_encoding
+        obj.video_encoders = {}
+        obj.video_encoding_pool = None
+        obj.pending_episodes = {}
+        obj.encoded_episodes = set()
+        obj.failed_episodes = {}
+        obj.episode_stats_accumulator = None
 
         if image_writer_processes or image_writer_threads:
-            obj.start_image_writer(image_writer_processes, image_writer_threads)
+            obj.start_image_writer(image_writer_processes, image_writer_threads, image_writer_shared_slots)
+
+        if video_encoding_workers > 0 and use_videos:
+            obj.start_video_encoding_pool(video_encoding_workers)
 
         # TODO(aliberts, rcadene, alexander-soare): Merge this with OnlineBuffer/DataBuffer
         obj.episode_buffer = obj.create_episode_buffer()
 
         obj.episodes = None
-        obj.hf_dataset = obj.create_hf_dataset()
+        obj.hf_dataset = None
         obj.image_transforms = None
         obj.delta_timestamps = None
         obj.delta_indices = None
         obj.episode_data_index = None
+        obj.frame_store = None
         obj.video_backend = video_backend if video_backend is not None else get_safe_default_codec()
+        obj.video_decoder_cache = None
+        obj.video_frame_cache = None
         return obj
 
 
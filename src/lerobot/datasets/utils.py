@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import contextlib
+import hashlib
 import importlib.resources
 import json
 import logging
@@ -180,6 +181,16 @@ def load_info(local_dir: Path) -> dict:
     return info
 
 
+def get_files_fingerprint(root: Path, fpaths: list[str | Path]) -> str:
+    """Fingerprint of a set of files from their paths relative to `root`, sizes and modification times, so that
+    the caches derived from these files are rebuilt when they are downloaded or written again."""
+    digest = hashlib.sha256()
+    for fpath in fpaths:
+        stat = (Path(root) / fpath).stat()
+        digest.update(f"{fpath}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
 def write_stats(stats: dict, local_dir: Path):
     serialized_stats = serialize_dict(stats)
     write_json(serialized_stats, local_dir / STATS_PATH)
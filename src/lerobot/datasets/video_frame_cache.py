@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""An on-disk cache of decoded video frames, to skip video decoding after the first training epoch.
+
+For each video key, the frames of all the episodes of the dataset are stored as uint8 (c, h, w) tiles in one
+numpy memmap file, along with a memmap of flags marking the frames which have already been decoded. The frames are
+optionally downscaled (e.g. to the input resolution of the policy) before being stored. The cache is filled
+lazily when frames are first decoded, or ahead of training with `lerobot.scripts.build_video_frame_cache`.
+
+The cache lives in 'root/cache/video_frames/<cache_key>', where the key is a hash of everything that defines the
+decoded frames: the codec settings of the videos in `info.json`, the fps, the number of episodes and frames, the
+resolution of the cache, and a fingerprint of the video files (the revision of the dataset, and the paths, sizes
+and modification times of the files). Any change to those, like a dataset downloaded or encoded again, leads to a
+new, empty cache.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from itertools import accumulate
+from pathlib import Path
+
+import numpy as np
+import torch
+import torch.nn.functional as F  # noqa: N812
+
+from lerobot.datasets.utils import load_json, write_json
+
+VIDEO_FRAME_CACHE_DIR = "cache/video_frames"
+VIDEO_FRAME_CACHE_SPEC = "spec.json"
+
+
+def get_video_frame_cache_key(
+    info: dict, resolution: tuple[int, int] | None, fingerprint: str | None = None
+) -> str:
+    video_infos = {
+        key: ft.get("info") for key, ft in sorted(info["features"].items()) if ft["dtype"] == "video"
+    }
+    key_dict = {
+        "fps": info["fps"],
+        "total_episodes": info["total_episodes"],
+        "total_frames": info["total_frames"],
+        "video_path": info["video_path"],
+        "videos": video_infos,
+        "resolution": list(resolution) if resolution is not None else None,
+        "fingerprint": fingerprint,
+    }
+    return hashlib.sha1(json.dumps(key_dict, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class VideoFrameCache:
+    """Memory-mapped uint8 frames of the videos of a dataset, indexed by episode and timestamp.
+
+    Args:
+        root (str | Path): Root directory of the dataset.
+        info (dict): The `info.json` content of the dataset.
+        episode_lengths (dict[int, int]): Length of every episode of the dataset (not only the selected ones),
+            used to lay out the frames of each episode contiguously.
+        resolution (tuple[int, int] | None, optional): (height, width) to which the frames are resized before
+            being cached. Defaults to None, which keeps the resolution of the videos.
+        max_size_bytes (int | None, optional): Raises an error if the cache would take more space on disk.
+            Defaults to None.
+        fingerprint (str | None, optional): Identifies the content of the videos, so that the frames of
+            previous videos are never read back. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        info: dict,
+        episode_lengths: dict[int, int],
+        resolution: tuple[int, int] | None = None,
+        max_size_bytes: int | None = None,
+        fingerprint: str | None = None,
+    ):
+        self.fps = info["fps"]
+        self.resolution = tuple(resolution) if resolution is not None else None
+        self.cache_key = get_video_frame_cache_key(info, self.resolution, fingerprint)
+        self.cache_dir = Path(root) / VIDEO_FRAME_CACHE_DIR / self.cache_key
+
+        ep_indices = sorted(episode_lengths)
+        offsets = [0, *accumulate(episode_lengths[ep_idx] for ep_idx in ep_indices)]
+        self.episode_offsets = dict(zip(ep_indices, offsets[:-1], strict=True))
+        self.episode_lengths = episode_lengths
+        self.num_frames = offsets[-1]
+
+        self.shapes = {}
+        for key, ft in info["features"].items():
+            if ft["dtype"] != "video":
+                continue
+            if ft["names"][2] in ["channel", "channels"]:
+                h, w, c = ft["shape"]
+            else:
+                c, h, w = ft["shape"]
+            if self.resolution is not None:
+                h, w = self.resolution
+            self.shapes[key] = (int(c), int(h), int(w))
+
+        if max_size_bytes is not None and self.size_bytes > max_size_bytes:
+            raise ValueError(
+                f"The video frame cache requires {self.size_bytes} bytes, which exceeds {max_size_bytes=}. "
+                "Consider lowering its resolution."
+            )
+
+        self._frames = {}
+        self._filled = {}
+        if not (self.cache_dir / VIDEO_FRAME_CACHE_SPEC).is_file():
+            self._create()
+
+    @property
+    def video_keys(self) -> list[str]:
+        return list(self.shapes)
+
+    @property
+    def size_bytes(self) -> int:
+        """Size of the cache on disk once it is full."""
+        return sum(self.num_frames * int(np.prod(shape)) for shape in self.shapes.values())
+
+    def _create(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        stats = os.statvfs(self.cache_dir)
+        available_space = stats.f_bavail * stats.f_frsize
+        if self.size_bytes >= available_space * 0.8:
+            raise RuntimeError(
+                f"The video frame cache would take up {self.size_bytes} of {available_space} bytes available."
+            )
+
+        for key, shape in self.shapes.items():
+            # Files are created sparse: disk space is only used as frames are written.
+            np.memmap(
+                self.cache_dir / f"{key}.frames", dtype=np.uint8, mode="w+", shape=(self.num_frames, *shape)
+            )
+            np.memmap(self.cache_dir / f"{key}.filled", dtype=np.bool_, mode="w+", shape=(self.num_frames,))
+
+        spec = {
+            "num_frames": self.num_frames,
+            "shapes": {key: list(shape) for key, shape in self.shapes.items()},
+            "resolution": list(self.resolution) if self.resolution is not None else None,
+        }
+        write_json(spec, self.cache_dir / VIDEO_FRAME_CACHE_SPEC)
+        logging.info(f"Created video frame cache of {self.size_bytes} bytes in {self.cache_dir}")
+
+    def _open(self, key: str) -> tuple[np.memmap, np.memmap]:
+        # Memmaps are opened lazily, so that each DataLoader worker opens its own.
+        if key not in self._frames:
+            spec = load_json(self.cache_dir / VIDEO_FRAME_CACHE_SPEC)
+            shape = (spec["num_frames"], *spec["shapes"][key])
+            self._frames[key] = np.memmap(
+                self.cache_dir / f"{key}.frames", dtype=np.uint8, mode="r+", shape=shape
+            )
+            self._filled[key] = np.memmap(
+                self.cache_dir / f"{key}.filled", dtype=np.bool_, mode="r+", shape=(spec["num_frames"],)
+            )
+        return self._frames[key], self._filled[key]
+
+    def get_positions(self, ep_idx: int, timestamps: list[float]) -> np.ndarray:
+        frame_indices = np.round(np.asarray(timestamps) * self.fps).astype(np.int64)
+        frame_indices = np.clip(frame_indices, 0, self.episode_lengths[ep_idx] - 1)
+        return self.episode_offsets[ep_idx] + frame_indices
+
+    def get(self, key: str, ep_idx: int, timestamps: list[float]) -> torch.Tensor | None:
+        """Returns the cached frames as float32 in [0,1] (channel first), or None if any of them is missing."""
+        frames, filled = self._open(key)
+        positions = self.get_positions(ep_idx, timestamps)
+        if not filled[positions].all():
+            return None
+        return torch.from_numpy(np.asarray(frames[positions])).type(torch.float32) / 255
+
+    def put(
+        self, key: str, ep_idx: int, timestamps: list[float], decoded_frames: torch.Tensor
+    ) -> torch.Tensor:
+        """Stores decoded float32 frames in [0,1] and returns them as they will be read from the cache, i.e.
+        resized and quantized to uint8.
+        """
+        if self.resolution is not None and tuple(decoded_frames.shape[-2:]) != self.resolution:
+            decoded_frames = F.interpolate(
+                decoded_frames, size=self.resolution, mode="bilinear", antialias=True, align_corners=False
+            )
+        frames_uint8 = (decoded_frames.clamp(0, 1) * 255).round().type(torch.uint8)
+
+        frames, filled = self._open(key)
+        positions = self.get_positions(ep_idx, timestamps)
+        frames[positions] = frames_uint8.numpy()
+        filled[positions] = True
+        return frames_uint8.type(torch.float32) / 255
+
+    def stats(self) -> dict[str, int]:
+        num_filled = {key: int(self._open(key)[1].sum()) for key in self.video_keys}
+        return {
+            "num_frames": self.num_frames * len(self.video_keys),
+            "num_filled_frames": sum(num_filled.values()),
+            "size_bytes": self.size_bytes,
+            "filled_bytes": sum(num_filled[key] * int(np.prod(self.shapes[key])) for key in self.video_keys),
+        }
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_frames"] = {}
+        state["_filled"] = {}
+        return state
@@ -16,19 +16,29 @@
 import glob
 import importlib
 import logging
+import multiprocessing
+import os
+import queue
 import shutil
+import threading
+import time
 import warnings
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, ClassVar
 
 import av
+import numpy as np
 import pyarrow as pa
 import torch
 import torchvision
 from datasets.features.features import register_feature
 from PIL import Image
 
+from lerobot.datasets.image_writer import image_array_to_pil_image
+
 
 def get_safe_default_codec():
     if importlib.util.find_spec("torchcodec"):
@@ -40,11 +50,101 @@ def get_safe_default_codec():
         return "pyav"
 
 
+def open_video_decoder(video_path: Path | str, backend: str, device: str = "cpu") -> Any:
+    """Opens a decoder for the given backend: a torchcodec `VideoDecoder` or a torchvision `VideoReader`."""
+    if backend == "torchcodec":
+        if importlib.util.find_spec("torchcodec"):
+            from torchcodec.decoders import VideoDecoder
+        else:
+            raise ImportError("torchcodec is required but not available.")
+        return VideoDecoder(str(video_path), device=device, seek_mode="approximate")
+    elif backend in ["pyav", "video_reader"]:
+        torchvision.set_video_backend(backend)
+        return torchvision.io.VideoReader(str(video_path), "video")
+    else:
+        raise ValueError(f"Unsupported video backend: {backend}")
+
+
+def close_video_decoder(decoder: Any, backend: str) -> None:
+    if backend == "pyav":
+        decoder.container.close()
+
+
+class VideoDecoderCache:
+    """Bounded LRU pool of open video decoders, keyed by (video_path, backend).
+
+    Opening a decoder parses the container headers of the video, which is done for every camera of every sample
+    otherwise. Keeping the decoders of the recently accessed videos open is especially efficient with
+    `EpisodeAwareSampler`, or any sampling that queries the same episodes repeatedly.
+
+    The pool is meant to be used inside a single process: decoders are never shared between DataLoader workers.
+    They are dropped when the cache is pickled and the cache is emptied when it is accessed from another process
+    than the one which filled it (e.g. after a fork).
+    """
+
+    def __init__(self, max_size: int = 16):
+        if max_size <= 0:
+            raise ValueError(f"max_size must be greater than zero, but is {max_size}.")
+        self.max_size = max_size
+        self._decoders = OrderedDict()
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, video_path: Path | str, backend: str) -> Any:
+        if self._pid != os.getpid():
+            # Decoders opened in the parent process can't be used safely in a child process.
+            self._decoders = OrderedDict()
+            self._pid = os.getpid()
+            self.hits = self.misses = self.evictions = 0
+
+        key = (str(video_path), backend)
+        if key in self._decoders:
+            self.hits += 1
+            self._decoders.move_to_end(key)
+            return self._decoders[key]
+
+        self.misses += 1
+        decoder = open_video_decoder(video_path, backend)
+        self._decoders[key] = decoder
+        if len(self._decoders) > self.max_size:
+            (_, evicted_backend), evicted = self._decoders.popitem(last=False)
+            close_video_decoder(evicted, evicted_backend)
+            self.evictions += 1
+        return decoder
+
+    def clear(self) -> None:
+        for (_, backend), decoder in self._decoders.items():
+            close_video_decoder(decoder, backend)
+        self._decoders = OrderedDict()
+
+    def stats(self) -> dict[str, int | float]:
+        num_queries = self.hits + self.misses
+        return {
+            "size": len(self._decoders),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / num_queries if num_queries > 0 else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._decoders)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_decoders"] = OrderedDict()
+        return state
+
+
 def decode_video_frames(
     video_path: Path | str,
     timestamps: list[float],
     tolerance_s: float,
     backend: str | None = None,
+    decoder_cache: VideoDecoderCache | None = None,
 ) -> torch.Tensor:
     """
     Decodes video frames using the specified backend.
@@ -54,6 +154,8 @@ def decode_video_frames(
         timestamps (list[float]): List of timestamps to extract frames.
         tolerance_s (float): Allowed deviation in seconds for frame retrieval.
         backend (str, optional): Backend to use for decoding. Defaults to "torchcodec" when available in the platform; otherwise, defaults to "pyav"..
+        decoder_cache (VideoDecoderCache | None, optional): Pool of open decoders to reuse instead of opening
+            the video file on each call. Defaults to None.
 
     Returns:
         torch.Tensor: Decoded frames.
@@ -62,20 +164,84 @@ def decode_video_frames(
     """
     if backend is None:
         backend = get_safe_default_codec()
+    decoder = decoder_cache.get(video_path, backend) if decoder_cache is not None else None
     if backend == "torchcodec":
-        return decode_video_frames_torchcodec(video_path, timestamps, tolerance_s)
+        return decode_video_frames_torchcodec(video_path, timestamps, tolerance_s, decoder=decoder)
     elif backend in ["pyav", "video_reader"]:
-        return decode_video_frames_torchvision(video_path, timestamps, tolerance_s, backend)
+        return decode_video_frames_torchvision(video_path, timestamps, tolerance_s, backend, reader=decoder)
     else:
         raise ValueError(f"Unsupported video backend: {backend}")
 
 
+def decode_video_frames_batch(
+    queries: list[tuple[Path | str, list[float]]],
+    tolerance_s: float,
+    backend: str | None = None,
+    decoder_cache: VideoDecoderCache | None = None,
+    max_gap_s: float = 1.0,
+) -> list[torch.Tensor]:
+    """Decodes the frames of several (video_path, timestamps) queries at once.
+
+    The queries targeting the same video (e.g. samples of a batch coming from the same episode and camera) are
+    merged: their timestamps are deduplicated and sorted, so that each video is opened once and each of its
+    groups of pictures is decoded once, instead of once per query. The decoded frames are then scattered back to
+    their queries.
+
+    Args:
+        queries (list[tuple[Path | str, list[float]]]): List of (video_path, timestamps) to decode.
+        tolerance_s (float): Allowed deviation in seconds for frame retrieval.
+        backend (str | None, optional): Backend to use for decoding. Defaults to None.
+        decoder_cache (VideoDecoderCache | None, optional): Pool of open decoders. Defaults to None.
+        max_gap_s (float, optional): Torchvision backends decode every frame between the first and the last
+            requested timestamps, so sorted timestamps of a video are split where they are more than
+            `max_gap_s` apart and each run is decoded separately. Torchcodec seeks by itself and always decodes
+            all the timestamps of a video in one call. Defaults to 1.0.
+
+    Returns:
+        list[torch.Tensor]: The decoded frames of each query, in the order of `queries`.
+    """
+    if backend is None:
+        backend = get_safe_default_codec()
+
+    queries_per_video = defaultdict(list)
+    for query_idx, (video_path, _) in enumerate(queries):
+        queries_per_video[str(video_path)].append(query_idx)
+
+    results = [None] * len(queries)
+    for video_path, query_idxs in queries_per_video.items():
+        all_ts = np.concatenate([np.asarray(queries[i][1], dtype=np.float64) for i in query_idxs])
+        unique_ts, inverse = np.unique(all_ts, return_inverse=True)
+
+        if backend == "torchcodec":
+            runs = [unique_ts]
+        else:
+            split_points = np.nonzero(np.diff(unique_ts) > max_gap_s)[0] + 1
+            runs = np.split(unique_ts, split_points)
+
+        frames = torch.cat(
+            [
+                decode_video_frames(video_path, run.tolist(), tolerance_s, backend, decoder_cache)
+                for run in runs
+            ]
+        )
+        frames = frames[torch.from_numpy(inverse.reshape(-1))]
+
+        start = 0
+        for i in query_idxs:
+            end = start + len(queries[i][1])
+            results[i] = frames[start:end]
+            start = end
+
+    return results
+
+
 def decode_video_frames_torchvision(
     video_path: Path | str,
     timestamps: list[float],
     tolerance_s: float,
     backend: str = "pyav",
     log_loaded_timestamps: bool = False,
+    reader: torchvision.io.VideoReader | None = None,
 ) -> torch.Tensor:
     """Loads frames associated to the requested timestamps of a video
 
@@ -95,6 +261,8 @@ def decode_video_frames_torchvision(
     that key frame. As a consequence, to access a requested frame, we need to load the preceding key frame,
     and all subsequent frames until reaching the requested frame. The number of key frames in a video
     can be adjusted during encoding to take into account decoding time and video size in bytes.
+
+    When an already opened `reader` is provided (e.g. by a `VideoDecoderCache`), it is reused and left open.
     """
     video_path = str(video_path)
 
@@ -106,7 +274,9 @@ def decode_video_frames_torchvision(
 
     # set a video stream reader
     # TODO(rcadene): also load audio stream at the same time
-    reader = torchvision.io.VideoReader(video_path, "video")
+    owns_reader = reader is None
+    if owns_reader:
+        reader = open_video_decoder(video_path, backend)
 
     # set the first and last requested timestamps
     # Note: previous timestamps are usually loaded, since we need to access the previous key frame
@@ -130,8 +300,8 @@ def decode_video_frames_torchvision(
         if current_ts >= last_ts:
             break
 
-    if backend == "pyav":
-        reader.container.close()
+    if owns_reader:
+        close_video_decoder(reader, backend)
 
     reader = None
 
@@ -174,6 +344,7 @@ def decode_video_frames_torchcodec(
     tolerance_s: float,
     device: str = "cpu",
     log_loaded_timestamps: bool = False,
+    decoder: Any | None = None,
 ) -> torch.Tensor:
     """Loads frames associated with the requested timestamps of a video using torchcodec.
 
@@ -184,15 +355,12 @@ def decode_video_frames_torchcodec(
     that key frame. As a consequence, to access a requested frame, we need to load the preceding key frame,
     and all subsequent frames until reaching the requested frame. The number of key frames in a video
     can be adjusted during encoding to take into account decoding time and video size in bytes.
-    """
-
-    if importlib.util.find_spec("torchcodec"):
-        from torchcodec.decoders import VideoDecoder
-    else:
-        raise ImportError("torchcodec is required but not available.")
 
+    When an already opened `decoder` is provided (e.g. by a `VideoDecoderCache`), it is reused.
+    """
     # initialize video decoder
-    decoder = VideoDecoder(video_path, device=device, seek_mode="approximate")
+    if decoder is None:
+        decoder = open_video_decoder(video_path, "torchcodec", device=device)
     loaded_frames = []
     loaded_ts = []
     # get metadata for frame information
@@ -243,6 +411,42 @@ def decode_video_frames_torchcodec(
     return closest_frames
 
 
+def get_video_encoding_settings(
+    vcodec: str,
+    pix_fmt: str,
+    g: int | None,
+    crf: int | None,
+    fast_decode: int,
+) -> tuple[str, dict[str, str]]:
+    """Checks the encoder settings and returns the pixel format and the codec options to use."""
+    # Check encoder availability
+    if vcodec not in ["h264", "hevc", "libsvtav1"]:
+        raise ValueError(f"Unsupported video codec: {vcodec}. Supported codecs are: h264, hevc, libsvtav1.")
+
+    # Encoders/pixel formats incompatibility check
+    if (vcodec == "libsvtav1" or vcodec == "hevc") and pix_fmt == "yuv444p":
+        logging.warning(
+            f"Incompatible pixel format 'yuv444p' for codec {vcodec}, auto-selecting format 'yuv420p'"
+        )
+        pix_fmt = "yuv420p"
+
+    # Define video codec options
+    video_options = {}
+
+    if g is not None:
+        video_options["g"] = str(g)
+
+    if crf is not None:
+        video_options["crf"] = str(crf)
+
+    if fast_decode:
+        key = "svtav1-params" if vcodec == "libsvtav1" else "tune"
+        value = f"fast-decode={fast_decode}" if vcodec == "libsvtav1" else "fastdecode"
+        video_options[key] = value
+
+    return pix_fmt, video_options
+
+
 def encode_video_frames(
     imgs_dir: Path | str,
     video_path: Path | str,
@@ -256,22 +460,13 @@ def encode_video_frames(
     overwrite: bool = False,
 ) -> None:
     """More info on ffmpeg arguments tuning on `benchmark/video/README.md`"""
-    # Check encoder availability
-    if vcodec not in ["h264", "hevc", "libsvtav1"]:
-        raise ValueError(f"Unsupported video codec: {vcodec}. Supported codecs are: h264, hevc, libsvtav1.")
+    pix_fmt, video_options = get_video_encoding_settings(vcodec, pix_fmt, g, crf, fast_decode)
 
     video_path = Path(video_path)
     imgs_dir = Path(imgs_dir)
 
     video_path.parent.mkdir(parents=True, exist_ok=overwrite)
 
-    # Encoders/pixel formats incompatibility check
-    if (vcodec == "libsvtav1" or vcodec == "hevc") and pix_fmt == "yuv444p":
-        logging.warning(
-            f"Incompatible pixel format 'yuv444p' for codec {vcodec}, auto-selecting format 'yuv420p'"
-        )
-        pix_fmt = "yuv420p"
-
     # Get input frames
     template = "frame_" + ("[0-9]" * 6) + ".png"
     input_list = sorted(
@@ -284,20 +479,6 @@ def encode_video_frames(
     dummy_image = Image.open(input_list[0])
     width, height = dummy_image.size
 
-    # Define video codec options
-    video_options = {}
-
-    if g is not None:
-        video_options["g"] = str(g)
-
-    if crf is not None:
-        video_options["crf"] = str(crf)
-
-    if fast_decode:
-        key = "svtav1-params" if vcodec == "libsvtav1" else "tune"
-        value = f"fast-decode={fast_decode}" if vcodec == "libsvtav1" else "fastdecode"
-        video_options[key] = value
-
     # Set logging level
     if log_level is not None:
         # "While less efficient, it is generally preferable to modify logging with Python’s logging"
@@ -331,6 +512,208 @@ def encode_video_frames(
         raise OSError(f"Video encoding did not work. File not found: {video_path}.")
 
 
+def encode_and_remove_frames(imgs_dir: Path | str, video_path: Path | str, fps: int, **kwargs) -> None:
+    """Encodes the PNG frames of `imgs_dir` and removes them. The video is written to a temporary file which is
+    only renamed to `video_path` once complete, so that a partially encoded video is never taken as done.
+    """
+    video_path = Path(video_path)
+    tmp_path = video_path.with_name(f"{video_path.stem}.partial{video_path.suffix}")
+    encode_video_frames(imgs_dir, tmp_path, fps, overwrite=True, **kwargs)
+    os.replace(tmp_path, video_path)
+    shutil.rmtree(imgs_dir)
+
+
+class VideoEncodingPool:
+    """Encodes the videos of recorded episodes in background processes, one job per camera.
+
+    Jobs are submitted per episode. The episodes whose cameras have all been encoded, and the episodes with a
+    failed job, are returned by `pop_finished` and `wait`, so that the caller can update the dataset metadata
+    from the main process.
+
+    Args:
+        fps (int): Frame rate of the videos.
+        num_workers (int, optional): Number of encoding processes. Note that each ffmpeg encoder already uses
+            several threads. Defaults to 2.
+    """
+
+    def __init__(self, fps: int, num_workers: int = 2):
+        self.fps = fps
+        self.num_workers = num_workers
+        # "spawn" avoids forking the recording process, with its cameras and motor buses
+        self.executor = ProcessPoolExecutor(
+            max_workers=num_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.pending: dict[int, list[Future]] = {}
+
+    @property
+    def num_pending(self) -> int:
+        return len(self.pending)
+
+    def submit(self, episode_index: int, jobs: list[tuple[Path, Path]]) -> None:
+        """Submits the (imgs_dir, video_path) jobs of an episode."""
+        self.pending[episode_index] = [
+            self.executor.submit(encode_and_remove_frames, imgs_dir, video_path, self.fps)
+            for imgs_dir, video_path in jobs
+        ]
+
+    def _pop(self, episode_indices: list[int]) -> tuple[list[int], dict[int, BaseException]]:
+        encoded = []
+        failed = {}
+        for ep_idx in episode_indices:
+            errors = [f.exception() for f in self.pending.pop(ep_idx) if f.exception() is not None]
+            if errors:
+                failed[ep_idx] = errors[0]
+            else:
+                encoded.append(ep_idx)
+        return encoded, failed
+
+    def pop_finished(self) -> tuple[list[int], dict[int, BaseException]]:
+        """Returns the episodes whose jobs are all done since the last call, without blocking.
+
+        Returns:
+            The episodes whose videos have all been encoded, and the error of the episodes with a failed job.
+        """
+        return self._pop(
+            [ep_idx for ep_idx, futures in self.pending.items() if all(f.done() for f in futures)]
+        )
+
+    def wait(self) -> tuple[list[int], dict[int, BaseException]]:
+        """Blocks until all submitted jobs are done, and returns the episodes done since the last call, like
+        `pop_finished`."""
+        wait([f for futures in self.pending.values() for f in futures])
+        return self._pop(sorted(self.pending))
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+class StreamingVideoEncoder:
+    """Encodes the frames of one camera into an mp4 file while an episode is being recorded.
+
+    Instead of writing every frame as a PNG and encoding them all at the end of the episode, the raw frames are
+    piped from the record loop to an encoder running in a background thread. The video is written to a
+    temporary file which is moved to `video_path` when the episode is saved with `finish()`.
+
+    If the encoder falls behind (more than `max_queue_size` frames waiting to be encoded), the next frames are
+    saved as PNG by the record loop (see `is_behind` and `add_spilled_frame`), which bounds memory usage. The
+    encoder reads them back from disk when it catches up, after waiting up to `spilled_frame_timeout_s` for
+    each of them to be written (images are written to a temporary file and renamed, see `write_image`).
+    """
+
+    def __init__(
+        self,
+        video_path: Path | str,
+        fps: int,
+        vcodec: str = "libsvtav1",
+        pix_fmt: str = "yuv420p",
+        g: int | None = 2,
+        crf: int | None = 30,
+        fast_decode: int = 0,
+        max_queue_size: int = 30,
+        spilled_frame_timeout_s: float = 10.0,
+    ):
+        self.video_path = Path(video_path)
+        self.tmp_video_path = self.video_path.with_name(f"{self.video_path.stem}.partial.mp4")
+        self.fps = fps
+        self.vcodec = vcodec
+        self.pix_fmt, self.video_options = get_video_encoding_settings(vcodec, pix_fmt, g, crf, fast_decode)
+        self.max_queue_size = max_queue_size
+        self.spilled_frame_timeout_s = spilled_frame_timeout_s
+
+        self.num_frames = 0
+        self.num_spilled_frames = 0
+        self._error = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def is_behind(self) -> bool:
+        return self._queue.qsize() >= self.max_queue_size
+
+    def add_frame(self, image: np.ndarray) -> None:
+        self._queue.put(image)
+        self.num_frames += 1
+
+    def add_spilled_frame(self, fpath: Path) -> None:
+        self._queue.put(Path(fpath))
+        self.num_frames += 1
+        self.num_spilled_frames += 1
+
+    def _wait_for_spilled_frame(self, fpath: Path) -> None:
+        deadline = time.perf_counter() + self.spilled_frame_timeout_s
+        while not fpath.is_file():
+            if time.perf_counter() > deadline:
+                raise TimeoutError(
+                    f"Spilled frame {fpath} was not written in {self.spilled_frame_timeout_s}s."
+                )
+            time.sleep(0.001)
+
+    def _encode_loop(self) -> None:
+        output = None
+        done = False
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    done = True
+                    break
+                if isinstance(item, Path):
+                    self._wait_for_spilled_frame(item)
+                    image = Image.open(item).convert("RGB")
+                elif isinstance(item, Image.Image):
+                    image = item.convert("RGB")
+                else:
+                    image = image_array_to_pil_image(item)
+
+                if output is None:
+                    self.tmp_video_path.parent.mkdir(parents=True, exist_ok=True)
+                    output = av.open(str(self.tmp_video_path), "w")
+                    output_stream = output.add_stream(self.vcodec, self.fps, options=self.video_options)
+                    output_stream.pix_fmt = self.pix_fmt
+                    output_stream.width, output_stream.height = image.size
+
+                packet = output_stream.encode(av.VideoFrame.from_image(image))
+                if packet:
+                    output.mux(packet)
+
+            if output is not None:
+                # Flush the encoder
+                packet = output_stream.encode()
+                if packet:
+                    output.mux(packet)
+        except Exception as e:
+            self._error = e
+            # Keep consuming the queue until `finish` or `abort` is called
+            while not done:
+                done = self._queue.get() is None
+        finally:
+            if output is not None:
+                output.close()
+
+    def finish(self) -> None:
+        """Encodes the remaining frames and moves the video to `video_path`."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            self.tmp_video_path.unlink(missing_ok=True)
+            raise RuntimeError(f"Streaming encoding of {self.video_path} failed.") from self._error
+        if self.num_frames == 0:
+            raise FileNotFoundError(f"No frames were streamed to {self.video_path}.")
+        if self.num_spilled_frames > 0:
+            logging.warning(
+                f"The encoder of {self.video_path} fell behind: {self.num_spilled_frames}/{self.num_frames} "
+                "frames were written as PNG."
+            )
+        self.tmp_video_path.replace(self.video_path)
+
+    def abort(self) -> None:
+        """Stops the encoder and removes the partially encoded video."""
+        self._queue.put(None)
+        self._thread.join()
+        self.tmp_video_path.unlink(missing_ok=True)
+
+
 @dataclass
 class VideoFrame:
     # TODO(rcadene, lhoestq): move to Hugging Face `datasets` repo
@@ -489,8 +872,12 @@ class VideoEncodingManager:
             )
             self.dataset.batch_encode_videos(start_ep, end_ep)
 
+        # Wait for the videos being encoded in the background, before looking for remaining images
+        self.dataset.wait_for_encoding()
+
         # Clean up episode images if recording was interrupted
         if exc_type is not None:
+            self.dataset._abort_video_encoders()
             interrupted_episode_index = self.dataset.num_episodes
             for key in self.dataset.meta.video_keys:
                 img_dir = self.dataset._get_image_file_path(
@@ -335,6 +335,7 @@ class FeetechMotorsBus(MotorsBus):
     def _broadcast_ping(self) -> tuple[dict[int, int], int]:
         import scservo_sdk as scs
 
+        self._flush_pipelined_read()
         data_list = {}
 
         status_length = 6
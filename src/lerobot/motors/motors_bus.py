@@ -28,6 +28,7 @@ from functools import cached_property
 from pprint import pformat
 from typing import Protocol, TypeAlias
 
+import numpy as np
 import serial
 from deepdiff import DeepDiff
 from tqdm import tqdm
@@ -83,6 +84,11 @@ class MotorNormMode(str, Enum):
     DEGREES = "degrees"
 
 
+# codes of CalibrationArrays.norm_mode
+_RANGE_0_100 = list(MotorNormMode).index(MotorNormMode.RANGE_0_100)
+_RANGE_M100_100 = list(MotorNormMode).index(MotorNormMode.RANGE_M100_100)
+
+
 @dataclass
 class MotorCalibration:
     id: int
@@ -92,6 +98,44 @@ class MotorCalibration:
     range_max: int
 
 
+@dataclass
+class CalibrationArrays:
+    """The calibration of a bus compiled into arrays indexed by motor ID, for vectorized normalization."""
+
+    range_min: np.ndarray
+    range_max: np.ndarray
+    inverted: np.ndarray  # the drive mode inverts the normalized range
+    norm_mode: np.ndarray  # index in list(MotorNormMode), -1 for motors without calibration
+    max_res: np.ndarray  # resolution - 1
+
+    @classmethod
+    def from_calibration(
+        cls,
+        calibration: dict[str, MotorCalibration],
+        motors: dict[str, "Motor"],
+        model_resolution_table: dict[str, int],
+        apply_drive_mode: bool,
+    ) -> "CalibrationArrays":
+        size = max((m.id for m in motors.values()), default=0) + 1
+        arrays = cls(
+            range_min=np.zeros(size),
+            range_max=np.zeros(size),
+            inverted=np.zeros(size, dtype=bool),
+            norm_mode=np.full(size, -1, dtype=np.int8),
+            max_res=np.ones(size),
+        )
+        norm_modes = list(MotorNormMode)
+        for motor, m in motors.items():
+            if motor not in calibration:
+                continue
+            arrays.range_min[m.id] = calibration[motor].range_min
+            arrays.range_max[m.id] = calibration[motor].range_max
+            arrays.inverted[m.id] = bool(apply_drive_mode and calibration[motor].drive_mode)
+            arrays.norm_mode[m.id] = norm_modes.index(m.norm_mode)
+            arrays.max_res[m.id] = model_resolution_table[m.model] - 1
+        return arrays
+
+
 @dataclass
 class Motor:
     id: int
@@ -277,6 +321,12 @@ class MotorsBus(abc.ABC):
         self._comm_success: int
         self._no_error: int
 
+        # sync read/write groups by (address, length, motor ids), their params are only built once
+        self._sync_readers: dict[tuple[int, int, tuple[int, ...]], GroupSyncRead] = {}
+        self._sync_writers: dict[tuple[int, int, tuple[int, ...]], GroupSyncWrite] = {}
+        # group of a pipelined sync read whose instruction was sent and whose response is not received yet
+        self._pending_sync_reader: GroupSyncRead | None = None
+
         self._id_to_model_dict = {m.id: m.model for m in self.motors.values()}
         self._id_to_name_dict = {m.id: motor for motor, m in self.motors.items()}
         self._model_nb_to_model_dict = {v: k for k, v in self.model_number_table.items()}
@@ -294,6 +344,26 @@ class MotorsBus(abc.ABC):
             ")',\n"
         )
 
+    @property
+    def calibration(self) -> dict[str, MotorCalibration]:
+        """dict[str, MotorCalibration]: The cached calibration.
+
+        Assigning it compiles it into :pyattr:`calibration_arrays`, so it must be assigned again after being
+        modified in place.
+        """
+        return self._calibration
+
+    @calibration.setter
+    def calibration(self, calibration: dict[str, MotorCalibration]) -> None:
+        self._calibration = calibration
+        self.calibration_arrays = (
+            CalibrationArrays.from_calibration(
+                calibration, self.motors, self.model_resolution_table, self.apply_drive_mode
+            )
+            if calibration
+            else None
+        )
+
     @cached_property
     def _has_different_ctrl_tables(self) -> bool:
         if len(self.models) < 2:
@@ -469,8 +539,10 @@ class MotorsBus(abc.ABC):
         if disable_torque:
             self.port_handler.clearPort()
             self.port_handler.is_using = False
+            self._pending_sync_reader = None
             self.disable_torque(num_retry=5)
 
+        self._flush_pipelined_read()
         self.port_handler.closePort()
         logger.debug(f"{self.__class__.__name__} disconnected.")
 
@@ -610,6 +682,7 @@ class MotorsBus(abc.ABC):
                 back to :pyattr:`default_timeout`.
         """
         timeout_ms = timeout_ms if timeout_ms is not None else self.default_timeout
+        self._flush_pipelined_read()
         self.port_handler.setPacketTimeoutMillis(timeout_ms)
 
     def get_baudrate(self) -> int:
@@ -632,6 +705,7 @@ class MotorsBus(abc.ABC):
         present_bus_baudrate = self.port_handler.getBaudRate()
         if present_bus_baudrate != baudrate:
             logger.info(f"Setting bus baud rate to {baudrate}. Previously {present_bus_baudrate}.")
+            self._flush_pipelined_read()
             self.port_handler.setBaudRate(baudrate)
 
             if self.port_handler.getBaudRate() != baudrate:
@@ -773,64 +847,75 @@ class MotorsBus(abc.ABC):
 
         return mins, maxes
 
-    def _normalize(self, ids_values: dict[int, int]) -> dict[int, float]:
+    def _get_calibration_arrays(self, ids: np.ndarray) -> CalibrationArrays:
         if not self.calibration:
             raise RuntimeError(f"{self} has no calibration registered.")
 
-        normalized_values = {}
-        for id_, val in ids_values.items():
-            motor = self._id_to_name(id_)
-            min_ = self.calibration[motor].range_min
-            max_ = self.calibration[motor].range_max
-            drive_mode = self.apply_drive_mode and self.calibration[motor].drive_mode
-            if max_ == min_:
-                raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
-
-            bounded_val = min(max_, max(min_, val))
-            if self.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
-                norm = (((bounded_val - min_) / (max_ - min_)) * 200) - 100
-                normalized_values[id_] = -norm if drive_mode else norm
-            elif self.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
-                norm = ((bounded_val - min_) / (max_ - min_)) * 100
-                normalized_values[id_] = 100 - norm if drive_mode else norm
-            elif self.motors[motor].norm_mode is MotorNormMode.DEGREES:
-                mid = (min_ + max_) / 2
-                max_res = self.model_resolution_table[self._id_to_model(id_)] - 1
-                normalized_values[id_] = (val - mid) * 360 / max_res
-            else:
-                raise NotImplementedError
-
-        return normalized_values
+        arrays = self.calibration_arrays
+        missing = arrays.norm_mode[ids] < 0
+        if missing.any():
+            raise KeyError(self._id_to_name(int(ids[missing][0])))
+        invalid = arrays.range_min[ids] == arrays.range_max[ids]
+        if invalid.any():
+            motor = self._id_to_name(int(ids[invalid][0]))
+            raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
+        return arrays
+
+    def _normalize_array(self, ids: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Vectorized :pymeth:`_normalize`: raw `values` of the motors `ids` to their normalized range."""
+        arrays = self._get_calibration_arrays(ids)
+        min_ = arrays.range_min[ids]
+        max_ = arrays.range_max[ids]
+        inverted = arrays.inverted[ids]
+        norm_mode = arrays.norm_mode[ids]
+        values = np.asarray(values, dtype=np.float64)
+
+        fraction = (np.clip(values, min_, max_) - min_) / (max_ - min_)
+        norm_m100_100 = fraction * 200 - 100
+        norm_0_100 = fraction * 100
+        degrees = (values - (min_ + max_) / 2) * 360 / arrays.max_res[ids]
+        return np.select(
+            [norm_mode == _RANGE_M100_100, norm_mode == _RANGE_0_100],
+            [
+                np.where(inverted, -norm_m100_100, norm_m100_100),
+                np.where(inverted, 100 - norm_0_100, norm_0_100),
+            ],
+            degrees,
+        )
 
-    def _unnormalize(self, ids_values: dict[int, float]) -> dict[int, int]:
-        if not self.calibration:
-            raise RuntimeError(f"{self} has no calibration registered.")
+    def _unnormalize_array(self, ids: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Vectorized :pymeth:`_unnormalize`: `values` of the motors `ids` from their normalized range."""
+        arrays = self._get_calibration_arrays(ids)
+        min_ = arrays.range_min[ids]
+        max_ = arrays.range_max[ids]
+        inverted = arrays.inverted[ids]
+        norm_mode = arrays.norm_mode[ids]
+        values = np.asarray(values, dtype=np.float64)
+        if not np.isfinite(values).all():
+            raise ValueError(f"Cannot unnormalize non-finite values: {values}")
+
+        m100_100 = np.clip(np.where(inverted, -values, values), -100.0, 100.0)
+        range_0_100 = np.clip(np.where(inverted, 100 - values, values), 0.0, 100.0)
+        raw = np.select(
+            [norm_mode == _RANGE_M100_100, norm_mode == _RANGE_0_100],
+            [
+                ((m100_100 + 100) / 200) * (max_ - min_) + min_,
+                (range_0_100 / 100) * (max_ - min_) + min_,
+            ],
+            (values * arrays.max_res[ids] / 360) + (min_ + max_) / 2,
+        )
+        # truncate towards zero like int()
+        return np.trunc(raw).astype(np.int64)
 
-        unnormalized_values = {}
-        for id_, val in ids_values.items():
-            motor = self._id_to_name(id_)
-            min_ = self.calibration[motor].range_min
-            max_ = self.calibration[motor].range_max
-            drive_mode = self.apply_drive_mode and self.calibration[motor].drive_mode
-            if max_ == min_:
-                raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
-
-            if self.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
-                val = -val if drive_mode else val
-                bounded_val = min(100.0, max(-100.0, val))
-                unnormalized_values[id_] = int(((bounded_val + 100) / 200) * (max_ - min_) + min_)
-            elif self.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
-                val = 100 - val if drive_mode else val
-                bounded_val = min(100.0, max(0.0, val))
-                unnormalized_values[id_] = int((bounded_val / 100) * (max_ - min_) + min_)
-            elif self.motors[motor].norm_mode is MotorNormMode.DEGREES:
-                mid = (min_ + max_) / 2
-                max_res = self.model_resolution_table[self._id_to_model(id_)] - 1
-                unnormalized_values[id_] = int((val * max_res / 360) + mid)
-            else:
-                raise NotImplementedError
+    def _normalize(self, ids_values: dict[int, int]) -> dict[int, float]:
+        ids = np.fromiter(ids_values, dtype=np.int64, count=len(ids_values))
+        values = np.fromiter(ids_values.values(), dtype=np.float64, count=len(ids_values))
+        return dict(zip(ids_values, self._normalize_array(ids, values).tolist(), strict=True))
 
-        return unnormalized_values
+    def _unnormalize(self, ids_values: dict[int, float]) -> dict[int, int]:
+        ids = np.fromiter(ids_values, dtype=np.int64, count=len(ids_values))
+        values = np.fromiter(ids_values.values(), dtype=np.float64, count=len(ids_values))
+        return dict(zip(ids_values, self._unnormalize_array(ids, values).tolist(), strict=True))
 
     @abc.abstractmethod
     def _encode_sign(self, data_name: str, ids_values: dict[int, int]) -> dict[int, int]:
@@ -880,6 +965,7 @@ class MotorsBus(abc.ABC):
             int | None: Motor model number or `None` on failure.
         """
         id_ = self._get_motor_id(motor)
+        self._flush_pipelined_read()
         for n_try in range(1 + num_retry):
             model_number, comm, error = self.packet_handler.ping(self.port_handler, id_)
             if self._is_comm_success(comm):
@@ -971,6 +1057,7 @@ class MotorsBus(abc.ABC):
         else:
             raise ValueError(length)
 
+        self._flush_pipelined_read()
         for n_try in range(1 + num_retry):
             value, comm, error = read_fn(self.port_handler, motor_id, address)
             if self._is_comm_success(comm):
@@ -1034,6 +1121,7 @@ class MotorsBus(abc.ABC):
         err_msg: str = "",
     ) -> tuple[int, int]:
         data = self._serialize_data(value, length)
+        self._flush_pipelined_read()
         for n_try in range(1 + num_retry):
             comm, error = self.packet_handler.writeTxRx(self.port_handler, motor_id, addr, length, data)
             if self._is_comm_success(comm):
@@ -1057,6 +1145,7 @@ class MotorsBus(abc.ABC):
         *,
         normalize: bool = True,
         num_retry: int = 0,
+        pipelined: bool = False,
     ) -> dict[str, Value]:
         """Read the same register from several motors at once.
 
@@ -1065,6 +1154,11 @@ class MotorsBus(abc.ABC):
             motors (str | list[str] | None, optional): Motors to query. `None` (default) reads every motor.
             normalize (bool, optional): Normalisation flag.  Defaults to `True`.
             num_retry (int, optional): Retry attempts.  Defaults to `0`.
+            pipelined (bool, optional): If `True`, the read of the next call is requested right away and its
+                response is received in the background by the serial port. The next call then returns without
+                waiting for the motors, with values as old as the time elapsed since this call (typically one
+                loop period). Use it in loops that read the same registers every iteration when latency
+                matters more than freshness. Defaults to `False`.
 
         Returns:
             dict[str, Value]: Mapping *motor name → value*.
@@ -1088,7 +1182,7 @@ class MotorsBus(abc.ABC):
 
         err_msg = f"Failed to sync read '{data_name}' on {ids=} after {num_retry + 1} tries."
         ids_values, _ = self._sync_read(
-            addr, length, ids, num_retry=num_retry, raise_on_error=True, err_msg=err_msg
+            addr, length, ids, num_retry=num_retry, raise_on_error=True, err_msg=err_msg, pipelined=pipelined
         )
 
         ids_values = self._decode_sign(data_name, ids_values)
@@ -1098,6 +1192,58 @@ class MotorsBus(abc.ABC):
 
         return {self._id_to_name(id_): value for id_, value in ids_values.items()}
 
+    def sync_read_array(
+        self,
+        data_name: str,
+        motors: str | list[str] | None = None,
+        *,
+        normalize: bool = True,
+        num_retry: int = 0,
+        pipelined: bool = False,
+    ) -> np.ndarray:
+        """Same as :pymeth:`sync_read`, returning the values as an array.
+
+        Args:
+            data_name (str): Register name.
+            motors (str | list[str] | None, optional): Motors to query. `None` (default) reads every motor.
+            normalize (bool, optional): Normalisation flag.  Defaults to `True`.
+            num_retry (int, optional): Retry attempts.  Defaults to `0`.
+            pipelined (bool, optional): See :pymeth:`sync_read`. Defaults to `False`.
+
+        Returns:
+            np.ndarray: The values in the order of *motors* (or of :pyattr:`motors`), float64 if normalized,
+                int64 otherwise.
+        """
+        if not self.is_connected:
+            raise DeviceNotConnectedError(
+                f"{self.__class__.__name__}('{self.port}') is not connected. You need to run `{self.__class__.__name__}.connect()`."
+            )
+
+        self._assert_protocol_is_compatible("sync_read")
+
+        names = self._get_motors_list(motors)
+        ids = [self.motors[motor].id for motor in names]
+        models = [self.motors[motor].model for motor in names]
+
+        if self._has_different_ctrl_tables:
+            assert_same_address(self.model_ctrl_table, models, data_name)
+
+        model = next(iter(models))
+        addr, length = get_address(self.model_ctrl_table, model, data_name)
+
+        err_msg = f"Failed to sync read '{data_name}' on {ids=} after {num_retry + 1} tries."
+        ids_values, _ = self._sync_read(
+            addr, length, ids, num_retry=num_retry, raise_on_error=True, err_msg=err_msg, pipelined=pipelined
+        )
+
+        ids_values = self._decode_sign(data_name, ids_values)
+        values = np.fromiter(ids_values.values(), dtype=np.int64, count=len(ids_values))
+
+        if normalize and data_name in self.normalized_data:
+            return self._normalize_array(np.array(ids), values)
+
+        return values
+
     def _sync_read(
         self,
         addr: int,
@@ -1107,43 +1253,61 @@ class MotorsBus(abc.ABC):
         num_retry: int = 0,
         raise_on_error: bool = True,
         err_msg: str = "",
+        pipelined: bool = False,
     ) -> tuple[dict[int, int], int]:
-        self._setup_sync_reader(motor_ids, addr, length)
-        for n_try in range(1 + num_retry):
-            comm = self.sync_reader.txRxPacket()
-            if self._is_comm_success(comm):
-                break
-            logger.debug(
-                f"Failed to sync read @{addr=} ({length=}) on {motor_ids=} ({n_try=}): "
-                + self.packet_handler.getTxRxResult(comm)
-            )
+        sync_reader = self._setup_sync_reader(motor_ids, addr, length)
+        # the response to a pipelined read of the same registers has been requested during the previous call
+        comm = self._flush_pipelined_read(expected=sync_reader if pipelined else None)
+        if comm is None or not self._is_comm_success(comm):
+            for n_try in range(1 + num_retry):
+                comm = sync_reader.txRxPacket()
+                if self._is_comm_success(comm):
+                    break
+                logger.debug(
+                    f"Failed to sync read @{addr=} ({length=}) on {motor_ids=} ({n_try=}): "
+                    + self.packet_handler.getTxRxResult(comm)
+                )
 
         if not self._is_comm_success(comm) and raise_on_error:
             raise ConnectionError(f"{err_msg} {self.packet_handler.getTxRxResult(comm)}")
 
-        values = {id_: self.sync_reader.getData(id_, addr, length) for id_ in motor_ids}
+        values = {id_: sync_reader.getData(id_, addr, length) for id_ in motor_ids}
+
+        if pipelined and self._is_comm_success(sync_reader.txPacket()):
+            self._pending_sync_reader = sync_reader
+
         return values, comm
 
-    def _setup_sync_reader(self, motor_ids: list[int], addr: int, length: int) -> None:
-        self.sync_reader.clearParam()
-        self.sync_reader.start_address = addr
-        self.sync_reader.data_length = length
-        for id_ in motor_ids:
-            self.sync_reader.addParam(id_)
-
-    # TODO(aliberts, pkooij): Implementing something like this could get even much faster read times if need be.
-    # Would have to handle the logic of checking if a packet has been sent previously though but doable.
-    # This could be at the cost of increase latency between the moment the data is produced by the motors and
-    # the moment it is used by a policy.
-    # def _async_read(self, motor_ids: list[int], address: int, length: int):
-    #     if self.sync_reader.start_address != address or self.sync_reader.data_length != length or ...:
-    #         self._setup_sync_reader(motor_ids, address, length)
-    #     else:
-    #         self.sync_reader.rxPacket()
-    #         self.sync_reader.txPacket()
-
-    #     for id_ in motor_ids:
-    #         value = self.sync_reader.getData(id_, address, length)
+    def _setup_sync_reader(self, motor_ids: list[int], addr: int, length: int) -> GroupSyncRead:
+        key = (addr, length, tuple(motor_ids))
+        sync_reader = self._sync_readers.get(key)
+        if sync_reader is None:
+            sync_reader = type(self.sync_reader)(self.port_handler, self.packet_handler, addr, length)
+            for id_ in motor_ids:
+                sync_reader.addParam(id_)
+            self._sync_readers[key] = sync_reader
+
+        self.sync_reader = sync_reader
+        return sync_reader
+
+    def _flush_pipelined_read(self, expected: GroupSyncRead | None = None) -> int | None:
+        """Receive the response to the pending pipelined sync read, if any.
+
+        The bus is half-duplex, so this must be done before any other instruction is sent.
+
+        Returns:
+            int | None: The communication result if the pending read was made with *expected*, `None`
+                otherwise (its response is then discarded).
+        """
+        pending = self._pending_sync_reader
+        if pending is None:
+            return None
+
+        self._pending_sync_reader = None
+        comm = pending.rxPacket()
+        if not self._is_comm_success(comm):
+            logger.debug(f"Failed to receive pipelined sync read: {self.packet_handler.getTxRxResult(comm)}")
+        return comm if pending is expected else None
 
     def sync_write(
         self,
@@ -1187,6 +1351,50 @@ class MotorsBus(abc.ABC):
         err_msg = f"Failed to sync write '{data_name}' with {ids_values=} after {num_retry + 1} tries."
         self._sync_write(addr, length, ids_values, num_retry=num_retry, raise_on_error=True, err_msg=err_msg)
 
+    def sync_write_array(
+        self,
+        data_name: str,
+        values: np.ndarray,
+        motors: str | list[str] | None = None,
+        *,
+        normalize: bool = True,
+        num_retry: int = 0,
+    ) -> None:
+        """Same as :pymeth:`sync_write`, with the values as an array.
+
+        Args:
+            data_name (str): Register name.
+            values (np.ndarray): The values, in the order of *motors*.
+            motors (str | list[str] | None, optional): Motors to write. `None` (default) writes every motor,
+                in the order of :pyattr:`motors`.
+            normalize (bool, optional): If `True` (default) convert values from the user range to raw units.
+            num_retry (int, optional): Retry attempts.  Defaults to `0`.
+        """
+        if not self.is_connected:
+            raise DeviceNotConnectedError(
+                f"{self.__class__.__name__}('{self.port}') is not connected. You need to run `{self.__class__.__name__}.connect()`."
+            )
+
+        names = self._get_motors_list(motors)
+        ids = [self.motors[motor].id for motor in names]
+        if len(values) != len(ids):
+            raise ValueError(f"Expected {len(ids)} values for {names}, got {len(values)}.")
+
+        models = [self.motors[motor].model for motor in names]
+        if self._has_different_ctrl_tables:
+            assert_same_address(self.model_ctrl_table, models, data_name)
+
+        model = next(iter(models))
+        addr, length = get_address(self.model_ctrl_table, model, data_name)
+
+        if normalize and data_name in self.normalized_data:
+            values = self._unnormalize_array(np.array(ids), values)
+
+        ids_values = self._encode_sign(data_name, dict(zip(ids, np.asarray(values).tolist(), strict=True)))
+
+        err_msg = f"Failed to sync write '{data_name}' with {ids_values=} after {num_retry + 1} tries."
+        self._sync_write(addr, length, ids_values, num_retry=num_retry, raise_on_error=True, err_msg=err_msg)
+
     def _sync_write(
         self,
         addr: int,
@@ -1196,9 +1404,10 @@ class MotorsBus(abc.ABC):
         raise_on_error: bool = True,
         err_msg: str = "",
     ) -> int:
-        self._setup_sync_writer(ids_values, addr, length)
+        sync_writer = self._setup_sync_writer(ids_values, addr, length)
+        self._flush_pipelined_read()
         for n_try in range(1 + num_retry):
-            comm = self.sync_writer.txPacket()
+            comm = sync_writer.txPacket()
             if self._is_comm_success(comm):
                 break
             logger.debug(
@@ -1211,10 +1420,17 @@ class MotorsBus(abc.ABC):
 
         return comm
 
-    def _setup_sync_writer(self, ids_values: dict[int, int], addr: int, length: int) -> None:
-        self.sync_writer.clearParam()
-        self.sync_writer.start_address = addr
-        self.sync_writer.data_length = length
-        for id_, value in ids_values.items():
-            data = self._serialize_data(value, length)
-            self.sync_writer.addParam(id_, data)
+    def _setup_sync_writer(self, ids_values: dict[int, int], addr: int, length: int) -> GroupSyncWrite:
+        key = (addr, length, tuple(ids_values))
+        sync_writer = self._sync_writers.get(key)
+        if sync_writer is None:
+            sync_writer = type(self.sync_writer)(self.port_handler, self.packet_handler, addr, length)
+            for id_, value in ids_values.items():
+                sync_writer.addParam(id_, self._serialize_data(value, length))
+            self._sync_writers[key] = sync_writer
+        else:
+            for id_, value in ids_values.items():
+                sync_writer.changeParam(id_, self._serialize_data(value, length))
+
+        self.sync_writer = sync_writer
+        return sync_writer
@@ -150,9 +150,19 @@ class DatasetRecordConfig:
     # Too many threads might cause unstable teleoperation fps due to main thread being blocked.
     # Not enough threads might cause low camera fps.
     num_image_writer_threads_per_camera: int = 3
+    # With subprocesses, number of frames per camera held in shared memory while waiting to be written. The
+    # record loop blocks when they are all in use: increase it, or the number of processes, if the slot
+    # occupancy logged after each episode reaches it.
+    num_image_writer_shared_slots_per_camera: int = 30
     # Number of episodes to record before batch encoding videos
     # Set to 1 for immediate encoding (default behavior), or higher for batched encoding
     video_encoding_batch_size: int = 1
+    # Encode the videos while recording each episode, instead of writing frames as PNG and encoding them when
+    # the episode is saved. Frames are only written as PNG when an encoder falls behind.
+    streaming_encoding: bool = False
+    # Number of background processes encoding the videos of the saved episodes, so that recording resumes
+    # without waiting for the encoding. Set to 0 to encode in the recording process.
+    num_video_encoding_workers: int = 0
 
     def __post_init__(self):
         if self.single_task is None:
@@ -308,13 +318,17 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
             cfg.dataset.repo_id,
             root=cfg.dataset.root,
             batch_encoding_size=cfg.dataset.video_encoding_batch_size,
+            streaming_encoding=cfg.dataset.streaming_encoding,
         )
 
         if hasattr(robot, "cameras") and len(robot.cameras) > 0:
             dataset.start_image_writer(
                 num_processes=cfg.dataset.num_image_writer_processes,
                 num_threads=cfg.dataset.num_image_writer_threads_per_camera * len(robot.cameras),
+                num_shared_slots=cfg.dataset.num_image_writer_shared_slots_per_camera,
             )
+            if cfg.dataset.num_video_encoding_workers > 0 and len(dataset.meta.video_keys) > 0:
+                dataset.start_video_encoding_pool(cfg.dataset.num_video_encoding_workers)
         sanity_check_dataset_robot_compatibility(dataset, robot, cfg.dataset.fps, dataset_features)
     else:
         # Create empty dataset or load existing saved episodes
@@ -328,7 +342,10 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
             use_videos=cfg.dataset.video,
             image_writer_processes=cfg.dataset.num_image_writer_processes,
             image_writer_threads=cfg.dataset.num_image_writer_threads_per_camera * len(robot.cameras),
+            image_writer_shared_slots=cfg.dataset.num_image_writer_shared_slots_per_camera,
             batch_encoding_size=cfg.dataset.video_encoding_batch_size,
+            streaming_encoding=cfg.dataset.streaming_encoding,
+            video_encoding_workers=cfg.dataset.num_video_encoding_workers,
         )
 
     # Load pretrained policy
@@ -383,6 +400,8 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
             print("saving episode")
             dataset.save_episode()
             print("saved episode")
+            if dataset.image_writer is not None and dataset.image_writer.rings:
+                logging.info(f"Image writer shared memory slots: {dataset.image_writer.get_metrics()}")
             recorded_episodes += 1
 
     log_say("Stop recording", cfg.play_sounds, blocking=True)
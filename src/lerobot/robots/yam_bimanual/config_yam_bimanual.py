@@ -28,3 +28,6 @@ class YamBimanualConfig(RobotConfig):
 
     # cameras
     cameras: dict[str, CameraConfig] = field(default_factory=dict)
+
+    # Drive both arms from a single control loop thread, with one state snapshot for both arms
+    use_bus_manager: bool = True
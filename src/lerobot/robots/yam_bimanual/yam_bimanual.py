@@ -27,6 +27,7 @@ from lerobot.errors import DeviceAlreadyConnectedError, DeviceNotConnectedError
 from ..robot import Robot
 from ..utils import ensure_safe_goal_position
 from .config_yam_bimanual import YamBimanualConfig
+from i2rt.robots.bus_manager import MultiArmBusManager
 from i2rt.robots.get_robot import get_yam_robot
 
 logger = logging.getLogger(__name__)
@@ -69,6 +70,9 @@ class YamBimanual(Robot):
         self.cameras = make_cameras_from_configs(config.cameras)
         self.robot_left = None
         self.robot_right = None
+        self.bus_manager = None
+        # time.time() of the control cycle the joint states of the last observation come from
+        self.last_state_timestamp = None
         self.has_connected = False
 
     @property
@@ -113,6 +117,9 @@ class YamBimanual(Robot):
 
         self.robot_left = get_yam_robot(channel=self.config.port, gripper_type=GripperType.LINEAR_4310, zero_gravity_mode=False)
         self.robot_right = get_yam_robot(channel=self.config.port_right, gripper_type=GripperType.LINEAR_4310, zero_gravity_mode=False)
+        if self.config.use_bus_manager:
+            self.bus_manager = MultiArmBusManager({"left": self.robot_left, "right": self.robot_right})
+            self.bus_manager.start()
         self.has_connected = True
 
         for cam in self.cameras.values():
@@ -139,8 +146,15 @@ class YamBimanual(Robot):
 
         # Read arm position
         start = time.perf_counter()
-        joint_pos_left = self.robot_left.get_joint_pos()
-        joint_pos_right = self.robot_right.get_joint_pos()
+        if self.bus_manager is not None:
+            # both arms from the same control cycle
+            state = self.bus_manager.read_state()
+            joint_pos_left = state["left"]["pos"]
+            joint_pos_right = state["right"]["pos"]
+            self.last_state_timestamp = state["timestamp"]
+        else:
+            joint_pos_left = self.robot_left.get_joint_pos()
+            joint_pos_right = self.robot_right.get_joint_pos()
 
         # Create properly prefixed motor names
         motors_left = [f'left_motor_{i}' for i in range(len(joint_pos_left))]
@@ -220,8 +234,12 @@ class YamBimanual(Robot):
         if not self.has_connected:
             raise DeviceNotConnectedError(f"{self} is not connected.")
 
-        self.robot_left.close()
-        self.robot_right.close()
+        if self.bus_manager is not None:
+            self.bus_manager.close()
+            self.bus_manager = None
+        else:
+            self.robot_left.close()
+            self.robot_right.close()
 
         # self.bus.disconnect(self.config.disable_torque_on_disconnect)
         for cam in self.cameras.values():
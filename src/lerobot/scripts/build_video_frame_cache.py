@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Decode all the video frames of a dataset ahead of a training run, and store them in its video frame cache.
+
+Training with `--dataset.use_video_frame_cache=true` (and the same `--dataset.video_frame_cache_resolution`)
+then reads the frames from the cache instead of decoding the videos, starting from the first epoch.
+
+Example:
+
+```
+python -m lerobot.scripts.build_video_frame_cache \
+    --repo-id lerobot/pusht \
+    --resolution 96 96 \
+    --max-size-gb 50 \
+    --num-workers 8
+```
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+
+import torch
+import tqdm
+
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.utils.utils import init_logging
+
+
+def build_video_frame_cache(
+    dataset: LeRobotDataset,
+    batch_size: int = 32,
+    num_workers: int = 4,
+) -> dict[str, int]:
+    if dataset.video_frame_cache is None:
+        raise ValueError("The dataset has no video frame cache. Is `use_video_frame_cache` set?")
+
+    # Frames are read in order, so that each batch decodes contiguous frames of the same episodes.
+    dataloader = torch.utils.data.DataLoader(
+        dataset,
+        batch_size=batch_size,
+        num_workers=num_workers,
+        shuffle=False,
+    )
+    start = time.perf_counter()
+    for _ in tqdm.tqdm(dataloader, total=len(dataloader)):
+        pass
+
+    stats = dataset.video_frame_cache.stats()
+    logging.info(f"Video frame cache built in {time.perf_counter() - start:.1f}s: {stats}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--repo-id",
+        type=str,
+        required=True,
+        help="Name of hugging face repository containing a LeRobotDataset dataset (e.g. `lerobot/pusht`).",
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=None,
+        help="Root directory for the dataset stored locally (e.g. `--root data`). By default, the dataset will be loaded from hugging face cache folder, or downloaded from the hub if available.",
+    )
+    parser.add_argument(
+        "--episodes",
+        type=int,
+        nargs="*",
+        default=None,
+        help="Episodes to decode. By default, all the episodes are decoded.",
+    )
+    parser.add_argument(
+        "--resolution",
+        type=int,
+        nargs=2,
+        default=None,
+        help="(height, width) to which the frames are downscaled before being cached.",
+    )
+    parser.add_argument(
+        "--max-size-gb",
+        type=float,
+        default=None,
+        help="Refuse to build the cache if it would take more space on disk (in GB).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=32,
+        help="Batch size loaded by DataLoader.",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=4,
+        help="Number of processes of Dataloader for decoding the videos.",
+    )
+    args = parser.parse_args()
+
+    init_logging()
+    max_size_bytes = int(args.max_size_gb * 1e9) if args.max_size_gb is not None else None
+    dataset = LeRobotDataset(
+        args.repo_id,
+        root=args.root,
+        episodes=args.episodes,
+        use_video_frame_cache=True,
+        video_frame_cache_resolution=tuple(args.resolution) if args.resolution is not None else None,
+        video_frame_cache_max_size_bytes=max_size_bytes,
+    )
+    build_video_frame_cache(dataset, batch_size=args.batch_size, num_workers=args.num_workers)
+
+
+if __name__ == "__main__":
+    main()
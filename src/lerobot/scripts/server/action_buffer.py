@@ -0,0 +1,229 @@
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Timestep-indexed buffer of the actions the robot client has yet to perform."""
+
+import math
+from collections.abc import Callable
+from queue import Empty
+
+import torch
+
+from lerobot.scripts.server.helpers import TimedAction
+
+
+class TemporalEnsembleAggregate:
+    """Temporal ensembling of ACT (Algorithm 2 of https://huggingface.co/papers/2304.13705) as an aggregate
+    function.
+
+    Each action is the average of the predictions of all the chunks covering its timestep, weighted by
+    wᵢ = exp(-coeff * i), with w₀ the weight of the oldest prediction. It is kept as a running average: the
+    pending action averages n predictions, and the incoming one is added with weight wₙ. See
+    ACTTemporalEnsembler for the effect of the coefficient.
+    """
+
+    # `ActionRingBuffer.merge` passes the counts of predictions averaged in the pending actions
+    uses_counts = True
+
+    def __init__(self, coeff: float = 0.01):
+        self.coeff = coeff
+
+    def __call__(
+        self, old: torch.Tensor, new: torch.Tensor, counts: torch.Tensor | None = None
+    ) -> torch.Tensor:
+        """
+        Args:
+            old: The pending actions, (B, action_dim) or (action_dim,).
+            new: The incoming actions, same shape as `old`.
+            counts: The number of predictions averaged in each pending action, (B,). Defaults to 1.
+        """
+        if counts is None:
+            counts = torch.ones((), dtype=old.dtype)
+        else:
+            counts = counts.to(old.dtype).reshape(-1, *([1] * (old.ndim - 1)))
+
+        if self.coeff == 0:
+            old_weight, new_weight = counts, torch.ones_like(counts)
+        else:
+            ratio = math.exp(-self.coeff)
+            # sum of the weights of the n predictions already averaged, and weight of the next one
+            old_weight = (1 - ratio**counts) / (1 - ratio)
+            new_weight = ratio**counts
+
+        return (old_weight * old + new_weight * new) / (old_weight + new_weight)
+
+
+class ActionRingBuffer:
+    """Pending actions of the robot client, stored in a ring of tensors indexed by timestep.
+
+    The action of timestep t is stored at slot t % capacity. Action chunks cover contiguous timesteps, and so
+    do the pending actions, [start, end). Merging an incoming chunk aggregates the slice it shares with the
+    pending actions in a single (vectorized) call of the aggregate function, and the incoming chunk then
+    defines the pending actions: the actions already performed are dropped from it, and the pending actions
+    past its end are discarded. The buffer is not thread-safe, the robot client guards it with its
+    `action_queue_lock`.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.actions: torch.Tensor | None = None  # (capacity, action_dim), allocated with the first chunk
+        self.timestamps = torch.zeros(capacity, dtype=torch.float64)
+        # number of chunks aggregated in each pending action
+        self.counts = torch.zeros(capacity, dtype=torch.int64)
+        self.start = 0
+        self.end = 0
+        self.last_popped = -1
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def timesteps(self) -> list[int]:
+        return list(range(self.start, self.end))
+
+    def _slots(self, start: int, end: int) -> torch.Tensor:
+        return torch.arange(start, end) % self.capacity
+
+    def _reserve(self, length: int, actions: torch.Tensor) -> None:
+        """Allocate the ring for actions like `actions`, with room for `length` of them"""
+        capacity = self.capacity
+        while capacity < length:
+            capacity *= 2
+
+        if self.actions is None or self.actions.shape[1:] != actions.shape[1:]:
+            self.capacity = capacity
+            self.actions = torch.zeros((capacity, *actions.shape[1:]), dtype=actions.dtype)
+            self.timestamps = torch.zeros(capacity, dtype=torch.float64)
+            self.counts = torch.zeros(capacity, dtype=torch.int64)
+            self.start = self.end = self.last_popped + 1
+            return
+
+        if capacity > self.capacity:
+            slots = self._slots(self.start, self.end)
+            pending = self.actions[slots], self.timestamps[slots], self.counts[slots]
+            self.capacity = capacity
+            self.actions = torch.zeros((capacity, *actions.shape[1:]), dtype=self.actions.dtype)
+            self.timestamps = torch.zeros(capacity, dtype=torch.float64)
+            self.counts = torch.zeros(capacity, dtype=torch.int64)
+            slots = self._slots(self.start, self.end)
+            self.actions[slots], self.timestamps[slots], self.counts[slots] = pending
+
+    def merge(
+        self,
+        incoming_actions: list[TimedAction],
+        aggregate_fn: Callable[[torch.Tensor, torch.Tensor], torch.Tensor] | None = None,
+    ) -> None:
+        """Merge an action chunk in the buffer.
+
+        Args:
+            incoming_actions: The action chunk, with contiguous timesteps.
+            aggregate_fn: Aggregates the pending actions (first argument) and the incoming actions (second
+                argument) of the same timesteps, stacked along the first dimension. Defaults to keeping the
+                incoming actions. If it has a true `uses_counts` attribute (e.g. `TemporalEnsembleAggregate`),
+                it is also passed the counts of chunks already aggregated in the pending actions.
+        """
+        if not incoming_actions:
+            return
+
+        first_timestep = incoming_actions[0].get_timestep()
+        if incoming_actions[-1].get_timestep() - first_timestep != len(incoming_actions) - 1:
+            raise ValueError("The timesteps of an action chunk must be contiguous")
+
+        # actions older than the last action performed are skipped
+        skip = max(0, self.last_popped + 1 - first_timestep)
+        new_start = first_timestep + skip
+        new_end = first_timestep + len(incoming_actions)
+        if new_start >= new_end:
+            self.start = self.end = self.last_popped + 1
+            return
+
+        actions = torch.stack([action.get_action() for action in incoming_actions[skip:]])
+        timestamps = torch.tensor(
+            [action.get_timestamp() for action in incoming_actions[skip:]], dtype=torch.float64
+        )
+        counts = torch.zeros(len(actions), dtype=torch.int64)
+        self._reserve(new_end - new_start, actions)
+
+        # aggregate the actions of the timesteps already pending
+        overlap_start = max(new_start, self.start)
+        overlap_end = min(new_end, self.end)
+        if aggregate_fn is not None and overlap_start < overlap_end:
+            slots = self._slots(overlap_start, overlap_end)
+            overlap = slice(overlap_start - new_start, overlap_end - new_start)
+            if getattr(aggregate_fn, "uses_counts", False):
+                actions[overlap] = aggregate_fn(self.actions[slots], actions[overlap], self.counts[slots])
+            else:
+                actions[overlap] = aggregate_fn(self.actions[slots], actions[overlap])
+            counts[overlap] = self.counts[slots]
+
+        slots = self._slots(new_start, new_end)
+        self.actions[slots] = actions.to(self.actions.dtype)
+        self.timestamps[slots] = timestamps
+        self.counts[slots] = counts + 1
+        self.start, self.end = new_start, new_end
+
+    def remaining_time(self, now: float) -> float:
+        """Time (s) until the timestamp of the last pending action"""
+        if self.empty():
+            return 0.0
+        return max(0.0, self.timestamps[(self.end - 1) % self.capacity].item() - now)
+
+    def sample(self, now: float) -> TimedAction | None:
+        """The action at time `now`, linearly interpolated between the timestamps of the pending actions.
+
+        The actions whose timestamps are past are dropped, except the last one before `now`, kept as the lower
+        bound of the interpolation (and returned timestep). Before the first pending timestamp, the first
+        pending action is returned. Returns None when all the pending actions are past.
+        """
+        if self.empty():
+            return None
+
+        slots = self._slots(self.start, self.end)
+        timestamps = self.timestamps[slots]
+        if now > timestamps[-1].item():
+            # the pending actions ran out
+            self.last_popped = self.end - 1
+            self.start = self.end
+            return None
+
+        upper = int(torch.searchsorted(timestamps, torch.tensor(now, dtype=torch.float64)))
+        if upper == 0:
+            return TimedAction(timestamp=now, timestep=self.start, action=self.actions[slots[0]].clone())
+
+        lower_slot, upper_slot = slots[upper - 1], slots[upper]
+        t_lower, t_upper = timestamps[upper - 1].item(), timestamps[upper].item()
+        weight = (now - t_lower) / (t_upper - t_lower) if t_upper > t_lower else 1.0
+        action = torch.lerp(self.actions[lower_slot], self.actions[upper_slot], weight)
+
+        # the actions before the lower bound will not be sampled again
+        self.start += upper - 1
+        self.last_popped = self.start - 1
+        return TimedAction(timestamp=now, timestep=self.start, action=action)
+
+    def pop(self) -> TimedAction:
+        """Remove and return the action of the earliest pending timestep"""
+        if self.empty():
+            raise Empty
+
+        slot = self.start % self.capacity
+        timed_action = TimedAction(
+            timestamp=self.timestamps[slot].item(),
+            timestep=self.start,
+            action=self.actions[slot].clone(),  # the slot is overwritten by later chunks
+        )
+        self.last_popped = self.start
+        self.start += 1
+        return timed_action
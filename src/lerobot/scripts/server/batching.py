@@ -0,0 +1,138 @@
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Dynamic batching of the inference requests of several clients sharing a policy."""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class InferenceRequest:
+    item: Any
+    submit_time: float = field(default_factory=time.perf_counter)
+    future: Future = field(default_factory=Future)
+
+
+class DynamicBatcher:
+    """Groups the requests submitted with the same key (e.g. the policy they run on) into batches, run one at
+    a time by a worker thread.
+
+    A batch is dispatched as soon as it holds `max_batch_size` requests, or as many requests as
+    `expected_batch_size(key)` (the number of clients currently using the key), or when its oldest request has
+    waited `batch_timeout` seconds. With a single client, requests are thus dispatched without waiting.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[Hashable, list[Any]], list[Any]],
+        max_batch_size: int,
+        batch_timeout: float,
+        expected_batch_size: Callable[[Hashable], int] | None = None,
+        logger: logging.Logger | None = None,
+    ):
+        """
+        Args:
+            run_batch: Called with a key and the items of a batch, returns one result per item.
+            max_batch_size: Max number of requests in a batch.
+            batch_timeout: Max time (s) the oldest request of a batch waits for more requests.
+            expected_batch_size: Number of requests a batch of a key is expected to gather.
+            logger: Logger of the batching errors.
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout
+        self.expected_batch_size = expected_batch_size or (lambda key: max_batch_size)
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._pending: dict[Hashable, list[InferenceRequest]] = {}
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dynamic_batcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        return not self._stop_event.is_set()
+
+    def submit(self, key: Hashable, item: Any) -> Future:
+        """Queue an item for the next batch of `key`. The future resolves to its result."""
+        request = InferenceRequest(item)
+        with self._condition:
+            self._pending.setdefault(key, []).append(request)
+            self._condition.notify()
+        return request.future
+
+    def stop(self) -> None:
+        """Stop the worker thread, failing the pending requests."""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify()
+            pending = [request for requests in self._pending.values() for request in requests]
+            self._pending.clear()
+        for request in pending:
+            request.future.set_exception(RuntimeError("Batcher stopped"))
+        self._thread.join()
+
+    def _next_batch(self) -> tuple[Hashable, list[InferenceRequest]] | None:
+        with self._condition:
+            while self.running and not self._pending:
+                self._condition.wait(timeout=0.1)
+            if not self.running:
+                return None
+
+            # serve the key of the oldest request first
+            key = min(self._pending, key=lambda k: self._pending[k][0].submit_time)
+            deadline = self._pending[key][0].submit_time + self.batch_timeout
+            while self.running:
+                num_requests = len(self._pending[key])
+                if num_requests >= min(self.max_batch_size, max(1, self.expected_batch_size(key))):
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._condition.wait(timeout=remaining)
+            if not self.running:
+                return None
+
+            requests = self._pending[key][: self.max_batch_size]
+            del self._pending[key][: self.max_batch_size]
+            if not self._pending[key]:
+                del self._pending[key]
+            return key, requests
+
+    def _run(self) -> None:
+        while self.running:
+            batch = self._next_batch()
+            if batch is None:
+                continue
+
+            key, requests = batch
+            try:
+                results = self.run_batch(key, [request.item for request in requests])
+                if len(results) != len(requests):
+                    raise RuntimeError(f"Got {len(results)} results for a batch of {len(requests)} requests")
+            except Exception as e:
+                self.logger.error(f"Error running a batch of {len(requests)} requests: {e}")
+                for request in requests:
+                    request.future.set_exception(e)
+                continue
+
+            for request, result in zip(requests, results, strict=True):
+                request.future.set_result(result)
@@ -0,0 +1,289 @@
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the observation -> action chunk latency of the async inference transport.
+
+A PolicyServer runs in-process, and `num_clients` clients send observations (one camera frame and the joint
+positions) at the client fps, over the unary SendObservations/GetActions calls and over the StreamInference
+stream. The latency is measured from the observation timestamp to the reception of its action chunk by the
+client. The observations of the clients are batched by the server.
+
+With `--policy=fake`, the policy is replaced by a fixed sleep of `inference_time` per batch. With
+`--policy=tiny_act`, a small randomly initialized ACT checkpoint is created and run on CPU.
+
+Example:
+```shell
+python src/lerobot/scripts/server/benchmark_latency.py \
+    --policy=tiny_act \
+    --num_clients=4 \
+    --num_observations=200 \
+    --observation_encoding=jpeg
+```
+"""
+
+import argparse
+import logging
+import pickle  # nosec
+import tempfile
+import threading
+import time
+from concurrent import futures
+from queue import Empty, Queue
+
+import grpc
+import numpy as np
+import torch
+
+from lerobot.configs.types import FeatureType
+from lerobot.datasets.utils import dataset_to_policy_features, hw_to_dataset_features
+from lerobot.policies.act.configuration_act import ACTConfig
+from lerobot.policies.act.modeling_act import ACTPolicy
+from lerobot.scripts.server.configs import PolicyServerConfig
+from lerobot.scripts.server.constants import DEFAULT_FPS, DEFAULT_INFERENCE_LATENCY, OBSERVATION_ENCODINGS
+from lerobot.scripts.server.helpers import RemotePolicyConfig, TimedAction, TimedObservation
+from lerobot.scripts.server.observation_codec import encode_observation
+from lerobot.scripts.server.policy_server import ClientSession, PolicyServer
+from lerobot.transport import (
+    services_pb2,  # type: ignore
+    services_pb2_grpc,  # type: ignore
+)
+from lerobot.transport.utils import grpc_channel_options, send_bytes_in_chunks
+
+NUM_JOINTS = 6
+
+
+class FakePolicyServer(PolicyServer):
+    """PolicyServer whose policy sleeps for `inference_time` per batch and predicts zeros"""
+
+    def __init__(self, config: PolicyServerConfig, inference_time: float):
+        super().__init__(config)
+        self.inference_time = inference_time
+
+    def _load_policy(self, policy_type: str, pretrained_name_or_path: str, device: str) -> None:
+        return None
+
+    def _predict_action_chunks(
+        self, requests: list[tuple[ClientSession, TimedObservation]]
+    ) -> list[list[TimedAction]]:
+        time.sleep(self.inference_time)
+        action_chunks = []
+        for session, observation_t in requests:
+            session.last_processed_obs = observation_t
+            actions = [torch.zeros(NUM_JOINTS)] * session.actions_per_chunk
+            action_chunks.append(
+                self._time_action_chunk(observation_t.get_timestamp(), actions, observation_t.get_timestep())
+            )
+        return action_chunks
+
+
+def make_lerobot_features(height: int, width: int) -> dict[str, dict]:
+    hw_features = {**{f"joint_{i}.pos": float for i in range(NUM_JOINTS)}, "front": (height, width, 3)}
+    return hw_to_dataset_features(hw_features, "observation", use_video=False)
+
+
+def make_tiny_act_checkpoint(path: str, image_shape: tuple[int, int, int] = (3, 96, 128)) -> None:
+    """Save a small randomly initialized ACT policy, with identity normalization statistics"""
+    input_features = dataset_to_policy_features(make_lerobot_features(*image_shape[1:]))
+    config = ACTConfig(
+        input_features=input_features,
+        output_features=dataset_to_policy_features(
+            {"action": {"dtype": "float32", "shape": (NUM_JOINTS,), "names": None}}
+        ),
+        device="cpu",
+        chunk_size=50,
+        n_action_steps=50,
+        pretrained_backbone_weights=None,
+        dim_model=64,
+        n_heads=2,
+        dim_feedforward=128,
+        n_encoder_layers=1,
+        n_decoder_layers=1,
+        use_vae=False,
+    )
+    dataset_stats = {}
+    for key, feature in {**config.input_features, **config.output_features}.items():
+        shape = (feature.shape[0], 1, 1) if feature.type is FeatureType.VISUAL else feature.shape
+        dataset_stats[key] = {"mean": torch.zeros(shape), "std": torch.ones(shape)}
+
+    ACTPolicy(config, dataset_stats=dataset_stats).save_pretrained(path)
+
+
+def serialize_observation(obs: TimedObservation, encoding: str) -> bytes:
+    if encoding == "pickle":
+        return pickle.dumps(obs)  # nosec
+    return encode_observation(obs, encoding)[0]
+
+
+def run_client(address: str, streaming: bool, policy_path: str, args: argparse.Namespace) -> np.ndarray:
+    """Send observations at the client fps, and measure the latency of the action chunks received back.
+
+    Returns:
+        The latencies, in seconds.
+    """
+    # one channel per client, so that each client has its own session on the server
+    channel = grpc.insecure_channel(address, grpc_channel_options())
+    stub = services_pb2_grpc.AsyncInferenceStub(channel)
+    stub.Ready(services_pb2.Empty())
+    policy_config = RemotePolicyConfig(
+        policy_type="act",
+        pretrained_name_or_path=policy_path,
+        lerobot_features=make_lerobot_features(args.height, args.width),
+        actions_per_chunk=args.actions_per_chunk,
+        device="cpu",
+        observation_encoding=args.observation_encoding,
+    )
+    stub.SendPolicyInstructions(services_pb2.PolicySetup(data=pickle.dumps(policy_config)))  # nosec
+
+    rng = np.random.default_rng()
+    frame = rng.integers(0, 256, size=(args.height, args.width, 3), dtype=np.uint8)
+
+    latencies = {}
+    done = threading.Event()
+    observations = Queue()
+
+    def on_actions(actions: services_pb2.Actions) -> None:
+        timed_actions = pickle.loads(actions.data)  # nosec
+        latencies[timed_actions[0].get_timestep()] = time.time() - timed_actions[0].get_timestamp()
+
+    def stream_observations():
+        while not done.is_set():
+            try:
+                observation_bytes = observations.get(timeout=0.01)
+            except Empty:
+                continue
+            yield from send_bytes_in_chunks(observation_bytes, services_pb2.Observation, silent=True)
+
+    def receive_actions():
+        if streaming:
+            for actions in stub.StreamInference(stream_observations()):
+                on_actions(actions)
+            return
+
+        while not done.is_set():
+            actions = stub.GetActions(services_pb2.Empty())
+            if len(actions.data) > 0:
+                on_actions(actions)
+
+    receiver = threading.Thread(target=receive_actions, daemon=True)
+    receiver.start()
+
+    period = 1 / args.fps
+    for timestep in range(args.num_observations):
+        start = time.perf_counter()
+        obs = TimedObservation(
+            timestamp=time.time(),
+            timestep=timestep,
+            observation={
+                "front": frame,
+                **{f"joint_{i}.pos": float(rng.normal()) for i in range(NUM_JOINTS)},
+                "task": "",
+            },
+            must_go=True,
+        )
+        observation_bytes = serialize_observation(obs, args.observation_encoding)
+        if streaming:
+            observations.put(observation_bytes)
+        else:
+            stub.SendObservations(
+                send_bytes_in_chunks(observation_bytes, services_pb2.Observation, silent=True)
+            )
+        time.sleep(max(0.0, period - (time.perf_counter() - start)))
+
+    # let the last action chunk come back
+    time.sleep(args.inference_time + 0.5)
+    done.set()
+    receiver.join()
+    channel.close()
+
+    return np.array(list(latencies.values()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--policy", choices=["fake", "tiny_act"], default="fake")
+    parser.add_argument(
+        "--inference_time", type=float, default=0.02, help="Inference time (s) of the fake policy, per batch."
+    )
+    parser.add_argument(
+        "--inference_latency",
+        type=float,
+        default=DEFAULT_INFERENCE_LATENCY,
+        help="Target inference latency of GetActions (s).",
+    )
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS, help="Observation rate of each client.")
+    parser.add_argument("--num_clients", type=int, default=1)
+    parser.add_argument("--max_batch_size", type=int, default=8)
+    parser.add_argument("--batch_timeout", type=float, default=0.005)
+    parser.add_argument("--num_observations", type=int, default=200, help="Observations sent per client.")
+    parser.add_argument("--actions_per_chunk", type=int, default=50)
+    parser.add_argument("--observation_encoding", choices=OBSERVATION_ENCODINGS, default="jpeg")
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--width", type=int, default=640)
+    args = parser.parse_args()
+
+    config = PolicyServerConfig(
+        fps=args.fps,
+        inference_latency=args.inference_latency,
+        obs_queue_timeout=0.1,
+        max_batch_size=args.max_batch_size,
+        batch_timeout=args.batch_timeout,
+    )
+    with tempfile.TemporaryDirectory() as policy_path:
+        if args.policy == "tiny_act":
+            make_tiny_act_checkpoint(policy_path)
+            policy_server = PolicyServer(config)
+        else:
+            policy_server = FakePolicyServer(config, args.inference_time)
+        policy_server.logger.setLevel(logging.WARNING)
+
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=4 + 2 * args.num_clients))
+        services_pb2_grpc.add_AsyncInferenceServicer_to_server(policy_server, server)
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+
+        try:
+            for name, streaming in [("unary", False), ("streaming", True)]:
+                previous_clients = set(policy_server.get_metrics())
+                with futures.ThreadPoolExecutor(max_workers=args.num_clients) as executor:
+                    client_latencies = [
+                        executor.submit(run_client, f"localhost:{port}", streaming, policy_path, args)
+                        for _ in range(args.num_clients)
+                    ]
+                    latencies_ms = np.concatenate([latencies.result() for latencies in client_latencies])
+                    latencies_ms *= 1000
+
+                num_sent = args.num_clients * args.num_observations
+                if len(latencies_ms) == 0:
+                    print(f"{name:>9}: no action chunk received for {num_sent} observations")
+                    continue
+
+                batch_sizes = [
+                    metrics["batch_size_mean"]
+                    for client_id, metrics in policy_server.get_metrics().items()
+                    if client_id not in previous_clients and "batch_size_mean" in metrics
+                ]
+                print(
+                    f"{name:>9}: {len(latencies_ms)}/{num_sent} observations answered | "
+                    f"latency mean {latencies_ms.mean():.2f}ms, p50 {np.percentile(latencies_ms, 50):.2f}ms, "
+                    f"p90 {np.percentile(latencies_ms, 90):.2f}ms, max {latencies_ms.max():.2f}ms | "
+                    f"mean batch size {np.mean(batch_sizes):.2f}"
+                )
+        finally:
+            server.stop(grace=None)
+            policy_server.stop()
+
+
+if __name__ == "__main__":
+    main()
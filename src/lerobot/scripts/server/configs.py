@@ -18,10 +18,15 @@ from dataclasses import dataclass, field
 import torch
 
 from lerobot.robots.config import RobotConfig
+from lerobot.scripts.server.action_buffer import TemporalEnsembleAggregate
 from lerobot.scripts.server.constants import (
+    DEFAULT_BATCH_TIMEOUT,
     DEFAULT_FPS,
+    DEFAULT_IMAGE_QUALITY,
     DEFAULT_INFERENCE_LATENCY,
+    DEFAULT_MAX_BATCH_SIZE,
     DEFAULT_OBS_QUEUE_TIMEOUT,
+    OBSERVATION_ENCODINGS,
 )
 
 # Aggregate function registry for CLI usage
@@ -30,6 +35,7 @@ AGGREGATE_FUNCTIONS = {
     "latest_only": lambda old, new: new,
     "average": lambda old, new: 0.5 * old + 0.5 * new,
     "conservative": lambda old, new: 0.7 * old + 0.3 * new,
+    "temporal_ensemble": TemporalEnsembleAggregate(coeff=0.01),
 }
 
 
@@ -63,6 +69,19 @@ class PolicyServerConfig:
         default=DEFAULT_OBS_QUEUE_TIMEOUT, metadata={"help": "Timeout for observation queue in seconds"}
     )
 
+    # Batching configuration
+    max_batch_size: int = field(
+        default=DEFAULT_MAX_BATCH_SIZE,
+        metadata={"help": "Max number of client observations run through the policy in one batch"},
+    )
+    batch_timeout: float = field(
+        default=DEFAULT_BATCH_TIMEOUT,
+        metadata={"help": "Max time (s) an observation waits for the observations of other clients"},
+    )
+    metrics_log_interval: float = field(
+        default=10.0, metadata={"help": "Interval (s) between two logs of the metrics of a client"}
+    )
+
     def __post_init__(self):
         """Validate configuration after initialization."""
         if self.port < 1 or self.port > 65535:
@@ -77,6 +96,12 @@ class PolicyServerConfig:
         if self.obs_queue_timeout < 0:
             raise ValueError(f"obs_queue_timeout must be non-negative, got {self.obs_queue_timeout}")
 
+        if self.max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {self.max_batch_size}")
+
+        if self.batch_timeout < 0:
+            raise ValueError(f"batch_timeout must be non-negative, got {self.batch_timeout}")
+
     @classmethod
     def from_dict(cls, config_dict: dict) -> "PolicyServerConfig":
         """Create a PolicyServerConfig from a dictionary."""
@@ -95,6 +120,8 @@ class PolicyServerConfig:
             "fps": self.fps,
             "environment_dt": self.environment_dt,
             "inference_latency": self.inference_latency,
+            "max_batch_size": self.max_batch_size,
+            "batch_timeout": self.batch_timeout,
         }
 
 
@@ -129,6 +156,45 @@ class RobotClientConfig:
     # Control behavior configuration
     chunk_size_threshold: float = field(default=0.5, metadata={"help": "Threshold for chunk size control"})
     fps: int = field(default=DEFAULT_FPS, metadata={"help": "Frames per second"})
+    latency_aware_scheduling: bool = field(
+        default=True,
+        metadata={
+            "help": "Send the next observation once the pending actions only cover the estimated round-trip "
+            "latency (plus one control step), instead of using chunk_size_threshold"
+        },
+    )
+    interpolate_actions: bool = field(
+        default=True,
+        metadata={
+            "help": "Sample the pending actions at the control clock time, interpolating between their "
+            "timestamps, instead of performing one action per control step"
+        },
+    )
+
+    # Transport configuration
+    streaming: bool = field(
+        default=True,
+        metadata={
+            "help": "Exchange observations and actions over a single bidirectional stream (StreamInference) "
+            "instead of one SendObservations call per observation and GetActions polling"
+        },
+    )
+
+    # Observation wire format configuration
+    observation_encoding: str = field(
+        default="jpeg",
+        metadata={
+            "help": f"Encoding of the observations sent to the server. Options: {OBSERVATION_ENCODINGS}. "
+            "'raw' sends the arrays uncompressed, 'jpeg', 'webp' and 'png' compress the camera frames."
+        },
+    )
+    image_quality: int = field(
+        default=DEFAULT_IMAGE_QUALITY, metadata={"help": "Quality (1-100) of the jpeg and webp encodings"}
+    )
+    resize_images: bool = field(
+        default=False,
+        metadata={"help": "Resize the camera frames to the policy input resolution before sending them"},
+    )
 
     # Aggregate function configuration (CLI-compatible)
     aggregate_fn_name: str = field(
@@ -174,6 +240,15 @@ class RobotClientConfig:
         if self.actions_per_chunk <= 0:
             raise ValueError(f"actions_per_chunk must be positive, got {self.actions_per_chunk}")
 
+        if self.observation_encoding not in OBSERVATION_ENCODINGS:
+            raise ValueError(
+                f"observation_encoding must be one of {OBSERVATION_ENCODINGS}, "
+                f"got {self.observation_encoding}"
+            )
+
+        if self.image_quality < 1 or self.image_quality > 100:
+            raise ValueError(f"image_quality must be between 1 and 100, got {self.image_quality}")
+
         self.aggregate_fn = get_aggregate_function(self.aggregate_fn_name)
 
     @classmethod
@@ -194,4 +269,10 @@ class RobotClientConfig:
             "task": self.task,
             "debug_visualize_queue_size": self.debug_visualize_queue_size,
             "aggregate_fn_name": self.aggregate_fn_name,
+            "latency_aware_scheduling": self.latency_aware_scheduling,
+            "interpolate_actions": self.interpolate_actions,
+            "streaming": self.streaming,
+            "observation_encoding": self.observation_encoding,
+            "image_quality": self.image_quality,
+            "resize_images": self.resize_images,
         }
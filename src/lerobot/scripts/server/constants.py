@@ -22,8 +22,30 @@ DEFAULT_INFERENCE_LATENCY = 1 / DEFAULT_FPS
 """Server side: Timeout for observation queue in seconds"""
 DEFAULT_OBS_QUEUE_TIMEOUT = 2
 
+"""Server side: Max number of observations, from different clients, run through the policy in one batch"""
+DEFAULT_MAX_BATCH_SIZE = 8
+
+"""Server side: Max time the first observation of a batch waits for the observations of other clients"""
+DEFAULT_BATCH_TIMEOUT = 0.005
+
+"""Server side: Clients that have not requested inference for this long are not waited for by the batcher"""
+ACTIVE_CLIENT_TIMEOUT = 1.0
+
+"""Server side: Sessions of the clients that have not called the server for this long are dropped"""
+CLIENT_SESSION_TIMEOUT = 60.0
+
+"""Client side: Wire format of the observations, "pickle" sends the whole TimedObservation pickled"""
+OBSERVATION_ENCODINGS = ["pickle", "raw", "jpeg", "webp", "png"]
+
+"""Client side: Quality of the jpeg and webp encodings of the camera frames"""
+DEFAULT_IMAGE_QUALITY = 90
+
 # All action chunking policies
 SUPPORTED_POLICIES = ["act", "smolvla", "diffusion", "pi0", "tdmpc", "vqbet"]
 
+# Policies whose `predict_action_chunk` is stateless, so that a single model can run the observations of
+# several clients in one batch. The others keep a history of observations, and are loaded once per client.
+BATCHED_INFERENCE_POLICIES = ["act", "smolvla"]
+
 # TODO: Add all other robots
 SUPPORTED_ROBOTS = ["so100_follower", "so101_follower"]
@@ -16,7 +16,8 @@ import logging
 import logging.handlers
 import os
 import time
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import torch
@@ -266,6 +267,103 @@ class FPSTracker:
         self.total_obs_count = 0
 
 
+@dataclass
+class LatencyEstimator:
+    """Running estimate of a latency, from exponential moving averages of its samples and of their deviation,
+    as TCP estimates round-trip times (RFC 6298). The estimate, mean + deviation_factor * deviation, is an
+    upper bound of the latency in most cases."""
+
+    alpha: float = 0.125
+    beta: float = 0.25
+    deviation_factor: float = 4.0
+    mean: float | None = None
+    deviation: float = 0.0
+    num_samples: int = 0
+
+    def update(self, sample: float) -> None:
+        if self.mean is None:
+            self.mean = sample
+            self.deviation = sample / 2
+        else:
+            self.deviation = (1 - self.beta) * self.deviation + self.beta * abs(sample - self.mean)
+            self.mean = (1 - self.alpha) * self.mean + self.alpha * sample
+        self.num_samples += 1
+
+    def estimate(self) -> float | None:
+        """The latency estimate in seconds, None before the first sample"""
+        if self.mean is None:
+            return None
+        return self.mean + self.deviation_factor * self.deviation
+
+    def reset(self) -> None:
+        self.mean = None
+        self.deviation = 0.0
+        self.num_samples = 0
+
+
+@dataclass
+class ClientMetrics:
+    """Throughput and latency of the action chunks served to a client, over its last `window` chunks.
+
+    Latencies are measured from the capture of the observation by the client to the action chunk being ready
+    to send back, and split into the time spent waiting for a batch and running the policy.
+    """
+
+    window: int = 100
+    num_observations: int = 0
+    num_filtered: int = 0
+    num_chunks: int = 0
+    chunk_times: deque = field(init=False)
+    latencies: deque = field(init=False)
+    batch_wait_times: deque = field(init=False)
+    inference_times: deque = field(init=False)
+    batch_sizes: deque = field(init=False)
+
+    def __post_init__(self):
+        self.chunk_times = deque(maxlen=self.window)
+        self.latencies = deque(maxlen=self.window)
+        self.batch_wait_times = deque(maxlen=self.window)
+        self.inference_times = deque(maxlen=self.window)
+        self.batch_sizes = deque(maxlen=self.window)
+
+    def record_observation(self, enqueued: bool) -> None:
+        self.num_observations += 1
+        self.num_filtered += not enqueued
+
+    def record_chunk(
+        self, latency: float, batch_wait_time: float, inference_time: float, batch_size: int
+    ) -> None:
+        self.num_chunks += 1
+        self.chunk_times.append(time.perf_counter())
+        self.latencies.append(latency)
+        self.batch_wait_times.append(batch_wait_time)
+        self.inference_times.append(inference_time)
+        self.batch_sizes.append(batch_size)
+
+    def summary(self) -> dict[str, float]:
+        """Chunks per second, latencies in milliseconds and mean batch size over the window"""
+        counts = {
+            "num_observations": self.num_observations,
+            "num_filtered": self.num_filtered,
+            "num_chunks": self.num_chunks,
+        }
+        if not self.latencies:
+            return counts
+
+        elapsed = self.chunk_times[-1] - self.chunk_times[0]
+        latencies = torch.tensor(list(self.latencies), dtype=torch.float64) * 1000
+        return {
+            **counts,
+            "chunks_per_second": (len(self.chunk_times) - 1) / elapsed if elapsed > 1e-6 else 0.0,
+            "latency_mean_ms": latencies.mean().item(),
+            "latency_p50_ms": latencies.quantile(0.5).item(),
+            "latency_p90_ms": latencies.quantile(0.9).item(),
+            "batch_wait_mean_ms": 1000 * sum(self.batch_wait_times) / len(self.batch_wait_times),
+            "inference_mean_ms": 1000 * sum(self.inference_times) / len(self.inference_times),
+            "batch_size_mean": sum(self.batch_sizes) / len(self.batch_sizes),
+        }
+
+
 @dataclass
 class RemotePolicyConfig:
     policy_type: str
@@ -273,6 +371,8 @@ class RemotePolicyConfig:
     lerobot_features: dict[str, PolicyFeature]
     actions_per_chunk: int
     device: str = "cpu"
+    # wire format of the observations, see observation_codec
+    observation_encoding: str = "pickle"
 
 
 def _compare_observation_states(obs1_state: torch.Tensor, obs2_state: torch.Tensor, atol: float) -> bool:
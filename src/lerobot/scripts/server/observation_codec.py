@@ -0,0 +1,210 @@
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Typed wire format for the observations sent by the RobotClient to the PolicyServer.
+
+A message is made of:
+    - `MAGIC` (4 bytes) and the header length (uint32, little-endian)
+    - a JSON header with the timestamp, timestep and must_go flag of the observation, its scalar values (motor
+      positions, task, ...) and, for each array value, its key, dtype, shape, encoding and payload size
+    - the payloads of the arrays, back-to-back in the order of the header
+
+Camera frames (uint8 arrays of shape (H, W, 3)) are compressed with the image encoding negotiated in
+`SendPolicyInstructions` ("jpeg", "webp" or "png"), other arrays are sent raw. Unlike pickle, decoding never
+executes code from the message.
+"""
+
+import json
+import struct
+import time
+from functools import cache
+
+import cv2
+import numpy as np
+import torch
+
+from lerobot.scripts.server.constants import DEFAULT_IMAGE_QUALITY, OBSERVATION_ENCODINGS
+from lerobot.scripts.server.helpers import TimedObservation
+
+MAGIC = b"LRO1"
+
+_IMAGE_EXTENSIONS = {"jpeg": ".jpg", "webp": ".webp", "png": ".png"}
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+@cache
+def supported_encodings() -> list[str]:
+    """The observation encodings this OpenCV build can decode (webp support is optional)."""
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+    supported = ["pickle", "raw"]
+    for encoding, extension in _IMAGE_EXTENSIONS.items():
+        try:
+            ok, buffer = cv2.imencode(extension, frame)
+        except cv2.error:
+            continue
+        if ok and cv2.imdecode(buffer, cv2.IMREAD_COLOR) is not None:
+            supported.append(encoding)
+    return supported
+
+
+def is_camera_frame(value: np.ndarray) -> bool:
+    return value.dtype == np.uint8 and value.ndim == 3 and value.shape[-1] == 3
+
+
+def _image_params(encoding: str, quality: int) -> list[int]:
+    if encoding == "jpeg":
+        return [cv2.IMWRITE_JPEG_QUALITY, quality]
+    if encoding == "webp":
+        return [cv2.IMWRITE_WEBP_QUALITY, quality]
+    return []
+
+
+def encode_observation(
+    obs: TimedObservation,
+    encoding: str,
+    image_quality: int = DEFAULT_IMAGE_QUALITY,
+    image_sizes: dict[str, tuple[int, int]] | None = None,
+) -> tuple[bytes, dict[str, float]]:
+    """Serialize a TimedObservation to the typed wire format.
+
+    Args:
+        obs: The observation to send.
+        encoding: "raw", or the image encoding of the camera frames ("jpeg", "webp" or "png").
+        image_quality: Quality (1-100) of the jpeg and webp encodings.
+        image_sizes: (height, width) the camera frames are resized to before encoding, by raw observation key
+            (e.g. the input resolution of the policy). Frames of other keys are sent at their resolution.
+
+    Returns:
+        The message, and the time spent resizing and encoding the frames, and in total, in seconds.
+    """
+    if encoding not in OBSERVATION_ENCODINGS or encoding == "pickle":
+        raise ValueError(
+            f"Unsupported observation encoding '{encoding}'. Available: {OBSERVATION_ENCODINGS[1:]}"
+        )
+
+    start = time.perf_counter()
+    resize_time = 0.0
+    encode_time = 0.0
+    scalars = {}
+    fields = []
+    payloads = []
+    for key, value in obs.get_observation().items():
+        if isinstance(value, torch.Tensor):
+            value = value.numpy(force=True)
+        if isinstance(value, np.generic):
+            value = value.item()
+        if not isinstance(value, np.ndarray):
+            scalars[key] = value
+            continue
+
+        field_encoding = "raw"
+        if encoding != "raw" and is_camera_frame(value):
+            if image_sizes is not None and key in image_sizes and value.shape[:2] != image_sizes[key]:
+                resize_start = time.perf_counter()
+                height, width = image_sizes[key]
+                value = cv2.resize(value, (width, height), interpolation=cv2.INTER_AREA)
+                resize_time += time.perf_counter() - resize_start
+
+            encode_start = time.perf_counter()
+            # frames are RGB, OpenCV encodes BGR
+            ok, buffer = cv2.imencode(
+                _IMAGE_EXTENSIONS[encoding], value[..., ::-1], _image_params(encoding, image_quality)
+            )
+            if not ok:
+                raise RuntimeError(f"Failed to encode '{key}' as {encoding}")
+            payload = buffer.tobytes()
+            encode_time += time.perf_counter() - encode_start
+            field_encoding = encoding
+        else:
+            payload = np.ascontiguousarray(value).tobytes()
+
+        fields.append(
+            {
+                "key": key,
+                "dtype": value.dtype.str,
+                "shape": list(value.shape),
+                "encoding": field_encoding,
+                "size": len(payload),
+            }
+        )
+        payloads.append(payload)
+
+    header = json.dumps(
+        {
+            "timestamp": obs.get_timestamp(),
+            "timestep": obs.get_timestep(),
+            "must_go": obs.must_go,
+            "scalars": scalars,
+            "fields": fields,
+        }
+    ).encode()
+    message = b"".join([MAGIC, _HEADER_LENGTH.pack(len(header)), header, *payloads])
+
+    timings = {
+        "resize_time": resize_time,
+        "encode_time": encode_time,
+        "total_time": time.perf_counter() - start,
+    }
+    return message, timings
+
+
+def decode_observation(message: bytes) -> tuple[TimedObservation, dict[str, float]]:
+    """Deserialize a message of `encode_observation`.
+
+    Returns:
+        The observation, with the camera frames as uint8 RGB arrays, and the time spent decoding the frames,
+        and in total, in seconds.
+    """
+    start = time.perf_counter()
+    view = memoryview(message)
+    if bytes(view[: len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a typed observation message")
+
+    offset = len(MAGIC)
+    (header_length,) = _HEADER_LENGTH.unpack_from(view, offset)
+    offset += _HEADER_LENGTH.size
+    header = json.loads(bytes(view[offset : offset + header_length]))
+    offset += header_length
+
+    decode_time = 0.0
+    observation = dict(header["scalars"])
+    for field in header["fields"]:
+        payload = view[offset : offset + field["size"]]
+        offset += field["size"]
+        dtype = np.dtype(field["dtype"])
+        shape = tuple(field["shape"])
+        if field["encoding"] == "raw":
+            value = np.frombuffer(payload, dtype=dtype).reshape(shape).copy()
+        elif field["encoding"] in _IMAGE_EXTENSIONS:
+            decode_start = time.perf_counter()
+            value = cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if value is None or value.shape != shape:
+                raise ValueError(f"Failed to decode '{field['key']}' as {field['encoding']} of shape {shape}")
+            value = np.ascontiguousarray(value[..., ::-1])
+            decode_time += time.perf_counter() - decode_start
+        else:
+            raise ValueError(f"Unsupported encoding '{field['encoding']}' for '{field['key']}'")
+        observation[field["key"]] = value
+
+    if offset != len(message):
+        raise ValueError(f"Observation message has {len(message) - offset} trailing bytes")
+
+    obs = TimedObservation(
+        timestamp=header["timestamp"],
+        timestep=header["timestep"],
+        observation=observation,
+        must_go=header["must_go"],
+    )
+    timings = {"decode_time": decode_time, "total_time": time.perf_counter() - start}
+    return obs, timings
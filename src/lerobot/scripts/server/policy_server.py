@@ -20,16 +20,23 @@ python src/lerobot/scripts/server/policy_server.py \
      --port=8080 \
      --fps=30 \
      --inference_latency=0.033 \
-     --obs_queue_timeout=1
+     --obs_queue_timeout=1 \
+     --max_batch_size=8 \
+     --batch_timeout=0.005
 ```
+
+Several robot clients can connect to the same server. Each client gets its own session (observation queue,
+policy instructions, metrics), keyed by its peer address. Clients running the same policy share a single copy
+of the model, and their observations are run through it in batches.
 """
 
 import logging
 import pickle  # nosec
 import threading
 import time
+from collections.abc import Hashable
 from concurrent import futures
-from dataclasses import asdict
+from dataclasses import asdict, dataclass, field
 from pprint import pformat
 from queue import Empty, Queue
 
@@ -38,9 +45,17 @@ import grpc
 import torch
 
 from lerobot.policies.factory import get_policy_class
+from lerobot.policies.pretrained import PreTrainedPolicy
+from lerobot.scripts.server.batching import DynamicBatcher
 from lerobot.scripts.server.configs import PolicyServerConfig
-from lerobot.scripts.server.constants import SUPPORTED_POLICIES
+from lerobot.scripts.server.constants import (
+    ACTIVE_CLIENT_TIMEOUT,
+    BATCHED_INFERENCE_POLICIES,
+    CLIENT_SESSION_TIMEOUT,
+    SUPPORTED_POLICIES,
+)
 from lerobot.scripts.server.helpers import (
+    ClientMetrics,
     FPSTracker,
     Observation,
     RemotePolicyConfig,
@@ -50,6 +65,7 @@ from lerobot.scripts.server.helpers import (
     observations_similar,
     raw_observation_to_observation,
 )
+from lerobot.scripts.server.observation_codec import decode_observation, supported_encodings
 from lerobot.transport import (
     services_pb2,  # type: ignore
     services_pb2_grpc,  # type: ignore
@@ -57,6 +73,35 @@ from lerobot.transport import (
 from lerobot.transport.utils import receive_bytes_in_chunks
 
 
+@dataclass
+class ClientSession:
+    """Server-side state of a robot client, from its call to Ready to the next one"""
+
+    client_id: str
+    fps_tracker: FPSTracker
+    shutdown_event: threading.Event = field(default_factory=threading.Event)
+    observation_queue: Queue = field(default_factory=lambda: Queue(maxsize=1))
+    predicted_timesteps: set[int] = field(default_factory=set)
+    predicted_timesteps_lock: threading.Lock = field(default_factory=threading.Lock)
+    last_processed_obs: TimedObservation | None = None
+    last_seen_time: float = field(default_factory=time.perf_counter)
+    last_request_time: float = float("-inf")
+    metrics: ClientMetrics = field(default_factory=ClientMetrics)
+    last_metrics_log_time: float = field(default_factory=time.perf_counter)
+
+    # Set by SendPolicyInstructions
+    policy_key: Hashable | None = None
+    policy: PreTrainedPolicy | None = None
+    device: str | None = None
+    lerobot_features: dict[str, dict] | None = None
+    actions_per_chunk: int | None = None
+    observation_encoding: str = "pickle"
+
+    @property
+    def running(self):
+        return not self.shutdown_event.is_set()
+
+
 class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
     prefix = "policy_server"
     logger = get_logger(prefix)
@@ -65,45 +110,72 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         self.config = config
         self.shutdown_event = threading.Event()
 
-        # FPS measurement
-        self.fps_tracker = FPSTracker(target_fps=config.fps)
-
-        self.observation_queue = Queue(maxsize=1)
+        # One session per client, keyed by peer address
+        self._sessions_lock = threading.Lock()
+        self._sessions: dict[str, ClientSession] = {}
 
-        self._predicted_timesteps_lock = threading.Lock()
-        self._predicted_timesteps = set()
+        # Policies shared by the clients, see _policy_key
+        self._policies_lock = threading.Lock()
+        self._policies: dict[Hashable, PreTrainedPolicy] = {}
 
-        self.last_processed_obs = None
-
-        # Attributes will be set by SendPolicyInstructions
-        self.device = None
-        self.policy_type = None
-        self.lerobot_features = None
-        self.actions_per_chunk = None
-        self.policy = None
+        self.batcher = DynamicBatcher(
+            self._run_batch,
+            max_batch_size=config.max_batch_size,
+            batch_timeout=config.batch_timeout,
+            expected_batch_size=self._num_active_clients,
+            logger=self.logger,
+        )
 
     @property
     def running(self):
         return not self.shutdown_event.is_set()
 
-    @property
-    def policy_image_features(self):
-        return self.policy.config.image_features
-
-    def _reset_server(self) -> None:
-        """Flushes server state when new client connects."""
-        # only running inference on the latest observation received by the server
-        self.shutdown_event.set()
-        self.observation_queue = Queue(maxsize=1)
-
-        with self._predicted_timesteps_lock:
-            self._predicted_timesteps = set()
+    def _get_session(self, context) -> ClientSession:
+        """The session of the client calling, aborting the call if the client has not called Ready"""
+        client_id = context.peer()
+        with self._sessions_lock:
+            session = self._sessions.get(client_id)
+
+        if session is None or not session.running:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"Client {client_id} must call Ready first")
+
+        session.last_seen_time = time.perf_counter()
+        return session
+
+    def _num_active_clients(self, policy_key: Hashable) -> int:
+        """Number of clients running inference with a policy, i.e. the expected size of its batches"""
+        now = time.perf_counter()
+        with self._sessions_lock:
+            return sum(
+                session.policy_key == policy_key
+                and session.running
+                and now - session.last_request_time < ACTIVE_CLIENT_TIMEOUT
+                for session in self._sessions.values()
+            )
 
     def Ready(self, request, context):  # noqa: N802
         client_id = context.peer()
         self.logger.info(f"Client {client_id} connected and ready")
-        self._reset_server()
-        self.shutdown_event.clear()
+
+        # Flushes the state of the client, only running inference on the latest observation received
+        now = time.perf_counter()
+        with self._sessions_lock:
+            closed_sessions = [
+                session
+                for session in self._sessions.values()
+                if session.client_id == client_id or now - session.last_seen_time > CLIENT_SESSION_TIMEOUT
+            ]
+            for session in closed_sessions:
+                del self._sessions[session.client_id]
+            self._sessions[client_id] = ClientSession(client_id, FPSTracker(target_fps=self.config.fps))
+
+        for session in closed_sessions:
+            if session.client_id != client_id:
+                self.logger.info(f"Dropping the session of client {session.client_id}, inactive")
+            session.shutdown_event.set()  # closes the streams of the session
+
+        if closed_sessions:
+            self._release_unused_policies()
 
         return services_pb2.Empty()
 
@@ -114,7 +186,8 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             self.logger.warning("Server is not running. Ignoring policy instructions.")
             return services_pb2.Empty()
 
-        client_id = context.peer()
+        session = self._get_session(context)
+        client_id = session.client_id
 
         policy_specs = pickle.loads(request.data)  # nosec
 
@@ -127,41 +200,116 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
                 f"Supported policies: {SUPPORTED_POLICIES}"
             )
 
+        # clients predating the typed observation format do not send it
+        observation_encoding = getattr(policy_specs, "observation_encoding", "pickle")
+        if observation_encoding not in supported_encodings():
+            context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"Observation encoding {observation_encoding} not supported. "
+                f"Supported encodings: {supported_encodings()}",
+            )
+
         self.logger.info(
             f"Receiving policy instructions from {client_id} | "
             f"Policy type: {policy_specs.policy_type} | "
             f"Pretrained name or path: {policy_specs.pretrained_name_or_path} | "
             f"Actions per chunk: {policy_specs.actions_per_chunk} | "
-            f"Device: {policy_specs.device}"
+            f"Device: {policy_specs.device} | "
+            f"Observation encoding: {observation_encoding}"
         )
 
-        self.device = policy_specs.device
-        self.policy_type = policy_specs.policy_type  # act, pi0, etc.
-        self.lerobot_features = policy_specs.lerobot_features
-        self.actions_per_chunk = policy_specs.actions_per_chunk
-
-        policy_class = get_policy_class(self.policy_type)
+        policy_key = self._policy_key(policy_specs, client_id)
+        policy = self._get_policy(policy_key, policy_specs)
 
-        start = time.perf_counter()
-        self.policy = policy_class.from_pretrained(policy_specs.pretrained_name_or_path)
-        self.policy.to(self.device)
-        end = time.perf_counter()
+        session.device = policy_specs.device
+        session.lerobot_features = policy_specs.lerobot_features
+        session.actions_per_chunk = policy_specs.actions_per_chunk
+        session.observation_encoding = observation_encoding
+        session.policy = policy
+        session.policy_key = policy_key
 
-        self.logger.info(f"Time taken to put policy on {self.device}: {end - start:.4f} seconds")
+        self._release_unused_policies()
 
         return services_pb2.Empty()
 
+    def _policy_key(self, policy_specs: RemotePolicyConfig, client_id: str) -> Hashable:
+        """Clients whose policies have the same key share a single model, and are batched together"""
+        key = (policy_specs.policy_type, policy_specs.pretrained_name_or_path, policy_specs.device)
+        if policy_specs.policy_type in BATCHED_INFERENCE_POLICIES:
+            return key
+
+        # the policy keeps a history of the observations of its client
+        return (*key, client_id)
+
+    def _get_policy(self, policy_key: Hashable, policy_specs: RemotePolicyConfig) -> PreTrainedPolicy:
+        """Load a policy, unless another client already loaded it"""
+        with self._policies_lock:
+            if policy_key in self._policies:
+                self.logger.info(
+                    f"Reusing policy {policy_specs.pretrained_name_or_path} loaded by another client"
+                )
+                return self._policies[policy_key]
+
+            start = time.perf_counter()
+            policy = self._load_policy(
+                policy_specs.policy_type, policy_specs.pretrained_name_or_path, policy_specs.device
+            )
+            end = time.perf_counter()
+
+            self.logger.info(f"Time taken to put policy on {policy_specs.device}: {end - start:.4f} seconds")
+
+            self._policies[policy_key] = policy
+            return policy
+
+    def _load_policy(self, policy_type: str, pretrained_name_or_path: str, device: str) -> PreTrainedPolicy:
+        policy_class = get_policy_class(policy_type)
+        policy = policy_class.from_pretrained(pretrained_name_or_path)
+        policy.to(device)
+        return policy
+
+    def _release_unused_policies(self) -> None:
+        """Drop the policies no client uses anymore"""
+        with self._sessions_lock:
+            used_keys = {session.policy_key for session in self._sessions.values() if session.running}
+
+        with self._policies_lock:
+            for policy_key in list(self._policies):
+                if policy_key not in used_keys:
+                    self.logger.info(f"Releasing policy {policy_key}, not used by any client")
+                    del self._policies[policy_key]
+
     def SendObservations(self, request_iterator, context):  # noqa: N802
         """Receive observations from the robot client"""
-        client_id = context.peer()
-        self.logger.debug(f"Receiving observations from {client_id}")
+        session = self._get_session(context)
+        self.logger.debug(f"Receiving observations from {session.client_id}")
 
         receive_time = time.time()  # comparing timestamps so need time.time()
-        start_deserialize = time.perf_counter()
+        start_receive = time.perf_counter()
         received_bytes = receive_bytes_in_chunks(
-            request_iterator, None, self.shutdown_event, self.logger
+            request_iterator, None, session.shutdown_event, self.logger
         )  # blocking call while looping over request_iterator
-        timed_observation = pickle.loads(received_bytes)  # nosec
+        receive_bytes_time = time.perf_counter() - start_receive
+
+        self._receive_observation(session, received_bytes, receive_time, receive_bytes_time)
+
+        return services_pb2.Empty()
+
+    def _receive_observation(
+        self,
+        session: ClientSession,
+        received_bytes: bytes,
+        receive_time: float,
+        receive_bytes_time: float = 0.0,
+    ) -> None:
+        """Deserialize an observation sent by the robot client, and enqueue it if it must be processed"""
+        session.last_seen_time = time.perf_counter()
+        start_deserialize = time.perf_counter()
+        if session.observation_encoding == "pickle":
+            timed_observation = pickle.loads(received_bytes)  # nosec
+            image_decode_time = 0.0
+        else:
+            timed_observation, timings = decode_observation(received_bytes)
+            image_decode_time = timings["decode_time"]
         deserialize_time = time.perf_counter() - start_deserialize
 
         self.logger.debug(f"Received observation #{timed_observation.get_timestep()}")
@@ -170,10 +318,10 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         obs_timestamp = timed_observation.get_timestamp()
 
         # Calculate FPS metrics
-        fps_metrics = self.fps_tracker.calculate_fps_metrics(obs_timestamp)
+        fps_metrics = session.fps_tracker.calculate_fps_metrics(obs_timestamp)
 
         self.logger.info(
-            f"Received observation #{obs_timestep} | "
+            f"Received observation #{obs_timestep} from {session.client_id} | "
             f"Avg FPS: {fps_metrics['avg_fps']:.2f} | "  # fps at which observations are received from client
             f"Target: {fps_metrics['target_fps']:.2f} | "
             f"One-way latency: {(receive_time - obs_timestamp) * 1000:.2f}ms"
@@ -182,55 +330,32 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         self.logger.debug(
             f"Server timestamp: {receive_time:.6f} | "
             f"Client timestamp: {obs_timestamp:.6f} | "
-            f"Deserialization time: {deserialize_time:.6f}s"
+            f"Receive time: {receive_bytes_time:.6f}s | "
+            f"Deserialization time: {deserialize_time:.6f}s | "
+            f"Image decoding time: {image_decode_time:.6f}s | "
+            f"Size: {len(received_bytes) / 1024:.1f}KiB"
         )
 
-        if not self._enqueue_observation(
-            timed_observation  # wrapping a RawObservation
-        ):
+        enqueued = self._enqueue_observation(
+            session,
+            timed_observation,  # wrapping a RawObservation
+        )
+        session.metrics.record_observation(enqueued)
+        if not enqueued:
             self.logger.info(f"Observation #{obs_timestep} has been filtered out")
 
-        return services_pb2.Empty()
-
     def GetActions(self, request, context):  # noqa: N802
         """Returns actions to the robot client. Actions are sent as a single
         chunk, containing multiple actions."""
-        client_id = context.peer()
-        self.logger.debug(f"Client {client_id} connected for action streaming")
+        session = self._get_session(context)
+        self.logger.debug(f"Client {session.client_id} connected for action streaming")
 
         # Generate action based on the most recent observation and its timestep
         try:
             getactions_starts = time.perf_counter()
-            obs = self.observation_queue.get(timeout=self.config.obs_queue_timeout)
-            self.logger.info(
-                f"Running inference for observation #{obs.get_timestep()} (must_go: {obs.must_go})"
-            )
-
-            with self._predicted_timesteps_lock:
-                self._predicted_timesteps.add(obs.get_timestep())
+            obs = session.observation_queue.get(timeout=self.config.obs_queue_timeout)
 
-            start_time = time.perf_counter()
-            action_chunk = self._predict_action_chunk(obs)
-            inference_time = time.perf_counter() - start_time
-
-            start_time = time.perf_counter()
-            actions_bytes = pickle.dumps(action_chunk)  # nosec
-            serialize_time = time.perf_counter() - start_time
-
-            # Create and return the action chunk
-            actions = services_pb2.Actions(data=actions_bytes)
-
-            self.logger.info(
-                f"Action chunk #{obs.get_timestep()} generated | "
-                f"Total time: {(inference_time + serialize_time) * 1000:.2f}ms"
-            )
-
-            self.logger.debug(
-                f"Action chunk #{obs.get_timestep()} generated | "
-                f"Inference time: {inference_time:.2f}s |"
-                f"Serialize time: {serialize_time:.2f}s |"
-                f"Total time: {inference_time + serialize_time:.2f}s"
-            )
+            actions = self._predict_actions(session, obs)
 
             time.sleep(
                 max(0, self.config.inference_latency - max(0, time.perf_counter() - getactions_starts))
@@ -246,16 +371,144 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
 
             return services_pb2.Empty()
 
-    def _obs_sanity_checks(self, obs: TimedObservation, previous_obs: TimedObservation) -> bool:
+    def StreamInference(self, request_iterator, context):  # noqa: N802
+        """Receives the observations of the robot client and streams back each action chunk as soon as it is
+        predicted, over a single persistent stream. Unlike GetActions, the client does not poll and inference
+        is not paced by `inference_latency`."""
+        session = self._get_session(context)
+        client_id = session.client_id
+        self.logger.info(f"Client {client_id} opened an inference stream")
+
+        observations_bytes = Queue()
+        stream_closed = threading.Event()
+
+        def receive_observations():
+            try:
+                receive_bytes_in_chunks(
+                    request_iterator, observations_bytes, session.shutdown_event, self.logger
+                )  # blocking call while the client keeps the stream open
+            except Exception as e:
+                self.logger.debug(f"Inference stream of {client_id} interrupted: {e}")
+            finally:
+                stream_closed.set()
+
+        threading.Thread(target=receive_observations, daemon=True).start()
+
+        while self.running and session.running and context.is_active():
+            try:
+                received_bytes = observations_bytes.get(timeout=self.config.obs_queue_timeout)
+            except Empty:
+                if stream_closed.is_set():
+                    break
+                continue
+
+            try:
+                # observations received during the last inference are all filtered, the latest one is kept
+                while True:
+                    self._receive_observation(session, received_bytes, time.time())
+                    received_bytes = observations_bytes.get_nowait()
+            except Empty:
+                pass
+
+            try:
+                obs = session.observation_queue.get_nowait()
+            except Empty:  # all the observations have been filtered out
+                continue
+
+            try:
+                actions = self._predict_actions(session, obs)
+            except Exception as e:
+                self.logger.error(f"Error in StreamInference: {e}")
+                continue
+
+            yield actions
+
+        self.logger.info(f"Inference stream of {client_id} closed")
+
+    def _predict_actions(self, session: ClientSession, obs: TimedObservation) -> services_pb2.Actions:
+        """Run inference on an observation, batched with the observations of the other clients of the policy,
+        and serialize the resulting action chunk"""
+        self.logger.info(
+            f"Running inference for observation #{obs.get_timestep()} of {session.client_id} "
+            f"(must_go: {obs.must_go})"
+        )
+
+        with session.predicted_timesteps_lock:
+            session.predicted_timesteps.add(obs.get_timestep())
+
+        start_time = time.perf_counter()
+        session.last_request_time = start_time
+        action_chunk, batch_stats = self.batcher.submit(session.policy_key, (session, obs)).result()
+        inference_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        actions_bytes = pickle.dumps(action_chunk)  # nosec
+        serialize_time = time.perf_counter() - start_time
+
+        # Create and return the action chunk
+        actions = services_pb2.Actions(data=actions_bytes)
+
+        session.metrics.record_chunk(
+            latency=time.time() - obs.get_timestamp(),
+            batch_wait_time=inference_time - batch_stats["inference_time"],
+            inference_time=batch_stats["inference_time"],
+            batch_size=batch_stats["batch_size"],
+        )
+
+        self.logger.info(
+            f"Action chunk #{obs.get_timestep()} generated | "
+            f"Batch size: {batch_stats['batch_size']} | "
+            f"Total time: {(inference_time + serialize_time) * 1000:.2f}ms"
+        )
+
+        self.logger.debug(
+            f"Action chunk #{obs.get_timestep()} generated | "
+            f"Batch wait time: {inference_time - batch_stats['inference_time']:.2f}s |"
+            f"Inference time: {batch_stats['inference_time']:.2f}s |"
+            f"Serialize time: {serialize_time:.2f}s |"
+            f"Total time: {inference_time + serialize_time:.2f}s"
+        )
+
+        if time.perf_counter() - session.last_metrics_log_time > self.config.metrics_log_interval:
+            session.last_metrics_log_time = time.perf_counter()
+            self._log_metrics(session)
+
+        return actions
+
+    def get_metrics(self) -> dict[str, dict[str, float]]:
+        """Throughput and latency metrics of the connected clients, by client id"""
+        with self._sessions_lock:
+            sessions = [session for session in self._sessions.values() if session.running]
+        return {session.client_id: session.metrics.summary() for session in sessions}
+
+    def _log_metrics(self, session: ClientSession) -> None:
+        metrics = session.metrics.summary()
+        if metrics["num_chunks"] == 0:
+            return
+
+        self.logger.info(
+            f"Client {session.client_id} | "
+            f"Observations: {metrics['num_observations']} ({metrics['num_filtered']} filtered) | "
+            f"Chunks: {metrics['num_chunks']} ({metrics['chunks_per_second']:.2f}/s) | "
+            f"Latency: mean {metrics['latency_mean_ms']:.2f}ms, p50 {metrics['latency_p50_ms']:.2f}ms, "
+            f"p90 {metrics['latency_p90_ms']:.2f}ms | "
+            f"Batch wait: {metrics['batch_wait_mean_ms']:.2f}ms | "
+            f"Inference: {metrics['inference_mean_ms']:.2f}ms | "
+            f"Batch size: {metrics['batch_size_mean']:.2f}"
+        )
+
+    def _obs_sanity_checks(
+        self, session: ClientSession, obs: TimedObservation, previous_obs: TimedObservation
+    ) -> bool:
         """Check if the observation is valid to be processed by the policy"""
-        with self._predicted_timesteps_lock:
-            predicted_timesteps = self._predicted_timesteps
+        with session.predicted_timesteps_lock:
+            predicted_timesteps = session.predicted_timesteps
 
         if obs.get_timestep() in predicted_timesteps:
             self.logger.debug(f"Skipping observation #{obs.get_timestep()} - Timestep predicted already!")
             return False
 
-        elif observations_similar(obs, previous_obs, lerobot_features=self.lerobot_features):
+        elif observations_similar(obs, previous_obs, lerobot_features=session.lerobot_features):
             self.logger.debug(
                 f"Skipping observation #{obs.get_timestep()} - Observation too similar to last obs predicted!"
             )
@@ -264,28 +517,28 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         else:
             return True
 
-    def _enqueue_observation(self, obs: TimedObservation) -> bool:
+    def _enqueue_observation(self, session: ClientSession, obs: TimedObservation) -> bool:
         """Enqueue an observation if it must go through processing, otherwise skip it.
         Observations not in queue are never run through the policy network"""
 
         if (
             obs.must_go
-            or self.last_processed_obs is None
-            or self._obs_sanity_checks(obs, self.last_processed_obs)
+            or session.last_processed_obs is None
+            or self._obs_sanity_checks(session, obs, session.last_processed_obs)
         ):
-            last_obs = self.last_processed_obs.get_timestep() if self.last_processed_obs else "None"
+            last_obs = session.last_processed_obs.get_timestep() if session.last_processed_obs else "None"
             self.logger.debug(
                 f"Enqueuing observation. Must go: {obs.must_go} | Last processed obs: {last_obs}"
             )
 
             # If queue is full, get the old observation to make room
-            if self.observation_queue.full():
+            if session.observation_queue.full():
                 # pops from queue
-                _ = self.observation_queue.get_nowait()
+                _ = session.observation_queue.get_nowait()
                 self.logger.debug("Observation queue was full, removed oldest observation")
 
             # Now put the new observation (never blocks as queue is non-full here)
-            self.observation_queue.put(obs)
+            session.observation_queue.put(obs)
             return True
 
         return False
@@ -300,7 +553,7 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             for i, action in enumerate(action_chunk)
         ]
 
-    def _prepare_observation(self, observation_t: TimedObservation) -> Observation:
+    def _prepare_observation(self, session: ClientSession, observation_t: TimedObservation) -> Observation:
         """
         Prepare observation, ready for policy inference.
         E.g.: To keep observation sampling rate high (and network packet tiny) we send int8 [0,255] images from the
@@ -309,68 +562,106 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         # RawObservation from robot.get_observation() - wrong keys, wrong dtype, wrong image shape
         observation: Observation = raw_observation_to_observation(
             observation_t.get_observation(),
-            self.lerobot_features,
-            self.policy_image_features,
-            self.device,
+            session.lerobot_features,
+            session.policy.config.image_features,
+            session.device,
         )
         # processed Observation - right keys, right dtype, right image shape
 
         return observation
 
-    def _get_action_chunk(self, observation: dict[str, torch.Tensor]) -> torch.Tensor:
+    def _batch_observations(self, observations: list[Observation]) -> Observation:
+        """Concatenate prepared observations (each with a batch dimension of 1) into a single batch.
+        Natural-language instructions are gathered in a list."""
+        if len(observations) == 1:
+            return observations[0]
+
+        return {
+            key: torch.cat([obs[key] for obs in observations])
+            if isinstance(value, torch.Tensor)
+            else [obs[key] for obs in observations]
+            for key, value in observations[0].items()
+        }
+
+    def _get_action_chunk(
+        self, policy: PreTrainedPolicy, observation: dict[str, torch.Tensor], actions_per_chunk: int
+    ) -> torch.Tensor:
         """Get an action chunk from the policy. The chunk contains only"""
-        chunk = self.policy.predict_action_chunk(observation)
+        chunk = policy.predict_action_chunk(observation)
         if chunk.ndim != 3:
             chunk = chunk.unsqueeze(0)  # adding batch dimension, now shape is (B, chunk_size, action_dim)
 
-        return chunk[:, : self.actions_per_chunk, :]
+        return chunk[:, :actions_per_chunk, :]
+
+    def _run_batch(
+        self, policy_key: Hashable, requests: list[tuple[ClientSession, TimedObservation]]
+    ) -> list[tuple[list[TimedAction], dict[str, float]]]:
+        """Run by the batcher: predict the action chunks of observations of clients sharing a policy"""
+        start_time = time.perf_counter()
+        action_chunks = self._predict_action_chunks(requests)
+        batch_stats = {"batch_size": len(requests), "inference_time": time.perf_counter() - start_time}
+
+        return [(action_chunk, batch_stats) for action_chunk in action_chunks]
 
-    def _predict_action_chunk(self, observation_t: TimedObservation) -> list[TimedAction]:
-        """Predict an action chunk based on an observation"""
+    def _predict_action_chunks(
+        self, requests: list[tuple[ClientSession, TimedObservation]]
+    ) -> list[list[TimedAction]]:
+        """Predict the action chunks of observations of clients sharing a policy, in a single batch"""
         inference_starts = time.perf_counter()
 
-        """1. Prepare observation"""
-        start_time = time.perf_counter()
-        observation = self._prepare_observation(observation_t)
-        preprocessing_time = time.perf_counter() - start_time
+        """1. Prepare observations"""
+        observation = self._batch_observations(
+            [self._prepare_observation(session, observation_t) for session, observation_t in requests]
+        )
+        preprocessing_time = time.perf_counter()
 
-        self.last_processed_obs: TimedObservation = observation_t
+        for session, observation_t in requests:
+            session.last_processed_obs = observation_t
 
-        """2. Get action chunk"""
-        start_time = time.perf_counter()
-        action_tensor = self._get_action_chunk(observation)
-        inference_time = time.perf_counter() - start_time
+        """2. Get action chunks"""
+        policy = requests[0][0].policy
+        actions_per_chunk = max(session.actions_per_chunk for session, _ in requests)
+        action_tensor = self._get_action_chunk(policy, observation, actions_per_chunk)
+        inference_time = time.perf_counter()
 
         """3. Post-inference processing"""
-        start_time = time.perf_counter()
         # Move to CPU before serializing
-        action_tensor = action_tensor.cpu().squeeze(0)
+        action_tensor = action_tensor.cpu()
 
-        action_chunk = self._time_action_chunk(
-            observation_t.get_timestamp(), list(action_tensor), observation_t.get_timestep()
-        )
-        postprocessing_time = time.perf_counter() - start_time
-        inference_stops = time.perf_counter()
+        action_chunks = [
+            self._time_action_chunk(
+                observation_t.get_timestamp(),
+                list(action_tensor[i, : session.actions_per_chunk]),
+                observation_t.get_timestep(),
+            )
+            for i, (session, observation_t) in enumerate(requests)
+        ]
+        postprocessing_time = time.perf_counter()
 
+        timesteps = [observation_t.get_timestep() for _, observation_t in requests]
         self.logger.info(
-            f"Observation {observation_t.get_timestep()} |"
-            f"Inference time: {1000 * (inference_stops - inference_starts):.2f}ms"
+            f"Observations {timesteps} |"
+            f"Inference time: {1000 * (postprocessing_time - inference_starts):.2f}ms"
         )
 
         # full-process latency breakdown for debugging purposes
         self.logger.debug(
-            f"Observation {observation_t.get_timestep()} | "
+            f"Observations {timesteps} | "
             f"Preprocessing time: {1000 * (preprocessing_time - inference_starts):.2f}ms | "
             f"Inference time: {1000 * (inference_time - preprocessing_time):.2f}ms | "
             f"Postprocessing time: {1000 * (postprocessing_time - inference_time):.2f}ms | "
             f"Total time: {1000 * (postprocessing_time - inference_starts):.2f}ms"
         )
 
-        return action_chunk
+        return action_chunks
 
     def stop(self):
         """Stop the server"""
-        self._reset_server()
+        self.shutdown_event.set()
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.shutdown_event.set()
+        self.batcher.stop()
         self.logger.info("Server stopping...")
 
 
@@ -387,7 +678,8 @@ def serve(cfg: PolicyServerConfig):
     policy_server = PolicyServer(cfg)
 
     # Setup and start gRPC server
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    # a client blocks up to two workers at a time (SendObservations and GetActions)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max(4, 2 * cfg.max_batch_size)))
     services_pb2_grpc.add_AsyncInferenceServicer_to_server(policy_server, server)
     server.add_insecure_port(f"{cfg.host}:{cfg.port}")
 
@@ -28,6 +28,8 @@ python src/lerobot/scripts/server/robot_client.py \
     --actions_per_chunk=50 \
     --chunk_size_threshold=0.5 \
     --aggregate_fn_name=weighted_average \
+    --observation_encoding=jpeg \
+    --resize_images=True \
     --debug_visualize_queue_size=True
 ```
 """
@@ -39,7 +41,7 @@ import time
 from collections.abc import Callable
 from dataclasses import asdict
 from pprint import pformat
-from queue import Queue
+from queue import Empty, Queue
 from typing import Any
 
 import draccus
@@ -49,6 +51,7 @@ import torch
 from lerobot.cameras.opencv.configuration_opencv import OpenCVCameraConfig  # noqa: F401
 from lerobot.cameras.realsense.configuration_realsense import RealSenseCameraConfig  # noqa: F401
 from lerobot.configs.policies import PreTrainedConfig
+from lerobot.constants import OBS_IMAGES
 from lerobot.robots import (  # noqa: F401
     Robot,
     RobotConfig,
@@ -59,11 +62,13 @@ from lerobot.robots import (  # noqa: F401
     yam_follower,
     yam_bimanual
 )
+from lerobot.scripts.server.action_buffer import ActionRingBuffer
 from lerobot.scripts.server.configs import RobotClientConfig
 from lerobot.scripts.server.constants import SUPPORTED_ROBOTS
 from lerobot.scripts.server.helpers import (
     Action,
     FPSTracker,
+    LatencyEstimator,
     Observation,
     RawObservation,
     RemotePolicyConfig,
@@ -74,6 +79,7 @@ from lerobot.scripts.server.helpers import (
     validate_robot_cameras_for_policy,
     visualize_action_queue_size,
 )
+from lerobot.scripts.server.observation_codec import encode_observation
 from lerobot.transport import (
     services_pb2,  # type: ignore
     services_pb2_grpc,  # type: ignore
@@ -98,13 +104,23 @@ class RobotClient:
 
         lerobot_features = map_robot_keys_to_lerobot_features(self.robot)
 
-        if config.verify_robot_cameras:
+        # (height, width) of the camera frames sent to the server, by camera name
+        self.image_sizes = None
+        if config.verify_robot_cameras or config.resize_images:
             # Load policy config for validation
             policy_config = PreTrainedConfig.from_pretrained(config.pretrained_name_or_path)
             policy_image_features = policy_config.image_features
 
-            # The cameras specified for inference must match the one supported by the policy chosen
-            validate_robot_cameras_for_policy(lerobot_features, policy_image_features)
+            if config.verify_robot_cameras:
+                # The cameras specified for inference must match the one supported by the policy chosen
+                validate_robot_cameras_for_policy(lerobot_features, policy_image_features)
+
+            if config.resize_images:
+                # Frames are resized to the policy resolution on the server anyway, here it saves bandwidth
+                self.image_sizes = {
+                    key.removeprefix(f"{OBS_IMAGES}."): tuple(feature.shape[1:])
+                    for key, feature in policy_image_features.items()
+                }
 
         # Use environment variable if server_address is not provided in config
         self.server_address = config.server_address
@@ -115,11 +131,14 @@ class RobotClient:
             lerobot_features,
             config.actions_per_chunk,
             config.policy_device,
+            observation_encoding=config.observation_encoding,
         )
         self.channel = grpc.insecure_channel(
             self.server_address, grpc_channel_options(initial_backoff=f"{config.environment_dt:.4f}s")
         )
         self.stub = services_pb2_grpc.AsyncInferenceStub(self.channel)
+        # serialized observations waiting to be sent on the inference stream
+        self.observation_stream_queue = Queue()
         self.logger.info(f"Initializing client to connect to server at {self.server_address}")
 
         self.shutdown_event = threading.Event()
@@ -131,7 +150,7 @@ class RobotClient:
 
         self._chunk_size_threshold = config.chunk_size_threshold
 
-        self.action_queue = Queue()
+        self.action_queue = ActionRingBuffer()
         self.action_queue_lock = threading.Lock()  # Protect queue operations
         self.action_queue_size = []
         self.start_barrier = threading.Barrier(2)  # 2 threads: action receiver, control loop
@@ -139,6 +158,9 @@ class RobotClient:
         # FPS measurement
         self.fps_tracker = FPSTracker(target_fps=self.config.fps)
 
+        # Round-trip latency, from capturing an observation to receiving its action chunk
+        self.latency_estimator = LatencyEstimator()
+
         self.logger.info("Robot connected and ready")
 
         # Use an event for thread-safe coordination
@@ -169,7 +191,20 @@ class RobotClient:
                 f"Device: {self.policy_config.device}"
             )
 
-            self.stub.SendPolicyInstructions(policy_setup)
+            try:
+                self.stub.SendPolicyInstructions(policy_setup)
+            except grpc.RpcError as e:
+                encoding = self.policy_config.observation_encoding
+                if e.code() != grpc.StatusCode.INVALID_ARGUMENT or encoding == "pickle":
+                    raise
+                # the server cannot decode the requested observation encoding
+                self.logger.warning(
+                    f"Observation encoding '{encoding}' refused by the policy server ({e.details()}), "
+                    "falling back to 'pickle'"
+                )
+                self.policy_config.observation_encoding = "pickle"
+                policy_setup = services_pb2.PolicySetup(data=pickle.dumps(self.policy_config))
+                self.stub.SendPolicyInstructions(policy_setup)
 
             self.shutdown_event.clear()
 
@@ -202,9 +237,25 @@ class RobotClient:
             raise ValueError("Input observation needs to be a TimedObservation!")
 
         start_time = time.perf_counter()
-        observation_bytes = pickle.dumps(obs)
-        serialize_time = time.perf_counter() - start_time
-        self.logger.debug(f"Observation serialization time: {serialize_time:.6f}s")
+        if self.policy_config.observation_encoding == "pickle":
+            observation_bytes = pickle.dumps(obs)
+            serialize_time = time.perf_counter() - start_time
+            self.logger.debug(f"Observation serialization time: {serialize_time:.6f}s")
+        else:
+            observation_bytes, timings = encode_observation(
+                obs, self.policy_config.observation_encoding, self.config.image_quality, self.image_sizes
+            )
+            self.logger.debug(
+                f"Observation serialization time: {timings['total_time']:.6f}s | "
+                f"Resize time: {timings['resize_time']:.6f}s | "
+                f"Image encoding time: {timings['encode_time']:.6f}s | "
+                f"Size: {len(observation_bytes) / 1024:.1f}KiB"
+            )
+
+        if self.config.streaming:
+            self.observation_stream_queue.put(observation_bytes)
+            self.logger.info(f"Sent observation #{obs.get_timestep()} | ")
+            return True
 
         try:
             observation_iterator = send_bytes_in_chunks(
@@ -223,10 +274,25 @@ class RobotClient:
             self.logger.error(f"Error sending observation #{obs.get_timestep()}: {e}")
             return False
 
+    def _stream_observations(self):
+        """Requests of the inference stream: the observations queued by `send_observation`, in chunks"""
+        while self.running:
+            try:
+                observation_bytes = self.observation_stream_queue.get(timeout=self.config.environment_dt)
+            except Empty:
+                continue
+
+            yield from send_bytes_in_chunks(
+                observation_bytes,
+                services_pb2.Observation,
+                log_prefix="[CLIENT] Observation",
+                silent=True,
+            )
+
     def _inspect_action_queue(self):
         with self.action_queue_lock:
-            queue_size = self.action_queue.qsize()
-            timestamps = sorted([action.get_timestep() for action in self.action_queue.queue])
+            queue_size = len(self.action_queue)
+            timestamps = self.action_queue.timesteps()
         self.logger.debug(f"Queue size: {queue_size}, Queue contents: {timestamps}")
         return queue_size, timestamps
 
@@ -235,45 +301,10 @@ class RobotClient:
         incoming_actions: list[TimedAction],
         aggregate_fn: Callable[[torch.Tensor, torch.Tensor], torch.Tensor] | None = None,
     ):
-        """Finds the same timestep actions in the queue and aggregates them using the aggregate_fn"""
-        if aggregate_fn is None:
-            # default aggregate function: take the latest action
-            def aggregate_fn(x1, x2):
-                return x2
-
-        future_action_queue = Queue()
-        with self.action_queue_lock:
-            internal_queue = self.action_queue.queue
-
-        current_action_queue = {action.get_timestep(): action.get_action() for action in internal_queue}
-
-        for new_action in incoming_actions:
-            with self.latest_action_lock:
-                latest_action = self.latest_action
-
-            # New action is older than the latest action in the queue, skip it
-            if new_action.get_timestep() <= latest_action:
-                continue
-
-            # If the new action's timestep is not in the current action queue, add it directly
-            elif new_action.get_timestep() not in current_action_queue:
-                future_action_queue.put(new_action)
-                continue
-
-            # If the new action's timestep is in the current action queue, aggregate it
-            # TODO: There is probably a way to do this with broadcasting of the two action tensors
-            future_action_queue.put(
-                TimedAction(
-                    timestamp=new_action.get_timestamp(),
-                    timestep=new_action.get_timestep(),
-                    action=aggregate_fn(
-                        current_action_queue[new_action.get_timestep()], new_action.get_action()
-                    ),
-                )
-            )
-
+        """Finds the same timestep actions in the queue and aggregates them using the aggregate_fn (by
+        default, the incoming actions are kept), as a single vectorized operation on the overlapping slice"""
         with self.action_queue_lock:
-            self.action_queue = future_action_queue
+            self.action_queue.merge(incoming_actions, aggregate_fn)
 
     def receive_actions(self, verbose: bool = False):
         """Receive actions from the policy server"""
@@ -283,74 +314,89 @@ class RobotClient:
 
         while self.running:
             try:
+                if self.config.streaming:
+                    # The server pushes each action chunk as soon as it is predicted, the stream stays open
+                    for actions_chunk in self.stub.StreamInference(self._stream_observations()):
+                        self._receive_actions_chunk(actions_chunk, verbose)
+                    continue
+
                 # Use StreamActions to get a stream of actions from the server
                 actions_chunk = self.stub.GetActions(services_pb2.Empty())
                 if len(actions_chunk.data) == 0:
                     continue  # received `Empty` from server, wait for next call
 
-                receive_time = time.time()
+                self._receive_actions_chunk(actions_chunk, verbose)
 
-                # Deserialize bytes back into list[TimedAction]
-                deserialize_start = time.perf_counter()
-                timed_actions = pickle.loads(actions_chunk.data)  # nosec
-                deserialize_time = time.perf_counter() - deserialize_start
+            except grpc.RpcError as e:
+                self.logger.error(f"Error receiving actions: {e}")
 
-                self.action_chunk_size = max(self.action_chunk_size, len(timed_actions))
+    def _receive_actions_chunk(self, actions_chunk: services_pb2.Actions, verbose: bool = False):
+        """Deserialize an action chunk received from the policy server, and merge it in the action queue"""
+        receive_time = time.time()
 
-                # Calculate network latency if we have matching observations
-                if len(timed_actions) > 0 and verbose:
-                    with self.latest_action_lock:
-                        latest_action = self.latest_action
+        # Deserialize bytes back into list[TimedAction]
+        deserialize_start = time.perf_counter()
+        timed_actions = pickle.loads(actions_chunk.data)  # nosec
+        deserialize_time = time.perf_counter() - deserialize_start
 
-                    self.logger.debug(f"Current latest action: {latest_action}")
+        self.action_chunk_size = max(self.action_chunk_size, len(timed_actions))
 
-                    # Get queue state before changes
-                    old_size, old_timesteps = self._inspect_action_queue()
-                    if not old_timesteps:
-                        old_timesteps = [latest_action]  # queue was empty
+        if len(timed_actions) > 0:
+            # timestamps of the actions are the capture time of the observation, on the client clock
+            self.latency_estimator.update(receive_time - timed_actions[0].get_timestamp())
 
-                    # Log incoming actions
-                    incoming_timesteps = [a.get_timestep() for a in timed_actions]
+        # Calculate network latency if we have matching observations
+        if len(timed_actions) > 0 and verbose:
+            with self.latest_action_lock:
+                latest_action = self.latest_action
 
-                    first_action_timestep = timed_actions[0].get_timestep()
-                    server_to_client_latency = (receive_time - timed_actions[0].get_timestamp()) * 1000
+            self.logger.debug(f"Current latest action: {latest_action}")
 
-                    self.logger.info(
-                        f"Received action chunk for step #{first_action_timestep} | "
-                        f"Latest action: #{latest_action} | "
-                        f"Incoming actions: {incoming_timesteps[0]}:{incoming_timesteps[-1]} | "
-                        f"Network latency (server->client): {server_to_client_latency:.2f}ms | "
-                        f"Deserialization time: {deserialize_time * 1000:.2f}ms"
-                    )
+            # Get queue state before changes
+            old_size, old_timesteps = self._inspect_action_queue()
+            if not old_timesteps:
+                old_timesteps = [latest_action]  # queue was empty
 
-                # Update action queue
-                start_time = time.perf_counter()
-                self._aggregate_action_queues(timed_actions, self.config.aggregate_fn)
-                queue_update_time = time.perf_counter() - start_time
+            # Log incoming actions
+            incoming_timesteps = [a.get_timestep() for a in timed_actions]
 
-                self.must_go.set()  # after receiving actions, next empty queue triggers must-go processing!
+            first_action_timestep = timed_actions[0].get_timestep()
+            server_to_client_latency = (receive_time - timed_actions[0].get_timestamp()) * 1000
 
-                if verbose:
-                    # Get queue state after changes
-                    new_size, new_timesteps = self._inspect_action_queue()
+            self.logger.info(
+                f"Received action chunk for step #{first_action_timestep} | "
+                f"Latest action: #{latest_action} | "
+                f"Incoming actions: {incoming_timesteps[0]}:{incoming_timesteps[-1]} | "
+                f"Network latency (server->client): {server_to_client_latency:.2f}ms | "
+                f"Round-trip latency estimate: {self.latency_estimator.estimate() * 1000:.2f}ms | "
+                f"Deserialization time: {deserialize_time * 1000:.2f}ms"
+            )
 
-                    with self.latest_action_lock:
-                        latest_action = self.latest_action
+        # Update action queue
+        start_time = time.perf_counter()
+        self._aggregate_action_queues(timed_actions, self.config.aggregate_fn)
+        queue_update_time = time.perf_counter() - start_time
 
-                    self.logger.info(
-                        f"Latest action: {latest_action} | "
-                        f"Old action steps: {old_timesteps[0]}:{old_timesteps[-1]} | "
-                        f"Incoming action steps: {incoming_timesteps[0]}:{incoming_timesteps[-1]} | "
-                        f"Updated action steps: {new_timesteps[0]}:{new_timesteps[-1]}"
-                    )
-                    self.logger.debug(
-                        f"Queue update complete ({queue_update_time:.6f}s) | "
-                        f"Before: {old_size} items | "
-                        f"After: {new_size} items | "
-                    )
+        self.must_go.set()  # after receiving actions, next empty queue triggers must-go processing!
 
-            except grpc.RpcError as e:
-                self.logger.error(f"Error receiving actions: {e}")
+        if verbose:
+            # Get queue state after changes
+            new_size, new_timesteps = self._inspect_action_queue()
+
+            with self.latest_action_lock:
+                latest_action = self.latest_action
+
+            self.logger.info(
+                f"Latest action: {latest_action} | "
+                f"Old action steps: {old_timesteps[0]}:{old_timesteps[-1]} | "
+                f"Incoming action steps: {incoming_timesteps[0]}:{incoming_timesteps[-1]} | "
+                f"Updated action steps: {new_timesteps[0]}:{new_timesteps[-1]}"
+            )
+            self.logger.debug(
+                f"Queue update complete ({queue_update_time:.6f}s) | "
+                f"Before: {old_size} items | "
+                f"After: {new_size} items | "
+            )
 
     def actions_available(self):
         """Check if there are actions available in the queue"""
@@ -367,11 +413,19 @@ class RobotClient:
         # Lock only for queue operations
         get_start = time.perf_counter()
         with self.action_queue_lock:
-            self.action_queue_size.append(self.action_queue.qsize())
-            # Get action from queue
-            timed_action = self.action_queue.get_nowait()
+            self.action_queue_size.append(len(self.action_queue))
+            if self.config.interpolate_actions:
+                # Resample the actions on the control clock
+                timed_action = self.action_queue.sample(time.time())
+            else:
+                # Get action from queue
+                timed_action = self.action_queue.pop()
         get_end = time.perf_counter() - get_start
 
+        if timed_action is None:
+            self.logger.debug("All the pending actions are past, holding the robot")
+            return None
+
         _performed_action = self.robot.send_action(
             self._action_tensor_to_action_dict(timed_action.get_action())
         )
@@ -380,7 +434,7 @@ class RobotClient:
 
         if verbose:
             with self.action_queue_lock:
-                current_queue_size = self.action_queue.qsize()
+                current_queue_size = len(self.action_queue)
 
             self.logger.debug(
                 f"Ts={timed_action.get_timestamp()} | "
@@ -395,9 +449,20 @@ class RobotClient:
         return _performed_action
 
     def _ready_to_send_observation(self):
-        """Flags when the client is ready to send an observation"""
+        """Flags when the client is ready to send an observation. With latency-aware scheduling, this is when
+        the pending actions run out within the estimated round-trip latency (plus one control step), so that
+        the next action chunk arrives before the robot runs out of actions."""
+        latency_estimate = self.latency_estimator.estimate()
         with self.action_queue_lock:
-            return self.action_queue.qsize() / self.action_chunk_size <= self._chunk_size_threshold
+            if not self.config.latency_aware_scheduling or latency_estimate is None:
+                return len(self.action_queue) / self.action_chunk_size <= self._chunk_size_threshold
+
+            if self.config.interpolate_actions:
+                remaining_time = self.action_queue.remaining_time(time.time())
+            else:
+                remaining_time = len(self.action_queue) * self.config.environment_dt
+
+        return remaining_time <= latency_estimate + self.config.environment_dt
 
     def control_loop_observation(self, task: str, verbose: bool = False) -> RawObservation:
         try:
@@ -421,7 +486,7 @@ class RobotClient:
             # If there are no actions left in the queue, the observation must go through processing!
             with self.action_queue_lock:
                 observation.must_go = self.must_go.is_set() and self.action_queue.empty()
-                current_queue_size = self.action_queue.qsize()
+                current_queue_size = len(self.action_queue)
 
             _ = self.send_observation(observation)
 
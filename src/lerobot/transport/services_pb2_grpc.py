@@ -264,6 +264,11 @@ class AsyncInferenceStub:
                 request_serializer=lerobot_dot_transport_dot_services__pb2.Empty.SerializeToString,
                 response_deserializer=lerobot_dot_transport_dot_services__pb2.Empty.FromString,
                 _registered_method=True)
+        self.StreamInference = channel.stream_stream(
+                '/transport.AsyncInference/StreamInference',
+                request_serializer=lerobot_dot_transport_dot_services__pb2.Observation.SerializeToString,
+                response_deserializer=lerobot_dot_transport_dot_services__pb2.Actions.FromString,
+                _registered_method=True)
 
 
 class AsyncInferenceServicer:
@@ -297,6 +302,14 @@ class AsyncInferenceServicer:
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamInference(self, request_iterator, context):
+        """Robot <-> Policy over a single persistent stream: observations flow up, and each action chunk flows down
+        as soon as it is predicted
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_AsyncInferenceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -320,6 +333,11 @@ def add_AsyncInferenceServicer_to_server(servicer, server):
                     request_deserializer=lerobot_dot_transport_dot_services__pb2.Empty.FromString,
                     response_serializer=lerobot_dot_transport_dot_services__pb2.Empty.SerializeToString,
             ),
+            'StreamInference': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamInference,
+                    request_deserializer=lerobot_dot_transport_dot_services__pb2.Observation.FromString,
+                    response_serializer=lerobot_dot_transport_dot_services__pb2.Actions.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'transport.AsyncInference', rpc_method_handlers)
@@ -440,3 +458,30 @@ class AsyncInference:
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamInference(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/transport.AsyncInference/StreamInference',
+            lerobot_dot_transport_dot_services__pb2.Observation.SerializeToString,
+            lerobot_dot_transport_dot_services__pb2.Actions.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
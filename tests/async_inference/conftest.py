@@ -0,0 +1,134 @@
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import numpy as np
+import pytest
+import torch
+
+from lerobot.configs.types import FeatureType
+from lerobot.datasets.utils import dataset_to_policy_features, hw_to_dataset_features
+from lerobot.policies.act.configuration_act import ACTConfig
+from lerobot.policies.act.modeling_act import ACTPolicy
+from lerobot.scripts.server.configs import PolicyServerConfig
+from lerobot.scripts.server.helpers import FPSTracker, TimedAction, TimedObservation
+from lerobot.scripts.server.policy_server import ClientSession, PolicyServer
+
+NUM_JOINTS = 6
+HEIGHT, WIDTH = 96, 128
+
+
+class FakePolicyServer(PolicyServer):
+    """PolicyServer whose policy predicts zeros, without loading any checkpoint"""
+
+    def _load_policy(self, policy_type: str, pretrained_name_or_path: str, device: str) -> None:
+        return None
+
+    def _predict_action_chunks(
+        self, requests: list[tuple[ClientSession, TimedObservation]]
+    ) -> list[list[TimedAction]]:
+        action_chunks = []
+        for session, observation_t in requests:
+            session.last_processed_obs = observation_t
+            actions = [torch.zeros(NUM_JOINTS)] * session.actions_per_chunk
+            action_chunks.append(
+                self._time_action_chunk(observation_t.get_timestamp(), actions, observation_t.get_timestep())
+            )
+        return action_chunks
+
+
+def make_lerobot_features(height: int, width: int) -> dict[str, dict]:
+    hw_features = {**{f"joint_{i}.pos": float for i in range(NUM_JOINTS)}, "front": (height, width, 3)}
+    return hw_to_dataset_features(hw_features, "observation", use_video=False)
+
+
+def make_tiny_act_checkpoint(path: str, image_shape: tuple[int, int, int]) -> None:
+    """Save a small randomly initialized ACT policy, with identity normalization statistics"""
+    input_features = dataset_to_policy_features(make_lerobot_features(*image_shape[1:]))
+    config = ACTConfig(
+        input_features=input_features,
+        output_features=dataset_to_policy_features(
+            {"action": {"dtype": "float32", "shape": (NUM_JOINTS,), "names": None}}
+        ),
+        device="cpu",
+        chunk_size=50,
+        n_action_steps=50,
+        pretrained_backbone_weights=None,
+        dim_model=64,
+        n_heads=2,
+        dim_feedforward=128,
+        n_encoder_layers=1,
+        n_decoder_layers=1,
+        use_vae=False,
+    )
+    dataset_stats = {}
+    for key, feature in {**config.input_features, **config.output_features}.items():
+        shape = (feature.shape[0], 1, 1) if feature.type is FeatureType.VISUAL else feature.shape
+        dataset_stats[key] = {"mean": torch.zeros(shape), "std": torch.ones(shape)}
+
+    ACTPolicy(config, dataset_stats=dataset_stats).save_pretrained(path)
+
+
+@pytest.fixture
+def fake_policy_server():
+    server = FakePolicyServer(PolicyServerConfig(max_batch_size=4, batch_timeout=0.05))
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def policy_server():
+    server = PolicyServer(PolicyServerConfig(max_batch_size=4, batch_timeout=0.05))
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def tiny_act_path(tmp_path_factory) -> str:
+    path = tmp_path_factory.mktemp("tiny_act")
+    make_tiny_act_checkpoint(str(path), image_shape=(3, HEIGHT, WIDTH))
+    return str(path)
+
+
+@pytest.fixture
+def make_session():
+    def make(client_id: str, policy_key, policy, actions_per_chunk: int) -> ClientSession:
+        session = ClientSession(client_id, FPSTracker(target_fps=30))
+        session.policy_key = policy_key
+        session.policy = policy
+        session.device = "cpu"
+        session.lerobot_features = make_lerobot_features(HEIGHT, WIDTH)
+        session.actions_per_chunk = actions_per_chunk
+        return session
+
+    return make
+
+
+@pytest.fixture
+def make_observation():
+    def make(timestep: int, seed: int) -> TimedObservation:
+        rng = np.random.default_rng(seed)
+        return TimedObservation(
+            timestamp=time.time(),
+            timestep=timestep,
+            observation={
+                "front": rng.integers(0, 256, size=(HEIGHT, WIDTH, 3), dtype=np.uint8),
+                **{f"joint_{i}.pos": float(rng.normal()) for i in range(NUM_JOINTS)},
+                "task": "",
+            },
+            must_go=True,
+        )
+
+    return make
@@ -0,0 +1,135 @@
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+from queue import Empty
+
+import pytest
+import torch
+
+from lerobot.scripts.server.action_buffer import ActionRingBuffer, TemporalEnsembleAggregate
+from lerobot.scripts.server.helpers import TimedAction
+
+
+def make_chunk(first_timestep: int, values: list[float], dt: float = 0.1) -> list[TimedAction]:
+    return [
+        TimedAction(
+            timestamp=(first_timestep + i) * dt, timestep=first_timestep + i, action=torch.tensor([v])
+        )
+        for i, v in enumerate(values)
+    ]
+
+
+def pop_all(buffer: ActionRingBuffer) -> list[tuple[int, float]]:
+    actions = []
+    while not buffer.empty():
+        action = buffer.pop()
+        actions.append((action.get_timestep(), action.get_action().item()))
+    return actions
+
+
+def test_merge_and_pop() -> None:
+    buffer = ActionRingBuffer(capacity=8)
+    buffer.merge(make_chunk(0, [0.0, 1.0, 2.0]))
+    assert len(buffer) == 3
+    assert buffer.timesteps() == [0, 1, 2]
+    assert pop_all(buffer) == [(0, 0.0), (1, 1.0), (2, 2.0)]
+    with pytest.raises(Empty):
+        buffer.pop()
+
+
+def test_merge_aggregates_overlap() -> None:
+    buffer = ActionRingBuffer(capacity=8)
+    buffer.merge(make_chunk(0, [1.0] * 5))
+    buffer.merge(make_chunk(2, [3.0] * 5), lambda old, new: 0.5 * old + 0.5 * new)
+    # the incoming chunk defines the pending timesteps, the shared ones are aggregated
+    assert pop_all(buffer) == [(2, 2.0), (3, 2.0), (4, 2.0), (5, 3.0), (6, 3.0)]
+
+
+def test_merge_discards_pending_actions_past_the_chunk() -> None:
+    buffer = ActionRingBuffer(capacity=16)
+    buffer.merge(make_chunk(0, [1.0] * 10))
+    buffer.merge(make_chunk(2, [3.0] * 3))
+    assert buffer.timesteps() == [2, 3, 4]
+
+
+def test_merge_skips_performed_actions() -> None:
+    buffer = ActionRingBuffer(capacity=8)
+    buffer.merge(make_chunk(0, [0.0, 1.0, 2.0, 3.0]))
+    buffer.pop()
+    buffer.pop()
+    buffer.merge(make_chunk(0, [10.0, 11.0, 12.0, 13.0, 14.0]))
+    assert pop_all(buffer) == [(2, 12.0), (3, 13.0), (4, 14.0)]
+
+    # a chunk made only of performed actions leaves the buffer empty
+    buffer.merge(make_chunk(0, [0.0, 1.0]))
+    assert buffer.empty()
+
+
+def test_merge_rejects_non_contiguous_chunks() -> None:
+    buffer = ActionRingBuffer()
+    chunk = make_chunk(0, [0.0, 1.0]) + make_chunk(5, [2.0])
+    with pytest.raises(ValueError):
+        buffer.merge(chunk)
+
+
+def test_buffer_grows_and_keeps_pending_actions() -> None:
+    buffer = ActionRingBuffer(capacity=4)
+    buffer.merge(make_chunk(0, [0.0, 1.0, 2.0, 3.0]))
+    buffer.pop()
+    # the pending actions 1..3 are kept by the aggregate function, through the reallocation of the ring
+    buffer.merge(make_chunk(1, [100.0 + i for i in range(1, 10)]), lambda old, new: old)
+    assert buffer.capacity == 16
+    assert pop_all(buffer) == [(i, float(i) if i < 4 else 100.0 + i) for i in range(1, 10)]
+
+
+def test_temporal_ensemble_matches_weighted_average() -> None:
+    coeff = 0.1
+    buffer = ActionRingBuffer(capacity=8)
+    aggregate_fn = TemporalEnsembleAggregate(coeff=coeff)
+    predictions = [1.0, 2.0, 4.0]
+    for first_timestep, value in enumerate(predictions):
+        buffer.merge(make_chunk(first_timestep, [value] * 5), aggregate_fn)
+
+    # timestep 2 is covered by the 3 chunks, with weights exp(-coeff * i) from the oldest prediction
+    weights = [math.exp(-coeff * i) for i in range(len(predictions))]
+    expected = sum(w * v for w, v in zip(weights, predictions, strict=True)) / sum(weights)
+    assert buffer.timesteps()[0] == 2
+    assert buffer.pop().get_action().item() == pytest.approx(expected)
+
+
+def test_aggregate_function_with_counts() -> None:
+    received_counts = []
+
+    def aggregate_fn(old, new, counts):
+        received_counts.append(counts.tolist())
+        return new
+
+    aggregate_fn.uses_counts = True
+    buffer = ActionRingBuffer(capacity=8)
+    buffer.merge(make_chunk(0, [0.0] * 3), aggregate_fn)
+    buffer.merge(make_chunk(1, [0.0] * 3), aggregate_fn)
+    buffer.merge(make_chunk(2, [0.0] * 3), aggregate_fn)
+    assert received_counts == [[1, 1], [2, 1]]
+
+
+def test_sample_interpolates_on_timestamps() -> None:
+    buffer = ActionRingBuffer(capacity=8)
+    buffer.merge(make_chunk(0, [0.0, 1.0, 2.0]))
+    assert buffer.sample(0.05).get_action().item() == pytest.approx(0.5)
+    assert buffer.sample(0.15).get_action().item() == pytest.approx(1.5)
+    # the actions before the lower bound of the interpolation are dropped
+    assert buffer.timesteps() == [1, 2]
+    assert buffer.sample(0.3) is None
+    assert buffer.empty()
@@ -0,0 +1,140 @@
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+import torch
+
+from lerobot.scripts.server.batching import DynamicBatcher
+
+
+class RecordingBatcher:
+    """A DynamicBatcher whose batches are recorded, each item being returned with its key"""
+
+    def __init__(self, **kwargs):
+        self.batches = []
+        self.batcher = DynamicBatcher(self.run_batch, **kwargs)
+
+    def run_batch(self, key, items):
+        self.batches.append((key, list(items)))
+        return [(key, item) for item in items]
+
+
+@pytest.fixture
+def make_batcher():
+    batchers = []
+
+    def make(**kwargs):
+        recording = RecordingBatcher(**kwargs)
+        batchers.append(recording.batcher)
+        return recording
+
+    yield make
+    for batcher in batchers:
+        batcher.stop()
+
+
+def test_dispatch_on_full_batch(make_batcher) -> None:
+    recording = make_batcher(max_batch_size=3, batch_timeout=10.0)
+    futures = [recording.batcher.submit("policy", i) for i in range(3)]
+    assert [future.result(timeout=2) for future in futures] == [("policy", i) for i in range(3)]
+    assert recording.batches == [("policy", [0, 1, 2])]
+
+
+def test_dispatch_on_expected_batch_size(make_batcher) -> None:
+    recording = make_batcher(max_batch_size=8, batch_timeout=10.0, expected_batch_size=lambda key: 2)
+    futures = [recording.batcher.submit("policy", i) for i in range(2)]
+    assert [future.result(timeout=2) for future in futures] == [("policy", 0), ("policy", 1)]
+    assert recording.batches == [("policy", [0, 1])]
+
+
+def test_dispatch_on_timeout(make_batcher) -> None:
+    recording = make_batcher(max_batch_size=8, batch_timeout=0.05)
+    start = time.perf_counter()
+    assert recording.batcher.submit("policy", 0).result(timeout=2) == ("policy", 0)
+    assert time.perf_counter() - start >= 0.05
+    assert recording.batches == [("policy", [0])]
+
+
+def test_batches_are_grouped_by_key(make_batcher) -> None:
+    recording = make_batcher(max_batch_size=8, batch_timeout=0.05)
+    futures = [recording.batcher.submit(key, i) for i, key in enumerate(["a", "b", "a"])]
+    assert [future.result(timeout=2) for future in futures] == [("a", 0), ("b", 1), ("a", 2)]
+    assert sorted(recording.batches) == [("a", [0, 2]), ("b", [1])]
+
+
+def test_batch_error_fails_its_requests() -> None:
+    batcher = DynamicBatcher(lambda key, items: [], max_batch_size=2, batch_timeout=0.01)
+    try:
+        with pytest.raises(RuntimeError):
+            batcher.submit("policy", 0).result(timeout=2)
+    finally:
+        batcher.stop()
+
+
+def test_stop_fails_pending_requests(make_batcher) -> None:
+    recording = make_batcher(max_batch_size=8, batch_timeout=10.0)
+    future = recording.batcher.submit("policy", 0)
+    recording.batcher.stop()
+    with pytest.raises(RuntimeError, match="Batcher stopped"):
+        future.result(timeout=2)
+    assert recording.batches == []
+
+
+def test_fake_policy_server_routes_chunks_to_their_client(
+    fake_policy_server, make_session, make_observation
+) -> None:
+    server = fake_policy_server
+    sessions = [make_session(f"client_{i}", "policy", None, actions_per_chunk=3 + i) for i in range(3)]
+    # the batches of a policy wait for the requests of all its active clients
+    for session in sessions:
+        session.last_request_time = time.perf_counter()
+        server._sessions[session.client_id] = session
+    observations = [make_observation(timestep=10 * i, seed=i) for i in range(3)]
+    futures = [
+        server.batcher.submit("policy", request) for request in zip(sessions, observations, strict=True)
+    ]
+    for session, obs, future in zip(sessions, observations, futures, strict=True):
+        action_chunk, batch_stats = future.result(timeout=2)
+        assert len(action_chunk) == session.actions_per_chunk
+        assert action_chunk[0].get_timestep() == obs.get_timestep()
+        assert batch_stats["batch_size"] == 3
+        assert session.last_processed_obs is obs
+
+
+def test_batched_inference_matches_single_inference(
+    policy_server, tiny_act_path: str, make_session, make_observation
+) -> None:
+    server = policy_server
+    policy = server._load_policy("act", tiny_act_path, "cpu")
+    # clients sharing a policy may request chunks of different lengths
+    sessions = [make_session(f"client_{i}", "act", policy, actions_per_chunk=5 * (i + 1)) for i in range(3)]
+    observations = [make_observation(timestep=100 * i, seed=i) for i in range(3)]
+
+    batched = server._run_batch("act", list(zip(sessions, observations, strict=True)))
+    for session, obs, (action_chunk, batch_stats) in zip(sessions, observations, batched, strict=True):
+        assert batch_stats["batch_size"] == 3
+        assert len(action_chunk) == session.actions_per_chunk
+        assert [action.get_timestep() for action in action_chunk] == list(
+            range(obs.get_timestep(), obs.get_timestep() + session.actions_per_chunk)
+        )
+
+        ((single_chunk, _),) = server._run_batch("act", [(session, obs)])
+        torch.testing.assert_close(
+            torch.stack([action.get_action() for action in action_chunk]),
+            torch.stack([action.get_action() for action in single_chunk]),
+            rtol=1e-4,
+            atol=1e-4,
+        )